@@ -1,4 +1,4 @@
-import pandas as pd # type: ignore
+import csv
 import os
 import json
 from datetime import datetime
@@ -12,13 +12,14 @@ def run_classical_agent():
     if not os.path.exists(REJECTION_PATH):
         raise FileNotFoundError("Rejection summary not found")
 
-    rejection_df = pd.read_csv(REJECTION_PATH)
-
-    total_rejected = rejection_df["count"].sum()
+    # Small artifacts: read with the stdlib csv module, not pandas
+    with open(REJECTION_PATH, newline="") as f:
+        total_rejected = sum(int(row["count"]) for row in csv.DictReader(f))
 
     if os.path.exists(CONSISTENCY_PATH):
-        consistency_df = pd.read_csv(CONSISTENCY_PATH)
-        total_records = consistency_df.iloc[-1]["input_records"]
+        with open(CONSISTENCY_PATH, newline="") as f:
+            rows = list(csv.DictReader(f))
+        total_records = int(rows[-1]["input_records"])
     else:
         total_records = total_rejected
 
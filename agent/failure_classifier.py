@@ -63,6 +63,12 @@ def classify_failure(exception: Exception) -> Dict:
         elif "KeyError" in msg:
             failure_class = "SCHEMA_MISMATCH"
 
+        elif "Metadata validation failed" in msg:
+            failure_class = "METADATA_INVALID"
+
+        elif "OSError" in msg or "IOError" in msg:
+            failure_class = "OUTPUT_ERROR"
+
         else:
             failure_class = "UNKNOWN"
 
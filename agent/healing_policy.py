@@ -6,6 +6,8 @@ Purpose:
 
 Design Rules:
     - Closed set of recovery actions
+    - A run that left a checkpoint and failed on its environment
+      (source or output I/O) is resumed rather than downgraded
     - No execution logic
     - No retries
     - No LLM usage
@@ -21,6 +23,7 @@ from typing import Dict
 HEALING_ACTIONS = {
     "RETRY_DRY_RUN",
     "RETRY_VALIDATE_ONLY",
+    "RESUME_FROM_CHECKPOINT",
     "HALT"
 }
 
@@ -38,22 +41,30 @@ HEALING_POLICY_MAP: Dict[str, str] = {
     "UNKNOWN": "HALT"
 }
 
+# Failure classes whose checkpointed runs resume with the same
+# execution profile from their last checkpoint
+RESUMABLE_FAILURES = {"INGESTION_ERROR", "OUTPUT_ERROR"}
+
 
 # =====================================================
 # POLICY RESOLVER
 # =====================================================
 
-def resolve_healing_action(failure_class: str) -> str:
+def resolve_healing_action(failure_class: str, checkpointed: bool = False) -> str:
     """
     Resolve the allowed healing action for a given failure class.
 
     Parameters:
         failure_class (str): Classified failure type
+        checkpointed (bool): The failed run left a checkpoint
 
     Returns:
         str: Healing action
     """
 
+    if checkpointed and failure_class in RESUMABLE_FAILURES:
+        return "RESUME_FROM_CHECKPOINT"
+
     action = HEALING_POLICY_MAP.get(failure_class, "HALT")
 
     if action not in HEALING_ACTIONS:
@@ -1,4 +1,4 @@
-import pandas as pd # type: ignore
+import csv
 import os
 import json
 from datetime import datetime
@@ -16,6 +16,24 @@ AGENT_TEXT_OUTPUT = "agent/agent_recommendations.txt"
 QUANTUM_DECISION_OUTPUT = "agent/quantum_agent_decision.json"
 
 
+# =====================================================
+# ARTIFACT READERS
+# Both CSVs are small; the stdlib reader keeps agent
+# startup free of pandas
+# =====================================================
+def read_rejected_total(path):
+    with open(path, newline="") as f:
+        return sum(int(row["count"]) for row in csv.DictReader(f))
+
+
+def read_last_input_records(path):
+    last = None
+    with open(path, newline="") as f:
+        for last in csv.DictReader(f):
+            pass
+    return int(last["input_records"]) if last is not None else None
+
+
 # =====================================================
 # QUANTUM-INSPIRED QUALITY STATE MODEL
 # =====================================================
@@ -52,15 +70,12 @@ def run_quantum_agent():
         print("Rejection summary not found. Run pipeline first.")
         return
 
-    rejection_df = pd.read_csv(REJECTION_PATH)
-    consistency_df = pd.read_csv(CONSISTENCY_PATH) if os.path.exists(CONSISTENCY_PATH) else None
-
-    total_rejected = rejection_df["count"].sum()
-    total_processed = (
-        consistency_df.iloc[-1]["input_records"]
-        if consistency_df is not None and len(consistency_df) > 0
-        else total_rejected
+    total_rejected = read_rejected_total(REJECTION_PATH)
+    last_input = (
+        read_last_input_records(CONSISTENCY_PATH)
+        if os.path.exists(CONSISTENCY_PATH) else None
     )
+    total_processed = last_input if last_input is not None else total_rejected
 
     # -------------------------------------------------
     # QUANTUM QUALITY STATE (SUPERPOSITION)
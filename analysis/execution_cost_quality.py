@@ -21,13 +21,64 @@ def load_json(path):
         return json.load(f)
 
 
+def stage_records(latest_perf):
+    """
+    Stage records of a performance record. Older records stored only
+    wall seconds per stage.
+    """
+    return {
+        stage: (
+            record if isinstance(record, dict)
+            else {"wall_seconds": float(record)}
+        )
+        for stage, record in latest_perf["stages"].items()
+    }
+
+
+def compute_stage_throughput(stages):
+    throughput = {}
+
+    for stage, record in stages.items():
+        wall = record.get("wall_seconds") or 0.0
+        rows = record.get("rows_in") or record.get("rows_out") or 0
+        moved = (record.get("bytes_read") or 0) + (record.get("bytes_written") or 0)
+
+        throughput[stage] = {
+            "wall_seconds": round(wall, 4),
+            "cpu_seconds": (
+                round(record["cpu_seconds"], 4)
+                if record.get("cpu_seconds") is not None else None
+            ),
+            "rows_per_second": round(rows / wall, 2) if wall > 0 and rows else None,
+            "mb_per_second": (
+                round(moved / 1e6 / wall, 3) if wall > 0 and moved else None
+            ),
+            "peak_rss_bytes": record.get("peak_rss_bytes"),
+            "tracemalloc_peak_bytes": record.get("tracemalloc_peak_bytes")
+        }
+
+    return throughput
+
+
 def compute_cost_quality(perf_metrics, execution_summary):
     # Use latest performance record
     latest_perf = perf_metrics[-1]
+    stages = stage_records(latest_perf)
+
+    stage_time = sum(
+        record["wall_seconds"] for record in stages.values()
+    )
+    # Run wall time when recorded; stage times of parallel workers
+    # are summed across processes and can exceed it
+    total_time = latest_perf.get("wall_seconds") or stage_time
 
-    total_time = sum(
-        latest_perf["stages"].values()
+    cpu_time = sum(
+        record.get("cpu_seconds") or 0.0 for record in stages.values()
     )
+    peaks = [
+        record["peak_rss_bytes"] for record in stages.values()
+        if record.get("peak_rss_bytes") is not None
+    ]
 
     input_records = execution_summary["records"]["input"]
     output_records = execution_summary["records"]["output"]
@@ -44,10 +95,20 @@ def compute_cost_quality(perf_metrics, execution_summary):
 
     return {
         "total_execution_time_seconds": round(total_time, 4),
+        "stage_time_seconds": round(stage_time, 4),
+        "cpu_time_seconds": round(cpu_time, 4),
+        "peak_rss_bytes": max(peaks) if peaks else None,
         "input_records": input_records,
         "output_records": output_records,
         "quality_ratio": round(quality_ratio, 4),
-        "quality_per_second": round(quality_per_second, 6)
+        "quality_per_second": round(quality_per_second, 6),
+        "input_rows_per_second": (
+            round(input_records / total_time, 2) if total_time > 0 else None
+        ),
+        "accepted_rows_per_second": (
+            round(output_records / total_time, 2) if total_time > 0 else None
+        ),
+        "stages": compute_stage_throughput(stages)
     }
 
 
@@ -66,7 +127,8 @@ def generate_cost_quality_report():
         "interpretation": (
             "Execution cost vs quality analysis evaluates whether "
             "data quality gains are achieved efficiently relative "
-            "to execution time."
+            "to execution time, using the measured rows, bytes, CPU "
+            "time and memory of every pipeline stage."
         )
     }
 
@@ -77,7 +139,8 @@ def generate_cost_quality_report():
     print(
         "Execution cost vs quality report generated "
         f"(quality_ratio={metrics['quality_ratio']}, "
-        f"time={metrics['total_execution_time_seconds']}s)"
+        f"time={metrics['total_execution_time_seconds']}s, "
+        f"accepted_rows_per_second={metrics['accepted_rows_per_second']})"
     )
 
 
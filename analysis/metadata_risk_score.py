@@ -1,6 +1,6 @@
+import csv
 import json
 import os
-import pandas as pd
 from datetime import datetime
 
 # =====================================================
@@ -25,11 +25,13 @@ def load_metadata_versions():
 def load_rejection_summary():
     if not os.path.exists(REJECTION_SUMMARY_PATH):
         raise FileNotFoundError("rejection_summary.csv not found")
-    return pd.read_csv(REJECTION_SUMMARY_PATH)
+    # One row per rejection rule; the stdlib reader is enough
+    with open(REJECTION_SUMMARY_PATH, newline="") as f:
+        return list(csv.DictReader(f))
 
 
-def compute_risk_score(metadata_versions, rejection_df):
-    total_rejections = rejection_df["count"].sum()
+def compute_risk_score(metadata_versions, rejection_rows):
+    total_rejections = sum(int(row["count"]) for row in rejection_rows)
 
     results = []
 
@@ -67,10 +69,10 @@ def compute_risk_score(metadata_versions, rejection_df):
 
 def generate_metadata_risk_report():
     metadata_versions = load_metadata_versions()
-    rejection_df = load_rejection_summary()
+    rejection_rows = load_rejection_summary()
 
     risk_scores = compute_risk_score(
-        metadata_versions, rejection_df
+        metadata_versions, rejection_rows
     )
 
     report = {
@@ -0,0 +1,109 @@
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transformations.numeric_parsers import parse_numeric  # noqa: E402
+
+ROWS = 1_000_000
+GARBAGE_RATE = 0.01
+REPEATS = 3
+OUTPUT_PATH = "experiments/numeric_parser_benchmark.json"
+
+
+def build_columns(rows, seed=42):
+    """
+    Synthetic Amazon-style text columns with a share of garbage values.
+    """
+    rng = np.random.default_rng(seed)
+
+    prices = rng.integers(49, 150000, rows)
+    percentages = rng.integers(0, 95, rows)
+    counts = rng.integers(1, 500000, rows)
+
+    columns = {
+        "currency": pd.Series([f"₹{v:,}" for v in prices]),
+        "percentage": pd.Series([f"{v}%" for v in percentages]),
+        "thousands": pd.Series([f"{v:,}" for v in counts])
+    }
+
+    garbage = rng.random(rows) < GARBAGE_RATE
+    for series in columns.values():
+        series[garbage] = "jjjjj"
+
+    return columns
+
+
+def naive_parse(value):
+    """
+    Per-row baseline: strip symbols and separators, then float().
+    """
+    if pd.isna(value):
+        return np.nan
+    text = str(value).strip().replace("₹", "").replace(",", "").replace("%", "")
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def best_of(fn, repeats=REPEATS):
+    """
+    Best wall time over several repeats, with the last result.
+    """
+    best = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark(rows=ROWS):
+    columns = build_columns(rows)
+    results = {}
+
+    for fmt, series in columns.items():
+        apply_seconds, baseline = best_of(lambda: series.apply(naive_parse))
+        vectorized_seconds, parsed = best_of(lambda: parse_numeric(series, fmt))
+
+        results[fmt] = {
+            "distinct_values": int(series.nunique()),
+            "apply_seconds": round(apply_seconds, 4),
+            "vectorized_seconds": round(vectorized_seconds, 4),
+            "speedup": round(apply_seconds / vectorized_seconds, 2),
+            "invalid_rows": int(parsed.isna().sum()),
+            "matches_baseline": bool(
+                np.allclose(parsed, baseline, equal_nan=True)
+            )
+        }
+
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "rows": rows,
+        "garbage_rate": GARBAGE_RATE,
+        "repeats": REPEATS,
+        "formats": results
+    }
+
+    with open(OUTPUT_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print("Numeric parser benchmark written to", OUTPUT_PATH)
+    for fmt, result in results.items():
+        print(
+            f"  {fmt:<11} apply {result['apply_seconds']:>7.3f}s  "
+            f"vectorized {result['vectorized_seconds']:>7.3f}s  "
+            f"x{result['speedup']}"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
@@ -0,0 +1,117 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REPEATS = 5
+OUTPUT_PATH = "experiments/startup_benchmark.json"
+
+# Libraries an entry point must not import just to start
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "yaml"]
+
+# Import budget per entry point (milliseconds, median of REPEATS fresh
+# interpreters). The pipeline entry also loads a compiled metadata
+# plan, which must come from the plan cache without parsing YAML.
+ENTRY_POINTS = {
+    "metadata_pipeline": {
+        "module": "metadata_pipeline",
+        "statement": "metadata_pipeline.load_plan('metadata/online_retail.yaml')",
+        "budget_ms": 100
+    },
+    "orchestration": {
+        "module": "orchestration",
+        "budget_ms": 100
+    },
+    "agent.quantum_agent": {
+        "module": "agent.quantum_agent",
+        "budget_ms": 100
+    },
+    "agent.classical_confidence_agent": {
+        "module": "agent.classical_confidence_agent",
+        "budget_ms": 100
+    },
+    "analysis.metadata_risk_score": {
+        "module": "analysis.metadata_risk_score",
+        "budget_ms": 100
+    }
+}
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+{statement}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "heavy": [m for m in {heavy!r} if m in sys.modules]
+}}))
+"""
+
+
+def probe(entry):
+    """
+    Time one import of an entry point in a fresh interpreter.
+    """
+    code = PROBE.format(
+        module=entry["module"],
+        statement=entry.get("statement", ""),
+        heavy=HEAVY_MODULES
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(repeats=REPEATS):
+    # Warm-up: bytecode and the metadata plan cache
+    for entry in ENTRY_POINTS.values():
+        probe(entry)
+
+    results = {}
+
+    for name, entry in ENTRY_POINTS.items():
+        samples = [probe(entry) for _ in range(repeats)]
+        median_ms = statistics.median(sample["ms"] for sample in samples)
+        heavy = sorted({m for sample in samples for m in sample["heavy"]})
+
+        results[name] = {
+            "median_ms": round(median_ms, 2),
+            "max_ms": round(max(sample["ms"] for sample in samples), 2),
+            "budget_ms": entry["budget_ms"],
+            "heavy_modules_loaded": heavy,
+            "within_budget": median_ms <= entry["budget_ms"] and not heavy
+        }
+
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "repeats": repeats,
+        "entry_points": results
+    }
+
+    with open(os.path.join(REPO_ROOT, OUTPUT_PATH), "w") as f:
+        json.dump(report, f, indent=2)
+
+    print("Startup benchmark written to", OUTPUT_PATH)
+    for name, result in results.items():
+        note = "" if result["within_budget"] else "  OVER BUDGET"
+        if result["heavy_modules_loaded"]:
+            note += "  loads " + ", ".join(result["heavy_modules_loaded"])
+        print(
+            f"  {name:<34} {result['median_ms']:>7.1f} ms  "
+            f"(budget {result['budget_ms']} ms){note}"
+        )
+
+    return all(result["within_budget"] for result in results.values())
+
+
+if __name__ == "__main__":
+    ok = run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else REPEATS)
+    sys.exit(0 if ok else 1)
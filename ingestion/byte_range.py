@@ -0,0 +1,136 @@
+"""
+BYTE RANGE SOURCE ACCESS
+------------------------
+Purpose:
+    Expose a byte range of a delimited text source as a readable
+    stream that starts with the source header line, so pandas can
+    parse any slice of the file as if it were a complete file.
+
+Design Rules:
+    - Ranges are absolute byte offsets into the source file
+    - Range ends are aligned to a line boundary; the end of the file
+      is one, even without a trailing newline
+    - No parsing, no pandas dependency
+"""
+
+from typing import Tuple
+import hashlib
+import io
+import os
+
+
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+def read_header_line(path: str) -> Tuple[bytes, int]:
+    """
+    Return the raw header line (including its newline) and the
+    byte offset at which the first data row starts.
+    """
+
+    with open(path, "rb") as f:
+        header = f.readline()
+
+    return header, len(header)
+
+
+def align_to_line_end(path: str, offset: int) -> int:
+    """
+    Move an offset back to just after the last newline before it,
+    so a row that is still being appended is never cut in half. An
+    offset at (or past) the end of the file is kept: the end of the
+    file ends its last row, terminated or not.
+    """
+
+    if offset <= 0:
+        return 0
+
+    size = os.path.getsize(path)
+    if offset >= size:
+        return size
+
+    with open(path, "rb") as f:
+        position = offset
+        while position > 0:
+            start = max(0, position - READ_BLOCK_SIZE)
+            f.seek(start)
+            block = f.read(position - start)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                return start + newline + 1
+            position = start
+
+    return 0
+
+
+def head_fingerprint(path: str, length: int) -> str:
+    """
+    md5 of the first `length` bytes of a file. Used to detect a
+    source that was replaced rather than appended to.
+    """
+
+    digest = hashlib.md5()
+    remaining = length
+
+    with open(path, "rb") as f:
+        while remaining > 0:
+            block = f.read(min(READ_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+
+    return digest.hexdigest()
+
+
+class ByteRangeStream(io.RawIOBase):
+    """
+    Raw stream over `prefix` followed by bytes [start, end) of a file.
+    """
+
+    def __init__(self, path: str, start: int, end: int, prefix: bytes = b""):
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._remaining = max(0, end - start)
+        self._prefix = prefix
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = len(buffer)
+
+        if self._prefix:
+            n = min(size, len(self._prefix))
+            buffer[:n] = self._prefix[:n]
+            self._prefix = self._prefix[n:]
+            return n
+
+        if self._remaining <= 0:
+            return 0
+
+        data = self._file.read(min(size, self._remaining))
+        n = len(data)
+        buffer[:n] = data
+        self._remaining -= n
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def open_byte_range(path: str, start: int, end: int) -> io.BufferedReader:
+    """
+    Open bytes [start, end) of a delimited source as a buffered
+    stream that begins with the source header line.
+    """
+
+    header, data_start = read_header_line(path)
+    start = max(start, data_start)
+
+    return io.BufferedReader(
+        ByteRangeStream(path, start, end, prefix=header),
+        buffer_size=READ_BLOCK_SIZE
+    )
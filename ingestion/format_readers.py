@@ -0,0 +1,228 @@
+"""
+SOURCE FORMAT READERS
+---------------------
+Purpose:
+    Readers for the non-delimited source formats selectable with
+    metadata `source.format`:
+
+        parquet : pyarrow.parquet, record batches per row group
+        jsonl   : JSON Lines, one object per line
+        arrow   : Arrow IPC file (feather v2) or stream
+
+    Every reader offers the same three operations as the csv reader:
+    column names, chunked iteration with column projection, and a
+    row-count estimate.
+
+Design Rules:
+    - Columnar formats are never text-parsed: projection is pushed
+      into the reader and batches are converted straight to pandas
+    - Chunked iteration yields at most chunk_size rows per frame;
+      chunk_size None yields the whole source as one frame
+    - Declared dtypes are applied after conversion, as for csv
+    - pyarrow is only imported by the reader that needs it
+"""
+
+from typing import Dict, Iterator, List, Optional
+import os
+
+import pandas as pd  # type: ignore
+
+
+ESTIMATE_SAMPLE_BYTES = 1024 * 1024
+
+
+# =====================================================
+# SHARED
+# =====================================================
+
+def apply_declared_dtypes(df: pd.DataFrame, metadata: Dict) -> pd.DataFrame:
+    dtypes = metadata["source"].get("dtypes") or {}
+    declared = {
+        c: d for c, d in dtypes.items()
+        if c in df.columns and str(df[c].dtype) != d
+    }
+    return df.astype(declared) if declared else df
+
+
+def _iter_batches_as_frames(batches, metadata: Dict) -> Iterator[pd.DataFrame]:
+    for batch in batches:
+        if batch.num_rows:
+            yield apply_declared_dtypes(batch.to_pandas(), metadata)
+
+
+def _rebatch(batches, chunk_size: int):
+    """
+    Regroup record batches into batches of exactly chunk_size rows
+    (the last one may be shorter).
+    """
+    import pyarrow as pa  # type: ignore
+
+    pending = []
+    pending_rows = 0
+
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+
+        while pending_rows >= chunk_size:
+            table = pa.Table.from_batches(pending)
+            yield from table.slice(0, chunk_size).combine_chunks().to_batches()
+            rest = table.slice(chunk_size)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+
+    if pending_rows:
+        yield from pa.Table.from_batches(pending).combine_chunks().to_batches()
+
+
+def estimate_lines(path: str, header_lines: int = 0) -> int:
+    """
+    Row estimate of an uncompressed line-oriented file: file size
+    divided by the mean line length of its first block.
+    """
+
+    with open(path, "rb") as f:
+        block = f.read(ESTIMATE_SAMPLE_BYTES)
+
+    lines = block.count(b"\n")
+    if not lines:
+        return 0 if not block else 1
+
+    size = os.path.getsize(path)
+    if size <= len(block):
+        return max(0, lines - header_lines + (0 if block.endswith(b"\n") else 1))
+
+    return max(0, round(size / (len(block) / lines)) - header_lines)
+
+
+# =====================================================
+# PARQUET
+# =====================================================
+
+def parquet_columns(path: str) -> List[str]:
+    import pyarrow.parquet as pq  # type: ignore
+    return list(pq.ParquetFile(path).schema_arrow.names)
+
+
+def parquet_row_count(path: str) -> int:
+    import pyarrow.parquet as pq  # type: ignore
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def iter_parquet(
+    path: str,
+    metadata: Dict,
+    columns: Optional[List[str]],
+    chunk_size: Optional[int]
+) -> Iterator[pd.DataFrame]:
+    import pyarrow.parquet as pq  # type: ignore
+
+    parquet = pq.ParquetFile(path)
+    if columns is not None:
+        available = set(parquet.schema_arrow.names)
+        columns = [c for c in columns if c in available]
+
+    if chunk_size is None:
+        yield apply_declared_dtypes(
+            parquet.read(columns=columns, use_threads=True).to_pandas(), metadata
+        )
+        return
+
+    yield from _iter_batches_as_frames(
+        parquet.iter_batches(batch_size=chunk_size, columns=columns), metadata
+    )
+
+
+# =====================================================
+# ARROW IPC
+# =====================================================
+
+def _open_ipc(path: str):
+    """
+    Random-access reader for an IPC file, or a stream reader for an
+    IPC stream, over a memory map.
+    """
+    import pyarrow as pa  # type: ignore
+
+    source = pa.memory_map(path, "r")
+    try:
+        return pa.ipc.open_file(source)
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pa.ipc.open_stream(source)
+
+
+def ipc_columns(path: str) -> List[str]:
+    return list(_open_ipc(path).schema.names)
+
+
+def ipc_row_count(path: str) -> Optional[int]:
+    reader = _open_ipc(path)
+    if not hasattr(reader, "num_record_batches"):
+        return None
+    # Batch headers only: the memory map is not read for the bodies
+    return sum(
+        reader.get_batch(i).num_rows for i in range(reader.num_record_batches)
+    )
+
+
+def iter_ipc(
+    path: str,
+    metadata: Dict,
+    columns: Optional[List[str]],
+    chunk_size: Optional[int]
+) -> Iterator[pd.DataFrame]:
+    import pyarrow as pa  # type: ignore
+
+    reader = _open_ipc(path)
+    schema = reader.schema
+
+    if hasattr(reader, "num_record_batches"):
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    else:
+        batches = iter(reader)
+
+    if columns is not None:
+        wanted = [c for c in columns if c in set(schema.names)]
+        schema = pa.schema([schema.field(c) for c in wanted])
+        batches = (batch.select(wanted) for batch in batches)
+
+    if chunk_size is None:
+        table = pa.Table.from_batches(list(batches), schema=schema)
+        yield apply_declared_dtypes(table.to_pandas(), metadata)
+        return
+
+    yield from _iter_batches_as_frames(_rebatch(batches, chunk_size), metadata)
+
+
+# =====================================================
+# JSON LINES
+# =====================================================
+
+def jsonl_columns(stream) -> List[str]:
+    first = pd.read_json(stream, lines=True, nrows=1)
+    return list(first.columns)
+
+
+def iter_jsonl(
+    stream,
+    metadata: Dict,
+    columns: Optional[List[str]],
+    chunk_size: Optional[int]
+) -> Iterator[pd.DataFrame]:
+    # Values keep their JSON types; strings are not date-converted,
+    # matching the csv readers
+    options = {"lines": True, "dtype": False, "convert_dates": False}
+
+    def project(df):
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        return apply_declared_dtypes(df, metadata)
+
+    if chunk_size is None:
+        yield project(pd.read_json(stream, **options))
+        return
+
+    with pd.read_json(stream, chunksize=chunk_size, **options) as reader:
+        for chunk in reader:
+            yield project(chunk)
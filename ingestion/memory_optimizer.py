@@ -0,0 +1,293 @@
+"""
+MEMORY OPTIMIZER
+----------------
+Purpose:
+    Shrink each ingested chunk before it is transformed:
+        - low-cardinality text columns become categoricals whose
+          dictionary is kept stable across the chunks of a stream
+        - integer and float columns are downcast to the smallest
+          width that holds the chunk's values exactly
+
+    Bytes saved are accumulated per column for the performance
+    metrics.
+
+Design Rules:
+    - Encoding decisions are made once per column (first chunk) and
+      dictionaries only grow, so a value keeps its code for the rest
+      of the stream; a column whose dictionary would exceed
+      max_categories is released back to its source dtype
+    - A conversion that does not make the chunk smaller is undone;
+      an encoded column is then released, since its dictionary (part
+      of every chunk's footprint) only grows
+    - The optimization is internal: restore_dtypes converts outputs
+      back to their source dtypes before they are written, so target
+      schemas do not depend on per-chunk widths
+    - Parallel partitions keep their own dictionaries; merged
+      metrics report the size of their union
+    - No I/O
+"""
+
+from typing import Dict, Optional
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+
+DEFAULT_MAX_CARDINALITY_RATIO = 0.5
+DEFAULT_MAX_CATEGORIES = 10000
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+def resolve_memory_config(metadata: Dict, plan: Dict) -> Optional[Dict]:
+    """
+    Optimizer settings from the metadata `memory_optimization` block,
+    or None when disabled. Columns cast to numeric by the plan are
+    never dictionary-encoded.
+    """
+
+    options = metadata.get("memory_optimization") or {}
+    if options.get("enabled", True) is False:
+        return None
+
+    return {
+        "max_cardinality_ratio": float(
+            options.get("max_cardinality_ratio") or DEFAULT_MAX_CARDINALITY_RATIO
+        ),
+        "max_categories": int(
+            options.get("max_categories") or DEFAULT_MAX_CATEGORIES
+        ),
+        "downcast": options.get("downcast", True),
+        "exclude": {cast["column"] for cast in plan["casts"]}
+    }
+
+
+def new_memory_state(config: Dict) -> Dict:
+    return {
+        "config": config,
+        "source_dtypes": {},
+        "dictionaries": {},
+        "released": set(),
+        "columns": {}
+    }
+
+
+# =====================================================
+# COLUMN OPTIMIZERS
+# =====================================================
+
+def _is_text(series: pd.Series) -> bool:
+    return (
+        pd.api.types.is_object_dtype(series)
+        or pd.api.types.is_string_dtype(series)
+        or isinstance(series.dtype, pd.CategoricalDtype)
+    )
+
+
+def _encode(series: pd.Series, column: str, state: Dict) -> Optional[pd.Series]:
+    """
+    Encode against the column's stable dictionary, or None when the
+    column is not (or no longer) dictionary-encoded.
+    """
+
+    config = state["config"]
+    dictionaries = state["dictionaries"]
+
+    if column in state["released"] or column in config["exclude"]:
+        return None
+
+    uniques = pd.Index(series.dropna().unique())
+
+    if column not in dictionaries:
+        non_null = int(series.notna().sum())
+        if (
+            not non_null
+            or len(uniques) > config["max_categories"]
+            or len(uniques) / non_null > config["max_cardinality_ratio"]
+        ):
+            state["released"].add(column)
+            return None
+        dictionaries[column] = pd.Index([], dtype=uniques.dtype)
+
+    dictionary = dictionaries[column]
+    new_values = uniques[~uniques.isin(dictionary)]
+
+    if len(dictionary) + len(new_values) > config["max_categories"]:
+        state["released"].add(column)
+        return None
+
+    if len(new_values):
+        dictionary = dictionary.append(new_values)
+        dictionaries[column] = dictionary
+
+    return pd.Series(
+        pd.Categorical(series, categories=dictionary),
+        index=series.index,
+        name=series.name
+    )
+
+
+def _downcast(series: pd.Series) -> Optional[pd.Series]:
+    if pd.api.types.is_bool_dtype(series) or not isinstance(series.dtype, np.dtype):
+        return None
+
+    if pd.api.types.is_integer_dtype(series):
+        kind = "unsigned" if pd.api.types.is_unsigned_integer_dtype(series) else "integer"
+        narrowed = pd.to_numeric(series, downcast=kind)
+        return narrowed if narrowed.dtype != series.dtype else None
+
+    if pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+        narrowed = series.astype(np.float32)
+        # Only lossless: every value must round-trip through float32
+        if np.array_equal(
+            narrowed.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True
+        ):
+            return narrowed
+
+    return None
+
+
+# =====================================================
+# CHUNK OPTIMIZATION
+# =====================================================
+
+def optimize_chunk(df: pd.DataFrame, state: Dict) -> pd.DataFrame:
+    """
+    Encode and downcast one chunk.
+
+    Parameters:
+        df (DataFrame): Chunk as read from the source
+        state (dict): Memory state of the stream, updated in place
+
+    Returns:
+        DataFrame: Chunk with optimized column dtypes
+    """
+
+    optimized = {}
+
+    for column in df.columns:
+        series = df[column]
+        state["source_dtypes"].setdefault(column, series.dtype)
+
+        if _is_text(series):
+            narrowed = _encode(series, column, state)
+        elif state["config"]["downcast"]:
+            narrowed = _downcast(series)
+        else:
+            narrowed = None
+
+        if narrowed is None:
+            continue
+
+        before = int(series.memory_usage(index=False, deep=True))
+        after = int(narrowed.memory_usage(index=False, deep=True))
+
+        if after >= before:
+            if column in state["dictionaries"]:
+                state["released"].add(column)
+            continue
+
+        entry = state["columns"].setdefault(column, {
+            "source_dtype": str(series.dtype),
+            "optimized_dtype": None,
+            "bytes_before": 0,
+            "bytes_after": 0
+        })
+        entry["optimized_dtype"] = str(narrowed.dtype)
+        entry["bytes_before"] += before
+        entry["bytes_after"] += after
+
+        optimized[column] = narrowed
+
+    return df.assign(**optimized) if optimized else df
+
+
+def restore_dtypes(df: pd.DataFrame, state: Optional[Dict]) -> pd.DataFrame:
+    """
+    Convert optimized columns back to their source dtypes before a
+    chunk is written. Columns that were categorical in the source
+    keep the stable dictionary.
+    """
+
+    if state is None:
+        return df
+
+    restored = {}
+    for column, dtype in state["source_dtypes"].items():
+        if column not in df.columns or isinstance(dtype, pd.CategoricalDtype):
+            continue
+        if df[column].dtype != dtype:
+            restored[column] = df[column].astype(dtype)
+
+    return df.assign(**restored) if restored else df
+
+
+# =====================================================
+# METRICS
+# =====================================================
+
+def merge_memory_states(left: Optional[Dict], right: Optional[Dict]) -> Optional[Dict]:
+    """
+    Combine per-column byte counts of two streams (partitions).
+    """
+
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    merged = new_memory_state(left["config"])
+    merged["source_dtypes"] = {**right["source_dtypes"], **left["source_dtypes"]}
+    merged["released"] = left["released"] | right["released"]
+
+    for column in list(left["dictionaries"]) + list(right["dictionaries"]):
+        if column in merged["dictionaries"]:
+            continue
+        dictionary = left["dictionaries"].get(column)
+        other = right["dictionaries"].get(column)
+        if dictionary is None:
+            dictionary = other
+        elif other is not None:
+            dictionary = dictionary.append(other[~other.isin(dictionary)])
+        merged["dictionaries"][column] = dictionary
+
+    for state in (left, right):
+        for column, entry in state["columns"].items():
+            target = merged["columns"].setdefault(column, {
+                "source_dtype": entry["source_dtype"],
+                "optimized_dtype": entry["optimized_dtype"],
+                "bytes_before": 0,
+                "bytes_after": 0
+            })
+            target["bytes_before"] += entry["bytes_before"]
+            target["bytes_after"] += entry["bytes_after"]
+
+    return merged
+
+
+def summarize_memory_savings(state: Dict) -> Dict:
+    """
+    Per-column and total bytes saved, for the performance metrics.
+    """
+
+    columns = {
+        column: {
+            **entry,
+            "bytes_saved": entry["bytes_before"] - entry["bytes_after"],
+            "dictionary_size": (
+                len(state["dictionaries"][column])
+                if column in state["dictionaries"] else None
+            )
+        }
+        for column, entry in state["columns"].items()
+    }
+
+    return {
+        "columns": columns,
+        "released_columns": sorted(state["released"] & set(columns)),
+        "bytes_before": sum(c["bytes_before"] for c in columns.values()),
+        "bytes_after": sum(c["bytes_after"] for c in columns.values()),
+        "bytes_saved": sum(c["bytes_saved"] for c in columns.values())
+    }
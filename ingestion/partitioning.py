@@ -0,0 +1,133 @@
+"""
+SOURCE PARTITIONING
+-------------------
+Purpose:
+    Split a byte range of a delimited source into row-aligned
+    partitions that can be parsed independently by parallel workers.
+
+Design Rules:
+    - Partition boundaries always fall just after a record-ending
+      newline, never inside a quoted field: fields such as
+      review_content contain quoted commas and newlines
+    - Quote state is tracked by quote parity ('""' escapes keep the
+      parity unchanged), using block-wise bytes.count scans
+    - No parsing, no pandas dependency
+"""
+
+from typing import List, Tuple
+
+from ingestion.byte_range import READ_BLOCK_SIZE
+
+
+def _quote_parity(f, start: int, end: int) -> int:
+    """
+    Parity of double quotes in bytes [start, end) of an open file.
+    """
+
+    parity = 0
+    f.seek(start)
+    remaining = end - start
+
+    while remaining > 0:
+        block = f.read(min(READ_BLOCK_SIZE, remaining))
+        if not block:
+            break
+        parity ^= block.count(b'"') & 1
+        remaining -= len(block)
+
+    return parity
+
+
+def _next_record_boundary(
+    f, offset: int, end: int, parity: int, track_quotes: bool = True
+) -> int:
+    """
+    First offset >= `offset` that starts a new record, given the
+    quote parity at `offset`. Returns `end` when there is none.
+    """
+
+    position = offset
+    f.seek(position)
+
+    while position < end:
+        block = f.read(min(READ_BLOCK_SIZE, end - position))
+        if not block:
+            break
+
+        cursor = 0
+        while True:
+            newline = block.find(b"\n", cursor)
+            if newline == -1:
+                if track_quotes:
+                    parity ^= block.count(b'"', cursor) & 1
+                break
+
+            if track_quotes:
+                parity ^= block.count(b'"', cursor, newline) & 1
+            if parity == 0:
+                return position + newline + 1
+            cursor = newline + 1
+
+        position += len(block)
+
+    return end
+
+
+def plan_byte_ranges(
+    path: str,
+    start: int,
+    end: int,
+    partitions: int,
+    quoted_newlines: bool = True
+) -> List[Tuple[int, int]]:
+    """
+    Split [start, end) into up to `partitions` record-aligned ranges.
+
+    Parameters:
+        path (str): Source file
+        start (int): First data byte (after the header)
+        end (int): End of the data to split (a record boundary)
+        partitions (int): Desired number of ranges
+        quoted_newlines (bool): False when the source never has
+            newlines inside quoted fields, which skips quote tracking
+
+    Returns:
+        list: Non-empty, contiguous (start, end) byte ranges
+    """
+
+    if end <= start:
+        return []
+
+    partitions = max(1, int(partitions))
+    step = (end - start) / partitions
+
+    boundaries = [start]
+
+    with open(path, "rb") as f:
+        # Quote parity is 0 at every record boundary, so the scan
+        # only has to cover the bytes since the previous boundary
+        scanned = start
+
+        for i in range(1, partitions):
+            target = max(int(start + step * i), boundaries[-1])
+
+            parity = (
+                _quote_parity(f, scanned, target) if quoted_newlines else 0
+            )
+            boundary = _next_record_boundary(
+                f, target, end, parity, track_quotes=quoted_newlines
+            )
+
+            if boundary >= end:
+                break
+
+            boundaries.append(boundary)
+            scanned = boundary
+
+    boundaries.append(end)
+
+    return [
+        (boundaries[i], boundaries[i + 1])
+        for i in range(len(boundaries) - 1)
+        if boundaries[i + 1] > boundaries[i]
+    ]
@@ -0,0 +1,374 @@
+"""
+PREDICATE PUSHDOWN
+------------------
+Purpose:
+    Evaluate the row-level validation rules inside the source reader,
+    so rows that are certain to be rejected are never materialized as
+    full pandas frames. Enabled with metadata
+    `source.predicate_pushdown: true`.
+
+Design Rules:
+    - The pushed predicates are the transformation plan's rules
+      without the duplicate-key rule (not_null, numeric, positive,
+      non_negative). A row is pruned when any of them fails. Duplicate
+      keys depend on earlier rows and stay in the chunk processor
+    - Predicates only need the predicate columns: the rule and cast
+      columns, plus the columns later stages read from every row
+      (watermark, sampling strata and keys)
+    - csv: rows are parsed by the pyarrow CSV reader; the predicate
+      columns are converted to pandas first and the remaining columns
+      only for the surviving rows
+    - parquet: per row group, the predicate columns are read first and
+      the remaining columns only when a row survives. Row groups whose
+      column statistics prove every predicate passes skip evaluation
+    - Other formats are split after reading
+    - Readers yield (surviving rows, pruned rows) pairs. Pruned rows
+      keep the predicate columns only and are still counted as input
+      and rejected with their exact first-failing rule
+      (chunk_processor.process_pruned)
+    - A run only pushes predicates down when it never needs a pruned
+      row in full: no rejected target is written and no column
+      profile is built (resolve_run_pushdown)
+    - Sampled dry runs also prune the rows outside the sample
+      (transformations/sampling.py), selected from the key and strata
+      columns before any predicate is evaluated. Rows then carry
+      SAMPLED_COLUMN, so the chunk processor does not sample them
+      again: it counts unsampled pruned rows in their stratum and
+      drops them. Only sampled rows are validated and read in full
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from ingestion.format_readers import apply_declared_dtypes
+from ingestion.source_reader import (
+    DEFAULT_CHUNK_SIZE,
+    arrow_csv_options,
+    close_source,
+    iter_source_chunks,
+    open_source,
+    projected_columns,
+    resolve_format
+)
+from transformations.sampling import SAMPLED_COLUMN, sampled_rows
+from transformations.transform import apply_transformation_plan
+
+
+NUMERIC_DTYPES = {"int8", "int16", "int32", "int64", "float32", "float64"}
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+def resolve_pushdown_config(metadata: Dict, transformation_plan: Dict) -> Optional[Dict]:
+    """
+    Predicates pushed into the reader, or None when the source reads
+    every row in full.
+
+    Returns:
+        dict: `plan` (transformation plan of the pushed rules and
+              their casts) and `columns` (physical predicate columns)
+    """
+
+    if not metadata["source"].get("predicate_pushdown"):
+        return None
+
+    rules = [rule for rule in transformation_plan["rules"] if rule["kind"] != "unique"]
+    if not rules:
+        return None
+
+    columns = [rule["column"] for rule in rules]
+    casts = [cast for cast in transformation_plan["casts"] if cast["column"] in columns]
+
+    return {
+        "plan": {
+            "dataset_id": transformation_plan["dataset_id"],
+            "casts": casts,
+            "rules": rules
+        },
+        "columns": list(dict.fromkeys(columns))
+    }
+
+
+def resolve_run_pushdown(
+    config: Optional[Dict],
+    writes_rejected: bool,
+    profiled: bool,
+    sampling: Optional[Dict] = None,
+    key_columns: Optional[List[str]] = None,
+    watermark_column: Optional[str] = None
+) -> Optional[Dict]:
+    """
+    Pushdown settings of one run, or None when the run needs pruned
+    rows in full.
+
+    Parameters:
+        config (dict): Output of resolve_pushdown_config
+        writes_rejected (bool): Rejected rows are written this run
+        profiled (bool): A column profile is built this run
+        sampling (dict): Sampling state of a sampled dry run
+        key_columns (list): Deduplication key (physical columns)
+        watermark_column (str): Physical column tracked for high-water
+
+    Returns:
+        dict: `plan` and `columns` to read before pruning, and the
+              `sampling` state and `key_columns` of a sampled run
+    """
+
+    if config is None or writes_rejected or profiled:
+        return None
+
+    columns = list(config["columns"])
+
+    if sampling is not None:
+        # Pruned rows are sampled like any other row, which needs
+        # their sampling unit: without a key it is the whole row
+        if not key_columns:
+            return None
+        columns += key_columns
+        if sampling["config"]["strata_column"]:
+            columns.append(sampling["config"]["strata_column"])
+
+    if watermark_column:
+        columns.append(watermark_column)
+
+    return {
+        "plan": config["plan"],
+        "columns": list(dict.fromkeys(columns)),
+        "sampling": sampling,
+        "key_columns": key_columns if sampling is not None else None
+    }
+
+
+# =====================================================
+# PREDICATE EVALUATION
+# =====================================================
+
+def surviving_rows(df: pd.DataFrame, pushdown: Dict) -> np.ndarray:
+    """
+    Boolean mask of the rows that pass every pushed predicate.
+    """
+
+    _, failures = apply_transformation_plan(df, pushdown["plan"])
+    return ~failures.to_numpy(dtype=bool).any(axis=1)
+
+
+def _select_rows(keys: pd.DataFrame, pushdown: Dict) -> Tuple[np.ndarray, pd.DataFrame]:
+    """
+    Rows to read in full, and the predicate columns of the others.
+    In a sampled run only sampled rows are evaluated and kept; the
+    pruned rows say whether they were sampled (SAMPLED_COLUMN).
+    """
+
+    sampling = pushdown.get("sampling")
+    if sampling is None:
+        keep = surviving_rows(keys, pushdown)
+        return keep, keys[~keep]
+
+    sampled = sampled_rows(keys, sampling, pushdown["key_columns"])
+    keep = sampled.copy()
+    keep[sampled] = surviving_rows(keys[sampled], pushdown)
+
+    return keep, keys[~keep].assign(**{SAMPLED_COLUMN: sampled[~keep]})
+
+
+def _flag_sampled(df: pd.DataFrame, pushdown: Dict) -> pd.DataFrame:
+    # Rows read in full by a sampled run are all in the sample
+    if pushdown.get("sampling") is None:
+        return df
+    return df.assign(**{SAMPLED_COLUMN: True})
+
+
+def _split_table(table, metadata: Dict, pushdown: Dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Split an Arrow table: predicate columns are converted first, the
+    remaining columns only for the surviving rows.
+    """
+    import pyarrow as pa  # type: ignore
+
+    names = [c for c in pushdown["columns"] if c in table.column_names]
+    keys = apply_declared_dtypes(table.select(names).to_pandas(), metadata)
+    keep, pruned = _select_rows(keys, pushdown)
+
+    if keep.all():
+        survivors = table
+    else:
+        survivors = table.filter(pa.array(keep))
+
+    df = apply_declared_dtypes(survivors.to_pandas(), metadata)
+    df.index = keys.index[keep]
+
+    return _flag_sampled(df, pushdown), pruned
+
+
+def _split_frame(df: pd.DataFrame, pushdown: Dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    names = [c for c in pushdown["columns"] if c in df.columns]
+    keep, pruned = _select_rows(df[names], pushdown)
+    return _flag_sampled(df[keep], pushdown), pruned
+
+
+# =====================================================
+# READERS
+# =====================================================
+
+def _iter_csv(metadata: Dict, pushdown: Dict, byte_range, stats) -> Iterator:
+    import pyarrow.csv as pacsv  # type: ignore
+
+    chunk_size = int(metadata["source"].get("chunk_size") or DEFAULT_CHUNK_SIZE)
+    stream = open_source(metadata, byte_range, stats)
+
+    try:
+        table = pacsv.read_csv(stream, **arrow_csv_options(metadata))
+    finally:
+        close_source(stream)
+
+    for offset in range(0, table.num_rows, chunk_size):
+        survivors, pruned = _split_table(
+            table.slice(offset, chunk_size), metadata, pushdown
+        )
+        survivors.index += offset
+        pruned.index += offset
+        yield survivors, pruned
+
+
+def _statistics_pass(parquet, row_group: int, metadata: Dict, pushdown: Dict) -> bool:
+    """
+    Whether the column statistics of a row group prove that every
+    pushed predicate passes on all of its rows. Numeric rules are only
+    proven on numeric columns (parsing them never fails); not_null is
+    never proven on float columns (NaN is not counted as null).
+    """
+    import pyarrow as pa  # type: ignore
+
+    schema = parquet.schema_arrow
+    columns = parquet.metadata.row_group(row_group)
+    dtypes = metadata["source"].get("dtypes") or {}
+
+    for rule in pushdown["plan"]["rules"]:
+        index = schema.get_field_index(rule["column"])
+        if index < 0:
+            return False
+
+        field_type = schema.field(index).type
+        declared = dtypes.get(rule["column"])
+        numeric = (
+            (pa.types.is_integer(field_type) or pa.types.is_floating(field_type))
+            and (declared is None or declared in NUMERIC_DTYPES)
+        )
+        statistics = columns.column(index).statistics
+        if statistics is None:
+            return False
+
+        if rule["kind"] == "not_null":
+            proven = (
+                statistics.has_null_count and statistics.null_count == 0
+                and not pa.types.is_floating(field_type)
+            )
+        elif not numeric:
+            proven = False
+        elif rule["kind"] == "numeric":
+            proven = True
+        elif not statistics.has_min_max:
+            proven = False
+        elif rule["kind"] == "positive":
+            proven = statistics.min > 0
+        else:
+            proven = statistics.min >= 0
+
+        if not proven:
+            return False
+
+    return True
+
+
+def _iter_parquet(metadata: Dict, pushdown: Dict, byte_range, stats) -> Iterator:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    parquet = pq.ParquetFile(metadata["source"]["path"])
+    available = list(parquet.schema_arrow.names)
+
+    columns = projected_columns(metadata)
+    columns = available if columns is None else [c for c in columns if c in available]
+    names = [c for c in pushdown["columns"] if c in columns]
+    rest = [c for c in columns if c not in names]
+
+    offset = 0
+    for row_group in range(parquet.num_row_groups):
+        rows = parquet.metadata.row_group(row_group).num_rows
+        index = pd.RangeIndex(offset, offset + rows)
+        offset += rows
+
+        if pushdown.get("sampling") is None and _statistics_pass(
+            parquet, row_group, metadata, pushdown
+        ):
+            table = parquet.read_row_group(row_group, columns=columns)
+            df = apply_declared_dtypes(table.to_pandas(), metadata)
+            df.index = index
+            yield df, df.iloc[0:0][names]
+            continue
+
+        keys_table = parquet.read_row_group(row_group, columns=names)
+        keys = apply_declared_dtypes(keys_table.to_pandas(), metadata)
+        keys.index = index
+        keep, pruned = _select_rows(keys, pushdown)
+
+        if keep.any():
+            mask = pa.array(keep)
+            survivors = {
+                name: keys_table.column(name).filter(mask) for name in names
+            }
+            if rest:
+                others = parquet.read_row_group(row_group, columns=rest).filter(mask)
+                survivors.update({name: others.column(name) for name in rest})
+            table = pa.table({name: survivors[name] for name in columns})
+        else:
+            # No survivor: the remaining columns are never read
+            table = parquet.schema_arrow.empty_table().select(columns)
+
+        df = apply_declared_dtypes(table.to_pandas(), metadata)
+        df.index = index[keep]
+        yield _flag_sampled(df, pushdown), pruned
+
+
+PUSHDOWN_READERS = {
+    "csv": _iter_csv,
+    "parquet": _iter_parquet
+}
+
+
+def iter_pushdown_chunks(
+    metadata: Dict,
+    pushdown: Optional[Dict],
+    byte_range: Optional[Tuple[int, int]] = None,
+    stats: Optional[Dict] = None
+) -> Iterator[Tuple[pd.DataFrame, Optional[pd.DataFrame]]]:
+    """
+    Yield the source as (surviving rows, pruned rows) pairs.
+
+    Parameters:
+        metadata (dict): Dataset metadata
+        pushdown (dict): Output of resolve_run_pushdown; None reads
+                         every row in full (pruned rows are None)
+        byte_range (tuple): Optional (start, end) slice of the source
+        stats (dict): Optional compression stats (compressed sources)
+
+    Returns:
+        iterator: (DataFrame, DataFrame of predicate columns or None)
+    """
+
+    if pushdown is None:
+        for df in iter_source_chunks(metadata, byte_range, stats):
+            yield df, None
+        return
+
+    reader = PUSHDOWN_READERS.get(resolve_format(metadata["source"]))
+    if reader is not None:
+        yield from reader(metadata, pushdown, byte_range, stats)
+        return
+
+    for df in iter_source_chunks(metadata, byte_range, stats):
+        yield _split_frame(df, pushdown)
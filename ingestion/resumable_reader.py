@@ -0,0 +1,145 @@
+"""
+RESUMABLE SOURCE READS
+----------------------
+Purpose:
+    Read a source for a checkpointed run (storage/checkpoints.py) so
+    that the position after a chunk can be recorded and a later run
+    can continue from it without redoing the rows before it.
+
+Design Rules:
+    - Uncompressed csv sources are read as record-aligned byte
+      segments of about chunk_size rows (ingestion/partitioning.py),
+      each through iter_pushdown_chunks. The end of a segment is a
+      resumable position: its byte offset. A resumed read plans the
+      same segments and skips those before the offset
+    - Other sources (columnar, jsonl, compressed) are not
+      byte-addressable: every chunk is a resumable position, counted
+      in chunks, and a resumed read skips the chunks already
+      processed without transforming, validating or writing them
+    - The position is reported through a cursor dict updated before
+      each chunk is yielded: `chunks` read so far, `byte_offset` of
+      the next unread row (None when not byte-addressable) and
+      `boundary` (a checkpoint may be taken after this chunk)
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+import math
+import os
+
+import pandas as pd  # type: ignore
+
+from ingestion.byte_range import read_header_line
+from ingestion.partitioning import plan_byte_ranges
+from ingestion.pushdown import iter_pushdown_chunks
+from ingestion.source_reader import (
+    DEFAULT_CHUNK_SIZE,
+    estimate_source_rows,
+    source_supports_byte_ranges
+)
+
+
+def new_read_cursor(byte_offset: Optional[int] = None, chunks: int = 0) -> Dict:
+    """
+    Cursor of a read starting from scratch, or from a checkpointed
+    position.
+    """
+
+    return {"chunks": chunks, "byte_offset": byte_offset, "boundary": False}
+
+
+def plan_source_segments(
+    metadata: Dict,
+    start: int,
+    end: int
+) -> List[Tuple[int, int]]:
+    """
+    Record-aligned byte segments of [start, end), each about
+    chunk_size rows (rows estimated from the source's average row
+    length).
+    """
+
+    source = metadata["source"]
+    path = source["path"]
+    chunk_size = int(source.get("chunk_size") or DEFAULT_CHUNK_SIZE)
+
+    _, data_start = read_header_line(path)
+    estimated_rows = estimate_source_rows(metadata) or 0
+    data_bytes = os.path.getsize(path) - data_start
+
+    if end <= start:
+        return []
+    if not estimated_rows or data_bytes <= 0:
+        return [(start, end)]
+
+    row_bytes = data_bytes / estimated_rows
+    segments = math.ceil((end - start) / row_bytes / chunk_size)
+
+    return plan_byte_ranges(
+        path, start, end, segments,
+        quoted_newlines=source.get("quoted_newlines", True)
+    )
+
+
+def _with_lookahead(chunks: Iterator) -> Iterator[Tuple[object, bool]]:
+    """
+    Pair each item with whether it is the last one.
+    """
+
+    current = next(chunks, None)
+    while current is not None:
+        following = next(chunks, None)
+        yield current, following is None
+        current = following
+
+
+def iter_resumable_chunks(
+    metadata: Dict,
+    pushdown: Optional[Dict],
+    cursor: Dict,
+    byte_range: Optional[Tuple[int, int]] = None,
+    stats: Optional[Dict] = None
+) -> Iterator[Tuple[pd.DataFrame, Optional[pd.DataFrame]]]:
+    """
+    Yield (rows, pruned rows) pairs like iter_pushdown_chunks, from the
+    cursor's position on, updating the cursor.
+
+    Parameters:
+        metadata (dict): Dataset metadata
+        pushdown (dict): Output of resolve_run_pushdown, or None
+        cursor (dict): new_read_cursor, updated in place
+        byte_range (tuple): Optional (start, end) slice of the source
+        stats (dict): Optional compression stats (compressed sources)
+    """
+
+    if source_supports_byte_ranges(metadata):
+        path = metadata["source"]["path"]
+        _, data_start = read_header_line(path)
+        start, end = byte_range or (data_start, os.path.getsize(path))
+
+        # Segments are planned over the whole range, so a resumed read
+        # yields the same chunks as an uninterrupted one
+        segments = plan_source_segments(metadata, start, end)
+        if cursor["byte_offset"] is not None:
+            segments = [
+                segment for segment in segments
+                if segment[0] >= cursor["byte_offset"]
+            ]
+
+        for segment in segments:
+            chunks = iter_pushdown_chunks(metadata, pushdown, segment, stats)
+            for item, last in _with_lookahead(chunks):
+                cursor["chunks"] += 1
+                cursor["boundary"] = last
+                if last:
+                    cursor["byte_offset"] = segment[1]
+                yield item
+        return
+
+    skip = cursor["chunks"]
+    cursor["chunks"] = 0
+    cursor["boundary"] = True
+
+    for item in iter_pushdown_chunks(metadata, pushdown, byte_range, stats):
+        cursor["chunks"] += 1
+        if cursor["chunks"] > skip:
+            yield item
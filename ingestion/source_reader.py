@@ -0,0 +1,532 @@
+"""
+SOURCE READER MODULE
+--------------------
+Purpose:
+    Read a source into DataFrames with the format reader selected by
+    metadata `source.format` and the ingestion engine selected in the
+    metadata `source` block.
+
+Formats (SOURCE_FORMATS, extensible with register_source_format):
+    - csv     : delimited text, parsed by the engines below
+    - parquet : pyarrow.parquet (ingestion/format_readers.py)
+    - jsonl   : JSON Lines
+    - arrow   : Arrow IPC file or stream
+
+    Each reader lists the source columns, iterates projected chunks
+    and estimates the row count.
+
+Engines (csv):
+    - pandas    : pandas C parser, whole source as one frame
+    - arrow     : multi-threaded pyarrow CSV reader, converted to pandas
+    - streaming : pandas C parser in bounded-size chunks (chunk_size);
+                  for the other formats, chunk_size rows per frame
+
+Design Rules:
+    - Every engine yields DataFrames with the same columns and dtypes
+      (projection and declared dtypes applied), so downstream stages
+      do not depend on the engine
+    - Any engine can read a (start, end) byte range of an uncompressed
+      csv source, or the decompressed stream of a gzip/bz2/zstd text
+      source (csv, jsonl)
+    - pyarrow is only imported by the arrow engine
+    - The predicate pushdown readers (ingestion/pushdown.py) parse csv
+      with the arrow engine's options (arrow_csv_options)
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import os
+
+import pandas as pd  # type: ignore
+
+from ingestion.byte_range import open_byte_range
+from ingestion.compression import (
+    resolve_codec,
+    validate_compression_config,
+    decompression_workers,
+    open_decompressed
+)
+from ingestion.format_readers import (
+    apply_declared_dtypes,
+    estimate_lines,
+    parquet_columns,
+    parquet_row_count,
+    iter_parquet,
+    ipc_columns,
+    ipc_row_count,
+    iter_ipc,
+    jsonl_columns,
+    iter_jsonl
+)
+
+
+SUPPORTED_ENGINES = {"pandas", "arrow", "streaming"}
+
+SUPPORTED_DTYPES = {
+    "category", "string", "bool",
+    "int8", "int16", "int32", "int64",
+    "float32", "float64"
+}
+
+DEFAULT_CHUNK_SIZE = 100000
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+def resolve_engine(source: Dict) -> str:
+    """
+    Engine declared in source.engine. Sources that only declare a
+    chunk_size keep streaming; everything else defaults to pandas.
+    """
+
+    engine = source.get("engine")
+    if engine:
+        return engine
+
+    return "streaming" if source.get("chunk_size") else "pandas"
+
+
+def resolve_format(source: Dict) -> str:
+    return source.get("format") or "csv"
+
+
+def validate_source_config(source: Dict) -> None:
+    """
+    Validate the reader options of a metadata `source` block.
+    """
+
+    source_format = resolve_format(source)
+    if source_format not in SOURCE_FORMATS:
+        raise ValueError(
+            f"Metadata validation failed: unsupported source format "
+            f"'{source_format}'"
+        )
+
+    engine = resolve_engine(source)
+    if engine not in SUPPORTED_ENGINES:
+        raise ValueError(
+            f"Metadata validation failed: unsupported ingestion engine "
+            f"'{engine}'"
+        )
+
+    for column, dtype in (source.get("dtypes") or {}).items():
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(
+                f"Metadata validation failed: unsupported dtype '{dtype}' "
+                f"declared for column '{column}'"
+            )
+
+    if SOURCE_FORMATS[source_format]["text"]:
+        validate_compression_config(source)
+
+
+def projected_columns(metadata: Dict) -> Optional[List[str]]:
+    """
+    Physical columns to read when source.project_columns is set:
+    every mapped column, the declared pass-through columns, then the
+    columns split into child tables. Returns None when the full
+    source should be read.
+    """
+
+    source = metadata["source"]
+    if not source.get("project_columns"):
+        return None
+
+    columns = list(metadata["columns"].values())
+    columns += source.get("passthrough_columns") or []
+
+    for child in (metadata.get("child_tables") or {}).values():
+        columns += (child.get("split") or {}).get("columns") or []
+        if child.get("hierarchy"):
+            columns.append(child["hierarchy"]["column"])
+
+    return list(dict.fromkeys(columns))
+
+
+def build_read_options(metadata: Dict) -> Dict:
+    """
+    Translate source projection and declared dtypes into
+    pd.read_csv keyword arguments.
+    """
+
+    options = {}
+
+    columns = projected_columns(metadata)
+    if columns is not None:
+        # A callable keeps absent columns out of the reader error path,
+        # so they are still reported by schema validation
+        wanted = set(columns)
+        options["usecols"] = lambda column: column in wanted
+
+    dtypes = metadata["source"].get("dtypes")
+    if dtypes:
+        options["dtype"] = dict(dtypes)
+
+    return options
+
+
+def open_source(
+    metadata: Dict,
+    byte_range: Optional[Tuple[int, int]] = None,
+    stats: Optional[Dict] = None
+):
+    """
+    What the engines read from: the source path, a byte-range stream,
+    or the decompressed stream of a compressed source. Streams must be
+    closed by the caller.
+
+    Parameters:
+        metadata (dict): Dataset metadata
+        byte_range (tuple): Optional (start, end) slice of the source
+        stats (dict): Optional compression stats, updated while a
+                      compressed source is read
+    """
+
+    source = metadata["source"]
+    codec = source_codec(metadata)
+
+    if codec is not None:
+        if byte_range is not None:
+            raise ValueError(
+                f"Byte ranges are not supported for {codec}-compressed "
+                f"source {source['path']}"
+            )
+        return open_decompressed(
+            source["path"], codec, decompression_workers(source), stats
+        )
+
+    if byte_range is not None:
+        return open_byte_range(source["path"], *byte_range)
+
+    return source["path"]
+
+
+def close_source(stream) -> None:
+    if not isinstance(stream, str):
+        stream.close()
+
+
+def source_codec(metadata: Dict) -> Optional[str]:
+    """
+    Compression codec of a text source; columnar formats compress
+    internally and are never wrapped.
+    """
+
+    source = metadata["source"]
+    if not SOURCE_FORMATS[resolve_format(source)]["text"]:
+        return None
+    return resolve_codec(source)
+
+
+def source_supports_byte_ranges(metadata: Dict) -> bool:
+    """
+    Whether the source can be read by byte range (watermark resume,
+    parallel partitions): uncompressed formats that declare it.
+    """
+
+    reader = SOURCE_FORMATS[resolve_format(metadata["source"])]
+    return reader["byte_ranges"] and source_codec(metadata) is None
+
+
+def read_source_header(metadata: Dict) -> List[str]:
+    """
+    Column names of the source, without reading its rows.
+    """
+
+    return SOURCE_FORMATS[resolve_format(metadata["source"])]["columns"](metadata)
+
+
+def estimate_source_rows(metadata: Dict) -> Optional[int]:
+    """
+    Row count of the source: exact for columnar formats, estimated
+    from the first block for line formats, None when unknown.
+    """
+
+    return SOURCE_FORMATS[resolve_format(metadata["source"])]["estimate_rows"](
+        metadata
+    )
+
+
+def source_bytes(metadata: Dict, byte_range: Optional[Tuple[int, int]]) -> int:
+    """
+    Number of source bytes an ingestion pass will read.
+    """
+
+    if byte_range is not None:
+        return max(0, byte_range[1] - byte_range[0])
+
+    return os.path.getsize(metadata["source"]["path"])
+
+
+# =====================================================
+# ENGINES
+# =====================================================
+
+def _iter_pandas(stream, metadata: Dict) -> Iterator[pd.DataFrame]:
+    yield pd.read_csv(stream, **build_read_options(metadata))
+
+
+def _iter_streaming(stream, metadata: Dict) -> Iterator[pd.DataFrame]:
+    chunk_size = int(metadata["source"].get("chunk_size") or DEFAULT_CHUNK_SIZE)
+
+    with pd.read_csv(
+        stream, chunksize=chunk_size, **build_read_options(metadata)
+    ) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def _arrow_type(dtype: str):
+    import pyarrow as pa  # type: ignore
+
+    if dtype == "category":
+        return pa.dictionary(pa.int32(), pa.string())
+    if dtype == "string":
+        return pa.string()
+    return pa.from_numpy_dtype(dtype)
+
+
+def _arrow_timestamp_columns(metadata: Dict, parse_options) -> List[str]:
+    """
+    Columns arrow would infer as timestamps, found from the first
+    block of the source. pandas keeps these as text, so the arrow
+    engine reads them as strings to honour the same contract.
+    """
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pacsv  # type: ignore
+
+    stream = open_source(metadata)
+    try:
+        reader = pacsv.open_csv(stream, parse_options=parse_options)
+        schema = reader.schema
+        reader.close()
+    finally:
+        close_source(stream)
+
+    return [
+        field.name for field in schema
+        if pa.types.is_timestamp(field.type) or pa.types.is_date(field.type)
+    ]
+
+
+def arrow_csv_options(metadata: Dict) -> Dict:
+    """
+    pyarrow.csv.read_csv keyword arguments of the arrow engine:
+    projection, declared dtypes and pandas missing-value semantics.
+    """
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pacsv  # type: ignore
+
+    source = metadata["source"]
+    dtypes = source.get("dtypes") or {}
+
+    parse_options = pacsv.ParseOptions(
+        # Quoted newlines force serial row splitting; sources that
+        # declare quoted_newlines: false get fully parallel parsing
+        newlines_in_values=source.get("quoted_newlines", True)
+    )
+
+    column_types = {
+        column: pa.string()
+        for column in _arrow_timestamp_columns(metadata, parse_options)
+    }
+    column_types.update({
+        column: _arrow_type(dtype) for column, dtype in dtypes.items()
+    })
+
+    convert_options = {
+        # pandas semantics: empty fields are missing values
+        "strings_can_be_null": True,
+        "column_types": column_types
+    }
+
+    columns = projected_columns(metadata)
+    if columns is not None:
+        header = read_source_header(metadata)
+        wanted = set(columns)
+        convert_options["include_columns"] = [c for c in header if c in wanted]
+
+    read_options = {"use_threads": True}
+    if source.get("block_size"):
+        read_options["block_size"] = int(source["block_size"])
+
+    return {
+        "read_options": pacsv.ReadOptions(**read_options),
+        "parse_options": parse_options,
+        "convert_options": pacsv.ConvertOptions(**convert_options)
+    }
+
+
+def _iter_arrow(stream, metadata: Dict) -> Iterator[pd.DataFrame]:
+    import pyarrow.csv as pacsv  # type: ignore
+
+    table = pacsv.read_csv(stream, **arrow_csv_options(metadata))
+
+    yield apply_declared_dtypes(table.to_pandas(), metadata)
+
+
+ENGINE_READERS = {
+    "pandas": _iter_pandas,
+    "arrow": _iter_arrow,
+    "streaming": _iter_streaming
+}
+
+
+# =====================================================
+# FORMAT READERS
+# =====================================================
+
+def _chunk_size(source: Dict) -> Optional[int]:
+    if resolve_engine(source) != "streaming":
+        return None
+    return int(source.get("chunk_size") or DEFAULT_CHUNK_SIZE)
+
+
+def _iter_csv(stream, metadata: Dict) -> Iterator[pd.DataFrame]:
+    # The engines apply projection and chunking from the read options
+    return ENGINE_READERS[resolve_engine(metadata["source"])](stream, metadata)
+
+
+def _csv_columns(metadata: Dict) -> List[str]:
+    stream = open_source(metadata)
+    try:
+        return list(pd.read_csv(stream, nrows=0).columns)
+    finally:
+        close_source(stream)
+
+
+def _jsonl_columns(metadata: Dict) -> List[str]:
+    stream = open_source(metadata)
+    try:
+        return jsonl_columns(stream)
+    finally:
+        close_source(stream)
+
+
+def _line_estimate(header_lines: int) -> Callable[[Dict], Optional[int]]:
+    def estimate(metadata: Dict) -> Optional[int]:
+        if source_codec(metadata) is not None:
+            return None
+        return estimate_lines(metadata["source"]["path"], header_lines)
+    return estimate
+
+
+def _columnar(read) -> Callable:
+    def iter_chunks(stream, metadata: Dict) -> Iterator[pd.DataFrame]:
+        return read(
+            stream, metadata, projected_columns(metadata),
+            _chunk_size(metadata["source"])
+        )
+    return iter_chunks
+
+
+SOURCE_FORMATS: Dict[str, Dict] = {}
+
+
+def register_source_format(
+    name: str,
+    iter_chunks: Callable,
+    read_columns: Callable[[Dict], List[str]],
+    estimate_rows: Callable[[Dict], Optional[int]],
+    text: bool = False,
+    byte_ranges: bool = False
+) -> None:
+    """
+    Register a reader for a `source.format` value.
+
+    Parameters:
+        name (str): Format name used in metadata
+        iter_chunks (callable): (path or stream, metadata) -> frames,
+                                with projection and chunking applied
+        read_columns (callable): metadata -> source column names
+        estimate_rows (callable): metadata -> row count or None
+        text (bool): Read through open_source (decompression)
+        byte_ranges (bool): Rows can be read by byte range
+    """
+
+    SOURCE_FORMATS[name] = {
+        "iter_chunks": iter_chunks,
+        "columns": read_columns,
+        "estimate_rows": estimate_rows,
+        "text": text,
+        "byte_ranges": byte_ranges
+    }
+
+
+register_source_format(
+    "csv", _iter_csv, _csv_columns, _line_estimate(header_lines=1),
+    text=True, byte_ranges=True
+)
+register_source_format(
+    "jsonl", _columnar(iter_jsonl), _jsonl_columns, _line_estimate(header_lines=0),
+    text=True
+)
+register_source_format(
+    "parquet", _columnar(iter_parquet),
+    lambda metadata: parquet_columns(metadata["source"]["path"]),
+    lambda metadata: parquet_row_count(metadata["source"]["path"])
+)
+register_source_format(
+    "arrow", _columnar(iter_ipc),
+    lambda metadata: ipc_columns(metadata["source"]["path"]),
+    lambda metadata: ipc_row_count(metadata["source"]["path"])
+)
+
+
+def iter_source_chunks(
+    metadata: Dict,
+    byte_range: Optional[Tuple[int, int]] = None,
+    stats: Optional[Dict] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the source dataset as DataFrames using the declared format
+    reader and engine.
+
+    Parameters:
+        metadata (dict): Dataset metadata
+        byte_range (tuple): Optional (start, end) slice of the source
+        stats (dict): Optional compression stats (compressed sources)
+
+    Returns:
+        iterator: One frame (pandas, arrow) or bounded-size chunks
+                  (streaming)
+    """
+
+    source = metadata["source"]
+    reader = SOURCE_FORMATS[resolve_format(source)]
+
+    if byte_range is not None and not reader["byte_ranges"]:
+        raise ValueError(
+            f"Byte ranges are not supported for {resolve_format(source)} "
+            f"source {source['path']}"
+        )
+
+    read = reader["iter_chunks"]
+    stream = open_source(metadata, byte_range, stats)
+
+    try:
+        for chunk in read(stream, metadata):
+            yield chunk
+    finally:
+        close_source(stream)
+
+
+def read_source_sample(metadata: Dict, rows: int) -> Optional[pd.DataFrame]:
+    """
+    Leading rows of the source, read as a single bounded chunk by the
+    declared format reader.
+    """
+
+    bounded = {
+        **metadata,
+        "source": {
+            **metadata["source"], "engine": "streaming", "chunk_size": int(rows)
+        }
+    }
+
+    chunks = iter_source_chunks(bounded)
+    try:
+        return next(chunks, None)
+    finally:
+        chunks.close()
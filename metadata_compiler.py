@@ -0,0 +1,254 @@
+"""
+METADATA COMPILER
+-----------------
+Purpose:
+    Parse, validate and normalize a dataset metadata YAML file once
+    into an immutable execution plan: the metadata document, resolved
+    columns, the compiled transformation and child table plans, the
+    stage configurations, the chosen reader (with the predicates pushed
+    into it) and the output format.
+
+Design Rules:
+    - The plan is keyed by the md5 of the raw file bytes; that hash is
+      computed once per load and is also the run's metadata hash
+    - Compiled plans are pickled under experiments/metadata_plans/ and
+      reused while the file content and the compiler's source (this
+      module and the packages its compile steps come from) are
+      unchanged; within a process they are also kept in memory
+    - YAML is parsed with the libyaml loader when PyYAML was built
+      with it
+    - yaml and the compile steps (pandas, numpy) are imported only
+      when a plan has to be compiled; a cached plan loads without them
+    - Plans are frozen: nested mappings and lists reject mutation,
+      pickle (parallel workers) and still behave as dict / list
+    - Checks that depend on the run, not the file (does the source
+      exist), are left to the pipeline
+"""
+
+from typing import Dict
+import hashlib
+import os
+import pickle
+
+from profiling.instrumentation import resolve_instrumentation_config
+
+
+PLAN_CACHE_DIR = "experiments/metadata_plans"
+
+# Packages the compile steps are imported from; a change to any of
+# their modules recompiles cached plans
+COMPILER_PACKAGES = ["transformations", "ingestion", "profiling", "storage"]
+
+REQUIRED_TOP_KEYS = ["dataset_id", "source", "target", "columns", "transformations"]
+
+_compiled_plans: Dict[str, Dict] = {}
+_compiler_fingerprints: Dict[str, str] = {}
+
+
+# =====================================================
+# IMMUTABLE CONTAINERS
+# =====================================================
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError("Compiled metadata plans are immutable")
+
+
+class FrozenDict(dict):
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+    __ior__ = _immutable
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = _immutable
+    sort = reverse = _immutable
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+# =====================================================
+# COMPILATION
+# =====================================================
+
+def metadata_content_hash(raw: bytes) -> str:
+    return hashlib.md5(raw).hexdigest()
+
+
+def compiler_fingerprint() -> str:
+    """
+    md5 of the compiler's source: this module and every module of
+    COMPILER_PACKAGES. Read once per process, without importing them.
+    """
+
+    root = os.path.dirname(os.path.abspath(__file__))
+
+    if root not in _compiler_fingerprints:
+        paths = [os.path.abspath(__file__)] + sorted(
+            os.path.join(root, package, name)
+            for package in COMPILER_PACKAGES
+            for name in os.listdir(os.path.join(root, package))
+            if name.endswith(".py")
+        )
+
+        digest = hashlib.md5()
+        for path in paths:
+            digest.update(os.path.relpath(path, root).encode())
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        _compiler_fingerprints[root] = digest.hexdigest()
+
+    return _compiler_fingerprints[root]
+
+
+def parse_metadata(raw: bytes) -> Dict:
+    import yaml  # type: ignore
+    return yaml.load(raw, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def compile_metadata(metadata: Dict, metadata_hash: str) -> Dict:
+    """
+    Validate a parsed metadata document and compile its plan.
+
+    Parameters:
+        metadata (dict): Parsed metadata YAML
+        metadata_hash (str): Hash of the raw file bytes
+
+    Returns:
+        dict: Frozen execution plan
+    """
+    from transformations.transform import compile_transformation_plan
+    from transformations.deduplication import resolve_dedup_config
+    from transformations.child_tables import compile_child_plan
+    from transformations.sampling import resolve_sampling_config
+    from ingestion.memory_optimizer import resolve_memory_config
+    from ingestion.pushdown import resolve_pushdown_config
+    from ingestion.source_reader import (
+        resolve_engine,
+        resolve_format,
+        validate_source_config
+    )
+    from profiling.column_profiler import resolve_profiling_config
+    from storage.output_writer import validate_target_config
+    from storage.checkpoints import resolve_checkpoint_config
+
+    for key in REQUIRED_TOP_KEYS:
+        if key not in metadata:
+            raise ValueError(f"Metadata validation failed: Missing {key}")
+
+    validate_source_config(metadata["source"])
+    validate_target_config(metadata["target"])
+
+    transformation_plan = compile_transformation_plan(metadata)
+
+    return freeze({
+        "compiler_fingerprint": compiler_fingerprint(),
+        "metadata_hash": metadata_hash,
+        "dataset_id": metadata["dataset_id"],
+        "metadata": metadata,
+        "columns": metadata["columns"],
+        "transformation_plan": transformation_plan,
+        "child_plan": compile_child_plan(metadata),
+        "profiling": resolve_profiling_config(metadata),
+        "memory": resolve_memory_config(metadata, transformation_plan),
+        "dedup": resolve_dedup_config(metadata),
+        "sampling": resolve_sampling_config(metadata),
+        "instrumentation": resolve_instrumentation_config(metadata),
+        "checkpoint": resolve_checkpoint_config(metadata),
+        "reader": {
+            "format": resolve_format(metadata["source"]),
+            "engine": resolve_engine(metadata["source"])
+        },
+        "pushdown": resolve_pushdown_config(metadata, transformation_plan),
+        "output_format": metadata["target"].get("format", "csv")
+    })
+
+
+# =====================================================
+# PLAN CACHE
+# =====================================================
+
+def _plan_cache_path(metadata_hash: str) -> str:
+    return os.path.join(
+        PLAN_CACHE_DIR, f"{metadata_hash}-{compiler_fingerprint()}.pkl"
+    )
+
+
+def _load_cached_plan(metadata_hash: str):
+    path = _plan_cache_path(metadata_hash)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            plan = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        return None
+
+    if plan.get("compiler_fingerprint") != compiler_fingerprint():
+        return None
+    return plan
+
+
+def _store_cached_plan(plan: Dict) -> None:
+    os.makedirs(PLAN_CACHE_DIR, exist_ok=True)
+    path = _plan_cache_path(plan["metadata_hash"])
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(tmp_path, "wb") as f:
+        pickle.dump(plan, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+    # Plans of the same file compiled by an earlier compiler are stale
+    for name in os.listdir(PLAN_CACHE_DIR):
+        stale = os.path.join(PLAN_CACHE_DIR, name)
+        if name.startswith(plan["metadata_hash"]) and name.endswith(".pkl") and stale != path:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+
+def load_metadata_plan(metadata_path: str) -> Dict:
+    """
+    Compiled plan of a metadata file, from memory, the disk cache, or
+    a fresh compile (which is then cached).
+
+    Parameters:
+        metadata_path (str): Metadata YAML file
+
+    Returns:
+        dict: Frozen execution plan, with metadata_file set
+    """
+
+    if not os.path.exists(metadata_path):
+        raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
+
+    with open(metadata_path, "rb") as f:
+        raw = f.read()
+
+    metadata_hash = metadata_content_hash(raw)
+
+    plan = _compiled_plans.get(metadata_hash)
+    if plan is None:
+        plan = _load_cached_plan(metadata_hash)
+        if plan is None:
+            plan = compile_metadata(parse_metadata(raw), metadata_hash)
+            _store_cached_plan(plan)
+        _compiled_plans[metadata_hash] = plan
+
+    return FrozenDict({**plan, "metadata_file": metadata_path})
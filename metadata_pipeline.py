@@ -1,42 +1,83 @@
-import pandas as pd # type: ignore
-import yaml # type: ignore
 import os
 import uuid
 import json
-import hashlib
 from datetime import datetime
 import time
 
+# Only light modules are imported here: the orchestrator, the
+# pipeline API and tooling import this module without paying for
+# pandas / numpy / pyarrow, which the run path imports on first use
+# (experiments/startup_benchmark.py tracks the budget)
+from metadata_compiler import load_metadata_plan
+from ingestion.byte_range import read_header_line, align_to_line_end
+from ingestion.compression import new_compression_stats
+from storage.watermarks import (
+    load_watermark,
+    save_watermark,
+    seen_keys_path,
+    merge_high_water,
+    high_water_value
+)
+from storage.artifact_commit import (
+    write_json,
+    write_text,
+    update_json,
+    staged_path,
+    fsync_files,
+    output_operation,
+    stage_output,
+    new_run_commit,
+    commit_run,
+    abort_run,
+    recover_pending_commits,
+    mark_resumable,
+    resume_run_commit
+)
+from storage.run_cache import (
+    source_fingerprint,
+    build_cache_key,
+    resolve_cache_policy,
+    lookup_cached_run,
+    store_cached_run
+)
+from profiling.instrumentation import (
+    start_instrumentation,
+    measure_stage,
+    instrumented,
+    add_to_stage,
+    merge_stage_metrics
+)
+
 # ===============================
 # METADATA LOADING (UPDATED)
 # ===============================
-def load_metadata():
+def load_plan(metadata_path=None):
     """
-    Load metadata dynamically.
-    Falls back to Amazon metadata for backward compatibility.
+    Load the compiled metadata plan (metadata_compiler.py).
+    Without an explicit path, METADATA_FILE is used, falling back to
+    Amazon metadata for backward compatibility.
     """
-    metadata_path = os.getenv(
-        "METADATA_FILE",
-        "metadata/amazon_sales.yaml"
-    )
+    if metadata_path is None:
+        metadata_path = os.getenv(
+            "METADATA_FILE",
+            "metadata/amazon_sales.yaml"
+        )
 
-    if not os.path.exists(metadata_path):
-        raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
+    return load_metadata_plan(metadata_path)
 
-    with open(metadata_path, "r") as f:
-        return yaml.safe_load(f)
+
+def load_metadata(metadata_path=None):
+    return load_plan(metadata_path)["metadata"]
 
 
 # ===============================
 # METADATA VALIDATION
 # ===============================
 def validate_metadata(metadata):
-    required_top_keys = ["dataset_id", "source", "target", "columns", "transformations"]
-
-    for key in required_top_keys:
-        if key not in metadata:
-            raise ValueError(f"Metadata validation failed: Missing {key}")
-
+    """
+    Run-time checks; the document itself is validated when its plan
+    is compiled.
+    """
     if not os.path.exists(metadata["source"]["path"]):
         raise FileNotFoundError(
             f"Source file not found at {metadata['source']['path']}"
@@ -46,69 +87,124 @@ def validate_metadata(metadata):
 # ===============================
 # SCHEMA VALIDATION
 # ===============================
-def validate_schema_against_dataset(df, metadata):
+def read_validation_sample(metadata):
+    """
+    Bounded sample of leading rows for type checks, or None when
+    schema_validation.sample_rows is not declared.
+    """
+    sample_rows = (metadata.get("schema_validation") or {}).get("sample_rows")
+    if not sample_rows:
+        return None
+
+    from ingestion.source_reader import read_source_sample
+    return read_source_sample(metadata, int(sample_rows))
+
+
+def validate_schema_against_dataset(dataset_columns, metadata, sample=None,
+                                    numeric_columns=None):
     missing_cols = []
     for logical_col, physical_col in metadata["columns"].items():
-        if physical_col not in df.columns:
+        if physical_col not in dataset_columns:
             missing_cols.append(physical_col)
 
-    return {
+    report = {
         "dataset_id": metadata["dataset_id"],
         "timestamp": datetime.now().isoformat(),
         "missing_columns": missing_cols,
         "overall_status": "PASS" if not missing_cols else "FAIL"
     }
 
+    if sample is not None:
+        from transformations.numeric_parsers import parse_numeric
+
+        type_checks = {}
+        # numeric_columns maps each cast column to its numeric format
+        for column, fmt in (numeric_columns or {}).items():
+            if column not in sample.columns:
+                continue
+            values = sample[column]
+            parsed = parse_numeric(values, fmt)
+            type_checks[column] = {
+                "sampled": int(values.notna().sum()),
+                "non_numeric": int((values.notna() & parsed.isna()).sum())
+            }
+
+        report["type_checks"] = type_checks
+        report["type_check_status"] = (
+            "WARN"
+            if any(check["non_numeric"] for check in type_checks.values())
+            else "PASS"
+        )
+
+    return report
+
 
 # ===============================
 # EXECUTION SUMMARY
 # ===============================
-def write_execution_summary(summary):
-    path = "experiments/execution_summary.json"
-    with open(path, "w") as f:
-        json.dump(summary, f, indent=2)
+def write_execution_summary(summary, commit=None):
+    write_json("experiments/execution_summary.json", summary, commit)
 
 
 # ===============================
-# METADATA VERSIONING
+# REJECTION SUMMARY
 # ===============================
-def track_metadata_version(metadata, run_id):
-    path = "experiments/metadata_versions.json"
-    os.makedirs("experiments", exist_ok=True)
+def write_rejection_summary(rows, commit=None):
+    import pandas as pd  # type: ignore
+    from transformations.rejection import REJECTION_SUMMARY_COLUMNS
 
-    meta_hash = hashlib.md5(
-        yaml.dump(metadata, sort_keys=True).encode()
-    ).hexdigest()
+    write_text(
+        "experiments/rejection_summary.csv",
+        pd.DataFrame(rows, columns=REJECTION_SUMMARY_COLUMNS).to_csv(index=False),
+        commit
+    )
 
-    versions = json.load(open(path)) if os.path.exists(path) else []
 
-    version = next(
-        (v for v in versions if v["metadata_hash"] == meta_hash),
-        None
-    )
+# ===============================
+# METADATA VERSIONING
+# ===============================
+@instrumented("metadata_versioning")
+def track_metadata_version(metadata, run_id, meta_hash):
+    """
+    meta_hash is the compiled plan's hash of the raw metadata file.
+    The registry is updated at once (not with the run's commit): the
+    version id it assigns is recorded in the run's artifacts.
+    """
+    path = "experiments/metadata_versions.json"
 
-    if not version:
-        version = {
-            "version_id": len(versions) + 1,
-            "metadata_hash": meta_hash,
-            "dataset_id": metadata["dataset_id"],
-            "created_at": datetime.now().isoformat(),
-            "run_ids": []
-        }
-        versions.append(version)
+    def register(versions):
+        version = next(
+            (v for v in versions if v["metadata_hash"] == meta_hash),
+            None
+        )
 
-    version["run_ids"].append(run_id)
+        if not version:
+            version = {
+                "version_id": len(versions) + 1,
+                "metadata_hash": meta_hash,
+                "dataset_id": metadata["dataset_id"],
+                "created_at": datetime.now().isoformat(),
+                "run_ids": []
+            }
+            versions.append(version)
 
-    with open(path, "w") as f:
-        json.dump(versions, f, indent=2)
+        # A resumed run is registered once
+        if run_id not in version["run_ids"]:
+            version["run_ids"].append(run_id)
+        return versions
 
-    return version["version_id"]
+    versions = update_json(path, register)
+
+    return next(
+        v["version_id"] for v in versions if v["metadata_hash"] == meta_hash
+    )
 
 
 # ===============================
 # CHANGE IMPACT ANALYSIS
 # ===============================
-def perform_change_impact_analysis(current_summary):
+@instrumented("impact_analysis")
+def perform_change_impact_analysis(current_summary, commit=None):
     path = "experiments/change_impact_analysis.json"
     prev_path = "experiments/previous_execution_summary.json"
 
@@ -133,128 +229,1005 @@ def perform_change_impact_analysis(current_summary):
             )
         }
 
-    with open(path, "w") as f:
-        json.dump(impact, f, indent=2)
-
-    with open(prev_path, "w") as f:
-        json.dump(current_summary, f, indent=2)
+    write_json(path, impact, commit)
+    write_json(prev_path, current_summary, commit)
 
 
 # ===============================
 # DATA LINEAGE
 # ===============================
-def record_data_lineage(run_id, metadata, metadata_version):
+@instrumented("lineage")
+def record_data_lineage(run_id, metadata, metadata_version, row_range=None,
+                        event=None, commit=None):
     path = "experiments/data_lineage.json"
-    lineage = json.load(open(path)) if os.path.exists(path) else []
 
-    lineage.append({
+    entry = {
         "run_id": run_id,
         "dataset_id": metadata["dataset_id"],
         "metadata_version": metadata_version,
         "source": metadata["source"]["path"],
         "target": metadata["target"]["path"],
         "timestamp": datetime.now().isoformat()
-    })
+    }
+
+    if row_range is not None:
+        entry["row_range"] = row_range
 
-    with open(path, "w") as f:
-        json.dump(lineage, f, indent=2)
+    if event is not None:
+        entry["event"] = event
+
+    update_json(path, lambda lineage: lineage + [entry], commit=commit)
 
 
 # ===============================
 # PERFORMANCE METRICS
 # ===============================
-def write_performance_metrics(run_id, metrics):
+def write_performance_metrics(run_id, stages, outputs=None, ingestion=None,
+                              memory=None, wall_seconds=None, commit=None):
+    """
+    Append the run's stage records (wall/CPU time, peak memory, rows
+    and bytes per stage) and its total wall time.
+    """
     path = "experiments/performance_metrics.json"
-    records = json.load(open(path)) if os.path.exists(path) else []
 
-    records.append({
+    record = {
         "run_id": run_id,
         "timestamp": datetime.now().isoformat(),
-        "stages": metrics
-    })
+        "wall_seconds": wall_seconds,
+        "stages": stages
+    }
 
-    with open(path, "w") as f:
-        json.dump(records, f, indent=2)
+    if ingestion:
+        record["ingestion"] = ingestion
+
+    if outputs:
+        record["outputs"] = outputs
+
+    if memory:
+        record["memory"] = memory
+
+    update_json(path, lambda records: records + [record], commit=commit)
 
 
 # ===============================
 # EXECUTION PROFILE REPORT
 # ===============================
-def write_execution_profile_report(run_id, profile, skipped):
-    path = "experiments/execution_profile_report.json"
-    reports = json.load(open(path)) if os.path.exists(path) else []
-
-    reports.append({
+def write_execution_profile_report(run_id, profile, skipped, commit=None):
+    report = {
         "run_id": run_id,
         "timestamp": datetime.now().isoformat(),
         "execution_profile": profile,
         "skipped_stages": skipped
-    })
+    }
 
-    with open(path, "w") as f:
-        json.dump(reports, f, indent=2)
+    update_json(
+        "experiments/execution_profile_report.json",
+        lambda reports: reports + [report], commit=commit
+    )
 
 
 # ===============================
 # PIPELINE SPECIATION
 # ===============================
-def record_pipeline_speciation(run_id, execution_profile):
-    path = "experiments/pipeline_speciation_log.json"
-    records = json.load(open(path)) if os.path.exists(path) else []
-
-    records.append({
+def record_pipeline_speciation(run_id, execution_profile, commit=None):
+    record = {
         "run_id": run_id,
         "timestamp": datetime.now().isoformat(),
         "execution_profile": execution_profile,
         "trigger": "AGENT_DECISION"
+    }
+
+    update_json(
+        "experiments/pipeline_speciation_log.json",
+        lambda records: records + [record], commit=commit
+    )
+
+
+# ===============================
+# INCREMENTAL INGESTION
+# ===============================
+def env_flag(name):
+    return os.getenv(name, "").lower() in {"1", "true", "yes"}
+
+
+def resolve_execution_profile(metadata, execution_profile=None, full_refresh=None):
+    """
+    Resolve the execution profile for this run. Arguments left as
+    None fall back to EXECUTION_PROFILE / FULL_REFRESH.
+
+    Datasets with incremental.enabled run full_run incrementally
+    unless a full refresh is requested.
+    """
+    if execution_profile is None:
+        execution_profile = os.getenv(
+            "EXECUTION_PROFILE",
+            metadata.get("execution_profile", "full_run")
+        )
+
+    incremental = metadata.get("incremental") or {}
+    if full_refresh is None:
+        full_refresh = env_flag("FULL_REFRESH")
+
+    if execution_profile == "full_run" and incremental.get("enabled"):
+        return "full_run" if full_refresh else "incremental"
+
+    if execution_profile == "incremental" and full_refresh:
+        return "full_run"
+
+    return execution_profile
+
+
+def plan_incremental_range(metadata, resume=True, seen_keys=False):
+    """
+    Work out which slice of an append-only source still has to be
+    processed. Returns (watermark or None, start byte, end byte).
+    The end is the end of the file, so a last row without a trailing
+    newline is processed and watermarked like any other; appends are
+    expected to write whole lines. resume=False plans a full refresh
+    that resets the watermark; seen_keys=True (deduplicated datasets)
+    only resumes a watermark saved with its seen keys.
+    """
+    path = metadata["source"]["path"]
+    watermark = (
+        load_watermark(metadata["dataset_id"], path, seen_keys)
+        if resume else None
+    )
+
+    _, data_start = read_header_line(path)
+    start = watermark["byte_offset"] if watermark else data_start
+    end = max(start, align_to_line_end(path, os.path.getsize(path)))
+
+    return watermark, start, end
+
+
+def stage_seen_keys(commit, dataset_id, dedup_state):
+    """
+    Stage every key fingerprint seen by this and earlier incremental
+    runs, to be committed with the watermark that refers to it.
+    Returns the committed path.
+    """
+    from transformations.deduplication import write_seen_keys
+
+    path = seen_keys_path(dataset_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    staged = staged_path(path, commit["tag"])
+
+    write_seen_keys(dedup_state, staged)
+    fsync_files([staged])
+    stage_output(commit, output_operation("replace", staged, path, commit["tag"]))
+
+    return path
+
+
+# ===============================
+# RUN RESULT CACHE
+# ===============================
+def cache_bypassed(bypass_cache=None, full_refresh=None):
+    if bypass_cache is None:
+        bypass_cache = env_flag("BYPASS_CACHE")
+    if full_refresh is None:
+        full_refresh = env_flag("FULL_REFRESH")
+    return bypass_cache or full_refresh
+
+
+def replay_cached_run(run_id, plan, execution_profile, cached, stages,
+                      run_started, commit=None):
+    """
+    Complete a run from a cache hit: reuse the stored summary,
+    rejection counts and outputs, and record the hit in lineage.
+    """
+    metadata = plan["metadata"]
+    metadata_version = track_metadata_version(
+        metadata, run_id, plan["metadata_hash"], stages=stages
+    )
+
+    execution_summary = dict(cached["summary"])
+    execution_summary.update({
+        "run_id": run_id,
+        "metadata_version": metadata_version,
+        "timestamp": datetime.now().isoformat(),
+        "cache": {
+            "hit": True,
+            "source_run_id": cached["run_id"],
+            "cached_at": cached["created_at"]
+        }
     })
 
-    with open(path, "w") as f:
-        json.dump(records, f, indent=2)
+    if execution_profile == "dry_run":
+        write_execution_profile_report(
+            run_id, execution_profile, ["output_write"], commit
+        )
+
+    write_execution_summary(execution_summary, commit)
+    write_rejection_summary(cached["rejection_summary"], commit)
+    perform_change_impact_analysis(execution_summary, commit, stages=stages)
+    record_data_lineage(
+        run_id, metadata, metadata_version,
+        cached["summary"].get("row_range"), event="CACHE_HIT", commit=commit,
+        stages=stages
+    )
+    write_performance_metrics(
+        run_id, stages, cached.get("outputs"),
+        wall_seconds=time.perf_counter() - run_started, commit=commit
+    )
+    record_pipeline_speciation(run_id, execution_profile, commit)
+
+    return execution_summary
+
+
+# ===============================
+# CURATED OUTPUT
+# ===============================
+def write_curated_chunk(writers, frame, stages, memory=None, child_plan=None,
+                        child_state=None):
+    """
+    Write accepted rows (source dtypes restored) to the curated target
+    and, when child tables are declared, the child rows extracted from
+    them. Columns read only for child tables are not kept in the
+    parent output.
+    """
+    from ingestion.memory_optimizer import restore_dtypes
+    from storage.output_writer import write_output_chunk
+    from transformations.child_tables import extract_child_tables
+
+    with measure_stage(stages, "output_write", rows_in=len(frame)):
+        frame = restore_dtypes(frame, memory)
+        write_output_chunk(
+            writers["curated"],
+            frame if child_plan is None
+            else frame.drop(columns=child_plan["drop_columns"], errors="ignore")
+        )
+
+    if child_plan is None:
+        return
+
+    with measure_stage(stages, "child_extraction", rows_in=len(frame)) as sample:
+        tables = extract_child_tables(frame, child_plan, child_state)
+        sample["rows_out"] = sum(len(table) for table in tables.values())
+
+    with measure_stage(stages, "output_write", rows_in=sample["rows_out"]):
+        for name, table in tables.items():
+            write_output_chunk(writers[name], table)
+
+
+def write_rejected_chunk(writers, frame, stages, memory=None):
+    from ingestion.memory_optimizer import restore_dtypes
+    from storage.output_writer import write_output_chunk
+
+    with measure_stage(stages, "output_write", rows_in=len(frame)):
+        write_output_chunk(writers["rejected"], restore_dtypes(frame, memory))
+
+
+def write_hierarchy_nodes(child_plan, child_state, target, run_tag, commit=None):
+    """
+    Rewrite the node table of every hierarchy child (the full
+    dictionary, including nodes carried over from earlier runs).
+    """
+    from storage.output_writer import (
+        open_output_writer,
+        write_output_chunk,
+        close_output_writer
+    )
+    from transformations.child_tables import hierarchy_node_tables
+
+    metrics = {}
+    for path, nodes in hierarchy_node_tables(child_plan, child_state).items():
+        writer = open_output_writer(path, target, run_tag=run_tag, commit=commit)
+        write_output_chunk(writer, nodes)
+        metrics[path] = close_output_writer(writer)
+    return metrics
+
+
+# ===============================
+# RUN CHECKPOINTS
+# ===============================
+def checkpoint_outputs(writers):
+    """
+    Make the staged outputs durable and return their positions.
+    """
+    from storage.output_writer import checkpoint_output_writer
+
+    return {
+        role: checkpoint_output_writer(writer)
+        for role, writer in writers.items()
+        if writer is not None
+    }
+
+
+def checkpoint_record(plan, execution_profile, source, offset, state, outputs):
+    """
+    Checkpoint record of a run: where it stands in the source, its
+    cumulative counts, partial rejection summary and profile sketches.
+    """
+    from transformations.rejection import build_rejection_summary
+    from profiling.column_profiler import profile_to_json
+
+    return {
+        "dataset_id": plan["dataset_id"],
+        "metadata_hash": plan["metadata_hash"],
+        "execution_profile": execution_profile,
+        "source": source,
+        "offset": offset,
+        "records": {
+            "input": state["input"],
+            "output": state["output"],
+            "rejected": state["rejected"]
+        },
+        "transformation_rules": state["rule_outcomes"],
+        "rejection_summary": build_rejection_summary(
+            state["rejection_counts"], plan["transformation_plan"]
+        ),
+        "high_water": high_water_value(state["high_water"]),
+        "column_profile": (
+            profile_to_json(state["profile"])
+            if state["profile"] is not None else None
+        ),
+        "deduplication": None,
+        "outputs": outputs
+    }
+
+
+def write_run_checkpoint(commit, plan, execution_profile, source, cursor,
+                         state, child_state, writers):
+    """
+    Checkpoint a serial run after a committed chunk: the staged
+    outputs are made durable, then the read position, cumulative
+    counts, partial rejection summary and profile sketches are saved
+    (storage/checkpoints.py). From the first checkpoint on, a failed
+    run is suspended rather than discarded.
+    """
+    from transformations.deduplication import drain_journal
+    from storage.checkpoints import save_checkpoint, summarize_checkpoint
+
+    record = checkpoint_record(
+        plan, execution_profile, source,
+        {"chunks": cursor["chunks"], "byte_offset": cursor["byte_offset"]},
+        state, checkpoint_outputs(writers)
+    )
+    if state["dedup"] is not None:
+        record["deduplication"] = {
+            "fingerprints": state["dedup"]["fingerprints"],
+            "duplicates": state["dedup"]["duplicates"]
+        }
+
+    chunk_state = {
+        key: value for key, value in state.items()
+        if key not in ("profile", "dedup")
+    }
+
+    record = save_checkpoint(
+        commit["run_id"],
+        record,
+        {"chunk_state": chunk_state, "child_state": child_state},
+        drain_journal(state["dedup"]) if state["dedup"] is not None else None
+    )
+    mark_resumable(commit)
+
+    return summarize_checkpoint(record)
+
+
+def restore_run_checkpoint(record, dedup_config, writers):
+    """
+    Chunk state and child state of a checkpoint, with the run's
+    writers moved back to the checkpointed positions.
+
+    Returns:
+        tuple: (chunk state, child state)
+    """
+    from transformations.deduplication import restore_dedup_state
+    from profiling.column_profiler import profile_from_json
+    from storage.output_writer import resume_output_writer
+    from storage.checkpoints import load_checkpoint_state
+
+    saved, fingerprints = load_checkpoint_state(record)
+
+    state = saved["chunk_state"]
+    state["profile"] = (
+        profile_from_json(record["column_profile"])
+        if record["column_profile"] is not None else None
+    )
+    state["dedup"] = (
+        restore_dedup_state(
+            dedup_config, fingerprints, record["deduplication"]["duplicates"]
+        )
+        if dedup_config else None
+    )
+
+    for role, position in record["outputs"].items():
+        resume_output_writer(writers.get(role), position)
+
+    return state, saved["child_state"]
+
+
+def write_partition_checkpoint(commit, plan, execution_profile, source,
+                               ranges, completed, outputs):
+    """
+    Checkpoint a parallel run after a partition completed: the chunk
+    states and spilled chunks of the completed partitions are saved
+    with the counts, rejection summary and profile sketches merged
+    from them (before duplicate keys across partitions are resolved).
+    Outputs are only written once every partition has completed, so
+    they stay at their initial positions.
+    """
+    from transformations.chunk_processor import merge_chunk_states
+    from storage.checkpoints import save_checkpoint, summarize_checkpoint
+
+    order = sorted(completed)
+    state = merge_chunk_states([completed[index][0] for index in order])
+
+    record = checkpoint_record(
+        plan, execution_profile, source,
+        {
+            "chunks": state["chunks"],
+            "byte_offset": None,
+            "partitions": {
+                "ranges": [list(r) for r in ranges],
+                "completed": order
+            }
+        },
+        state, outputs
+    )
+
+    record = save_checkpoint(
+        commit["run_id"], record, {"partitions": dict(completed)}, None
+    )
+    mark_resumable(commit)
+
+    return summarize_checkpoint(record)
+
+
+def restore_partition_checkpoint(record, writers):
+    """
+    Partitions a parallel run already completed, with the run's
+    writers moved back to their initial positions.
+
+    Returns:
+        tuple: (partition byte ranges, index -> (chunk state, spilled))
+    """
+    from storage.output_writer import resume_output_writer
+    from storage.checkpoints import load_checkpoint_state
+
+    saved, _ = load_checkpoint_state(record)
+
+    for role, position in record["outputs"].items():
+        resume_output_writer(writers.get(role), position)
+
+    ranges = [tuple(r) for r in record["offset"]["partitions"]["ranges"]]
+    return ranges, saved["partitions"]
 
 
 # ===============================
 # MAIN PIPELINE
 # ===============================
-def run_metadata_pipeline():
-    run_id = str(uuid.uuid4())
-    timings = {}
+def manifest_details(plan, execution_profile):
+    return {
+        "dataset_id": plan["dataset_id"],
+        "metadata_file": plan["metadata_file"],
+        "metadata_hash": plan["metadata_hash"],
+        "execution_profile": execution_profile
+    }
+
+
+def run_metadata_pipeline(metadata_path=None, execution_profile=None,
+                          full_refresh=None, bypass_cache=None, run=None,
+                          resume=None):
+    """
+    Run one dataset end to end. Arguments left as None fall back to
+    the METADATA_FILE / EXECUTION_PROFILE / FULL_REFRESH /
+    BYPASS_CACHE / NO_RESUME environment variables. A `run` dict
+    (run_pipeline) is filled in as the run progresses, so a failing
+    run still reports its id, dataset, profile and the stages it
+    completed.
+
+    Outputs and artifacts of the run are committed together with its
+    manifest (storage/artifact_commit.py); a failing run leaves the
+    previous ones untouched. A checkpointed run that fails is
+    suspended, and the next run of the same dataset, profile,
+    metadata and source resumes it (resume=False starts over).
+    """
+    run = run if run is not None else {}
+    run_id = run.setdefault("run_id", str(uuid.uuid4()))
 
-    metadata = load_metadata()
+    # Roll forward (or discard) the commits of runs that crashed
+    recover_pending_commits()
 
-    execution_profile = os.getenv(
-        "EXECUTION_PROFILE",
-        metadata.get("execution_profile", "full_run")
+    if resume is None:
+        resume = not env_flag("NO_RESUME")
+
+    commit = new_run_commit(run_id)
+    try:
+        return execute_pipeline_run(
+            metadata_path, execution_profile, full_refresh, bypass_cache,
+            run, commit, resume
+        )
+    except BaseException:
+        abort_run(commit)
+        raise
+
+
+def execute_pipeline_run(metadata_path, execution_profile, full_refresh,
+                         bypass_cache, run, commit, resume=True):
+    from transformations.deduplication import (
+        new_dedup_state,
+        dedup_rule,
+        load_seen_keys,
+        release_dedup_state
+    )
+    from transformations.child_tables import (
+        new_child_state,
+        summarize_child_tables
+    )
+    from transformations.rejection import build_rejection_summary
+    from transformations.sampling import (
+        sampling_rate,
+        new_sampling_state,
+        estimate_counts,
+        extrapolate_rejection_counts,
+        summarize_sampling
+    )
+    from transformations.chunk_processor import (
+        new_chunk_state,
+        timed_chunks,
+        process_chunk,
+        process_pruned
+    )
+    from parallel_execution import (
+        resolve_parallel_config,
+        run_partitions,
+        iter_spilled_chunks,
+        cleanup_partitions
+    )
+    from ingestion.memory_optimizer import summarize_memory_savings
+    from ingestion.source_reader import (
+        source_codec,
+        source_supports_byte_ranges,
+        estimate_source_rows,
+        read_source_header,
+        source_bytes
+    )
+    from ingestion.pushdown import resolve_run_pushdown, iter_pushdown_chunks
+    from ingestion.resumable_reader import new_read_cursor, iter_resumable_chunks
+    from profiling.column_profiler import write_column_profile
+    from storage.output_writer import open_output_writer, close_output_writer
+    from storage.checkpoints import (
+        checkpoint_source,
+        checkpoint_scratch_dir,
+        find_resumable_checkpoint,
+        summarize_checkpoint,
+        discard_checkpoint
     )
 
-    validate_metadata(metadata)
+    run_id = run["run_id"]
+    run_started = time.perf_counter()
+    stages = run.setdefault("stages", {})
 
-    t0 = time.perf_counter()
-    df = pd.read_csv(metadata["source"]["path"])
-    timings["data_ingestion"] = time.perf_counter() - t0
+    # Parsing and compiling are skipped when the metadata file's
+    # compiled plan is cached
+    with measure_stage(stages, "metadata_validation"):
+        plan = load_plan(metadata_path)
+        metadata = plan["metadata"]
+        run["dataset_id"] = plan["dataset_id"]
+        validate_metadata(metadata)
 
-    t0 = time.perf_counter()
-    schema_report = validate_schema_against_dataset(df, metadata)
-   # df["_force_error_"] = df["CustomerIDX"] - Intentional for testing
-    timings["schema_validation"] = time.perf_counter() - t0
+    transformation_plan = plan["transformation_plan"]
+    profiling_config = plan["profiling"]
+    memory_config = plan["memory"]
+    dedup_config = plan["dedup"]
+    child_plan = plan["child_plan"]
+    instrumentation_config = plan["instrumentation"]
 
-    metadata_version = track_metadata_version(metadata, run_id)
+    execution_profile = resolve_execution_profile(
+        metadata, execution_profile, full_refresh
+    )
+    run["execution_profile"] = execution_profile
+    start_instrumentation(instrumentation_config)
 
-    input_count = len(df)
-    output_count = input_count
-    rejected_count = 0
+    watermark = None
+    byte_range = None
+    watermark_column = None
+    seen_keys = None
 
-    skipped = []
+    # Compressed drops and non-csv formats are not byte-addressable:
+    # they are read whole, serially (zstd frames may still be
+    # decompressed in parallel)
+    codec = source_codec(metadata)
+    compression_stats = new_compression_stats(codec) if codec else None
+    byte_addressable = source_supports_byte_ranges(metadata)
+
+    tracks_watermark = byte_addressable and (
+        (
+            (metadata.get("incremental") or {}).get("enabled")
+            and execution_profile == "full_run"
+        ) or execution_profile == "incremental"
+    )
+
+    if tracks_watermark:
+        with measure_stage(stages, "watermark_planning"):
+            watermark, start, end = plan_incremental_range(
+                metadata, resume=execution_profile == "incremental",
+                seen_keys=dedup_config is not None
+            )
+        byte_range = (start, end)
+
+        # Keys claimed by earlier incremental runs stay claimed
+        if watermark is not None and dedup_config is not None:
+            seen_keys = watermark["seen_keys"]
+
+        logical = (metadata.get("incremental") or {}).get("watermark_column")
+        if logical:
+            watermark_column = metadata["columns"][logical]
+
+    cache_policy = resolve_cache_policy(metadata)
+    cache_key = None
+
+    if cache_policy["enabled"] and execution_profile != "validate_only":
+        with measure_stage(stages, "cache_lookup"):
+            # Incremental runs also depend on where the watermark starts
+            cache_key = build_cache_key(
+                plan["metadata_hash"],
+                source_fingerprint(metadata["source"]["path"]),
+                execution_profile
+                if byte_range is None
+                else f"{execution_profile}@{byte_range[0]}"
+            )
+            cached = (
+                None if cache_bypassed(bypass_cache, full_refresh)
+                else lookup_cached_run(cache_key, cache_policy)
+            )
+
+        if cached is not None:
+            summary = replay_cached_run(
+                run_id, plan, execution_profile, cached, stages, run_started,
+                commit
+            )
+            run["manifest"] = commit_run(
+                commit, manifest_details(plan, execution_profile)
+            )
+            run["records"] = summary["records"]
+            run["cache_hit"] = True
+            return run
+
+    # Sampled dry runs are serial; so are sources that cannot be read
+    # by byte range
+    sampled = execution_profile == "dry_run" and plan["sampling"] is not None
+    parallel_config = (
+        resolve_parallel_config(metadata)
+        if byte_addressable and not sampled else None
+    )
+
+    # Runs of a checkpointed dataset record their progress after
+    # committed chunks (serial) or completed partitions (parallel); a
+    # suspended run of the same dataset, profile, metadata and source
+    # is resumed under its own run id
+    checkpoint_config = (
+        plan["checkpoint"] if execution_profile != "validate_only" else None
+    )
+    resumed = None
+
+    if checkpoint_config is not None:
+        with measure_stage(stages, "checkpoint_resume"):
+            resumed = find_resumable_checkpoint(
+                metadata["dataset_id"], execution_profile,
+                plan["metadata_hash"], metadata["source"]["path"],
+                byte_range, resume
+            )
+
+        if resumed is not None:
+            resume_run_commit(commit, resumed["run_id"])
+            run_id = run["run_id"] = resumed["run_id"]
+            run["resumed_from"] = summarize_checkpoint(resumed)
+            # The resumed run covers the byte range it started with
+            if resumed["source"]["byte_range"] is not None:
+                byte_range = tuple(resumed["source"]["byte_range"])
+
+    # Header-only schema validation (plus an optional bounded sample):
+    # validate_only never materializes the dataset
+    with measure_stage(stages, "schema_validation") as sample:
+        validation_sample = read_validation_sample(metadata)
+        schema_report = validate_schema_against_dataset(
+            read_source_header(metadata),
+            metadata,
+            sample=validation_sample,
+            numeric_columns={
+                cast["column"]: cast["format"]
+                for cast in transformation_plan["casts"]
+            }
+        )
+        sample["rows_in"] = (
+            len(validation_sample) if validation_sample is not None else 0
+        )
+
+    metadata_version = track_metadata_version(
+        metadata, run_id, plan["metadata_hash"], stages=stages
+    )
 
     if execution_profile == "validate_only":
         skipped = ["transformation", "output_write", "impact_analysis"]
-        write_execution_profile_report(run_id, execution_profile, skipped)
-        record_pipeline_speciation(run_id, execution_profile)
-        return
+        write_execution_profile_report(run_id, execution_profile, skipped, commit)
+        record_pipeline_speciation(run_id, execution_profile, commit)
+        run["manifest"] = commit_run(
+            commit, manifest_details(plan, execution_profile)
+        )
+        run["schema_validation"] = schema_report
+        return run
+
+    write_outputs = execution_profile in {"full_run", "incremental"}
+    target = metadata["target"]
+    engine = plan["reader"]["engine"]
+    estimated_rows = estimate_source_rows(metadata)
+
+    resumable = checkpoint_config is not None
+
+    writers = {}
+    if write_outputs:
+        writers = {
+            "curated": open_output_writer(
+                target.get("path"), target, partitioned=True,
+                append=watermark is not None, run_tag=run_id[:8],
+                commit=commit, resumable=resumable
+            ),
+            "rejected": open_output_writer(
+                target.get("rejected_path"), target,
+                append=watermark is not None, run_tag=run_id[:8],
+                commit=commit, resumable=resumable
+            )
+        }
+
+    # Child outputs are only written, so dry runs skip the extraction
+    child_state = None
+    if write_outputs and child_plan is not None:
+        child_state = new_child_state(child_plan, append=watermark is not None)
+        for child in child_plan["tables"]:
+            writers[child["name"]] = open_output_writer(
+                child["path"], target,
+                append=watermark is not None, run_tag=run_id[:8],
+                commit=commit, resumable=resumable
+            )
+
+    # Sampled dry runs validate a stratified sample serially and skip
+    # the column profile, which would not describe the whole source
+    sampling_state = None
+    if sampled:
+        sampling_state = new_sampling_state(
+            plan["sampling"], sampling_rate(plan["sampling"], estimated_rows)
+        )
+        profiling_config = None
+
+    # Rules are evaluated in the reader when no pruned row is needed
+    # in full (rejected target, column profile)
+    key_rule = dedup_rule(transformation_plan) if dedup_config else None
+    pushdown = resolve_run_pushdown(
+        plan["pushdown"],
+        writes_rejected=write_outputs and bool(target.get("rejected_path")),
+        profiled=profiling_config is not None,
+        sampling=sampling_state,
+        key_columns=key_rule["columns"] if key_rule is not None else None,
+        watermark_column=watermark_column
+    )
+
+    parallel_report = None
+
+    if parallel_config is not None:
+        if byte_range is None:
+            # The whole file: its end also ends a last row that has no
+            # trailing newline
+            _, data_start = read_header_line(metadata["source"]["path"])
+            byte_range = (
+                data_start, os.path.getsize(metadata["source"]["path"])
+            )
+
+        # A checkpointed run keeps its completed partitions; a resumed
+        # one only runs the others, then replays every partition
+        # through writers moved back to their initial positions
+        checkpointing = {}
+        if resumable:
+            source = checkpoint_source(
+                metadata["source"]["path"],
+                byte_range if tracks_watermark else None
+            )
+            outputs = checkpoint_outputs(writers)
+
+            if resumed is not None:
+                with measure_stage(stages, "checkpoint_resume"):
+                    ranges, completed = restore_partition_checkpoint(
+                        resumed, writers
+                    )
+                checkpointing.update(ranges=ranges, completed=completed)
+
+            def on_partition(ranges, completed):
+                with measure_stage(stages, "checkpoint"):
+                    run["checkpoint"] = write_partition_checkpoint(
+                        commit, plan, execution_profile, source,
+                        ranges, completed, outputs
+                    )
+
+            checkpointing.update(
+                scratch_dir=checkpoint_scratch_dir(run_id),
+                on_partition=on_partition
+            )
+
+        # Worker stage records are summed across processes; the real
+        # elapsed time of the pool is reported as partition_wall_seconds
+        t0 = time.perf_counter()
+        result = run_partitions(
+            metadata, transformation_plan, byte_range, parallel_config,
+            watermark_column=watermark_column, keep_outputs=write_outputs,
+            profiling=profiling_config, memory=memory_config,
+            instrumentation=instrumentation_config, pushdown=pushdown,
+            **checkpointing
+        )
+        partition_seconds = time.perf_counter() - t0
+        state = result["state"]
+
+        # Keys repeated across partitions are resolved here, in
+        # partition (source) order
+        dedup_state = new_dedup_state(dedup_config) if dedup_config else None
+        if dedup_state is not None:
+            load_seen_keys(dedup_state, seen_keys)
+
+        try:
+            for role, frame in iter_spilled_chunks(
+                result, transformation_plan, dedup_state, stages
+            ):
+                if role == "curated":
+                    write_curated_chunk(
+                        writers, frame, stages, state["memory"],
+                        child_plan, child_state
+                    )
+                else:
+                    write_rejected_chunk(writers, frame, stages, state["memory"])
+
+            if tracks_watermark and dedup_state is not None:
+                with measure_stage(stages, "seen_keys"):
+                    seen_keys = stage_seen_keys(
+                        commit, metadata["dataset_id"], dedup_state
+                    )
+        finally:
+            cleanup_partitions(result)
+            dedup_report = release_dedup_state(dedup_state)
+
+        parallel_report = {
+            "workers": parallel_config["workers"],
+            "partitions": len(result["partitions"]),
+            "partition_wall_seconds": partition_seconds
+        }
+    else:
+        state = new_chunk_state(
+            profiling_config, memory_config, dedup_config, sampling_state,
+            journal=resumable
+        )
+
+        if resumable:
+            source = checkpoint_source(
+                metadata["source"]["path"],
+                byte_range if tracks_watermark else None
+            )
+            cursor = new_read_cursor()
+
+            if resumed is not None:
+                with measure_stage(stages, "checkpoint_resume"):
+                    state, child_state = restore_run_checkpoint(
+                        resumed, dedup_config, writers
+                    )
+                sampling_state = state["sampling"]
+                cursor = new_read_cursor(
+                    resumed["offset"]["byte_offset"], resumed["offset"]["chunks"]
+                )
+
+            chunks = iter_resumable_chunks(
+                metadata, pushdown, cursor, byte_range, compression_stats
+            )
+        else:
+            chunks = iter_pushdown_chunks(
+                metadata, pushdown, byte_range, compression_stats
+            )
+
+        if state["dedup"] is not None:
+            load_seen_keys(state["dedup"], seen_keys)
+
+        since_checkpoint = 0
+
+        try:
+            for df, pruned in timed_chunks(chunks, state):
+               # df["_force_error_"] = df["CustomerIDX"] - Intentional for testing
+                if pruned is not None:
+                    process_pruned(
+                        pruned, transformation_plan, state, watermark_column
+                    )
+
+                accepted, rejected = process_chunk(
+                    df, transformation_plan, state, watermark_column
+                )
+
+                if write_outputs:
+                    write_curated_chunk(
+                        writers, accepted, stages, state["memory"],
+                        child_plan, child_state
+                    )
+                    write_rejected_chunk(writers, rejected, stages, state["memory"])
+
+                if resumable and cursor["boundary"]:
+                    since_checkpoint += 1
+                    if since_checkpoint >= checkpoint_config["interval_chunks"]:
+                        with measure_stage(stages, "checkpoint"):
+                            run["checkpoint"] = write_run_checkpoint(
+                                commit, plan, execution_profile, source,
+                                cursor, state, child_state, writers
+                            )
+                        since_checkpoint = 0
+
+            if tracks_watermark and state["dedup"] is not None:
+                with measure_stage(stages, "seen_keys"):
+                    seen_keys = stage_seen_keys(
+                        commit, metadata["dataset_id"], state["dedup"]
+                    )
+        finally:
+            dedup_report = release_dedup_state(state["dedup"])
+
+        add_to_stage(
+            state["stages"], "data_ingestion",
+            bytes_read=(
+                compression_stats["uncompressed_bytes"]
+                if compression_stats is not None
+                else source_bytes(metadata, byte_range)
+            )
+        )
+
+    output_metrics = {}
+    if write_outputs:
+        with measure_stage(stages, "output_write") as sample:
+            output_metrics = {
+                role: close_output_writer(writer)
+                for role, writer in writers.items()
+                if writer is not None
+            }
+            if child_state is not None:
+                output_metrics.update(
+                    write_hierarchy_nodes(
+                        child_plan, child_state, target, run_id[:8], commit
+                    )
+                )
+
+    # Bytes are only known once the writers are closed
+    if output_metrics:
+        add_to_stage(
+            stages, "output_write",
+            bytes_written=sum(
+                metrics["bytes_written"] for metrics in output_metrics.values()
+            )
+        )
+
+    stages = merge_stage_metrics(stages, state["stages"])
+    run["stages"] = stages
+    input_count = state["input"]
+    output_count = state["output"]
+    rejected_count = state["rejected"]
+    rule_outcomes = state["rule_outcomes"]
+    rejection_counts = state["rejection_counts"]
+    high_water = state["high_water"]
+
+    sampling_report = None
+    if sampling_state is not None:
+        estimates = estimate_counts(sampling_state)
+        sampling_report = {
+            **summarize_sampling(sampling_state),
+            "sampled_records": {"output": output_count, "rejected": rejected_count},
+            "estimates": estimates
+        }
+        output_count = estimates["output"]["estimate"]
+        rejected_count = estimates["rejected"]["estimate"]
+        rejection_counts = extrapolate_rejection_counts(
+            rejection_counts, sampling_state
+        )
+
+    skipped = []
 
     if execution_profile == "dry_run":
         skipped = ["output_write"]
-        write_execution_profile_report(run_id, execution_profile, skipped)
+        if sampling_state is not None:
+            skipped.append("profiling")
+        stages.pop("output_write", None)
+        write_execution_profile_report(run_id, execution_profile, skipped, commit)
 
     execution_summary = {
         "run_id": run_id,
@@ -267,14 +1240,267 @@ def run_metadata_pipeline():
             "output": output_count,
             "rejected": rejected_count
         },
+        "transformation_rules": rule_outcomes,
+        "ingestion": {
+            "format": plan["reader"]["format"],
+            "engine": engine,
+            "estimated_rows": estimated_rows,
+            "mode": "streaming" if engine == "streaming" else "batch",
+            "chunk_size": metadata["source"].get("chunk_size"),
+            "chunks_processed": state["chunks"],
+            "compression": codec
+        },
         "schema_validation": schema_report
     }
 
-    write_execution_summary(execution_summary)
-    perform_change_impact_analysis(execution_summary)
-    record_data_lineage(run_id, metadata, metadata_version)
-    write_performance_metrics(run_id, timings)
-    record_pipeline_speciation(run_id, execution_profile)
+    if sampling_report is not None:
+        # Output and rejected counts (and the rejection summary) are
+        # extrapolated; transformation_rules cover the sampled rows
+        execution_summary["estimate"] = True
+        execution_summary["sampling"] = sampling_report
+
+    if parallel_report is not None:
+        execution_summary["parallel"] = parallel_report
+
+    if checkpoint_config is not None:
+        execution_summary["checkpoint"] = {
+            "interval_chunks": checkpoint_config["interval_chunks"],
+            "last": run.get("checkpoint"),
+            "resumed_from": run.get("resumed_from")
+        }
+
+    if pushdown is not None:
+        execution_summary["ingestion"]["pushdown"] = {
+            "columns": pushdown["columns"],
+            "rules": [rule["rule_id"] for rule in pushdown["plan"]["rules"]],
+            "rows_pruned": stages["predicate_pushdown"]["rows_in"]
+        }
+
+    if dedup_report is not None:
+        execution_summary["deduplication"] = {
+            "key": dedup_rule(transformation_plan)["columns"],
+            **dedup_report
+        }
+
+    if child_state is not None:
+        execution_summary["child_tables"] = summarize_child_tables(
+            child_plan, child_state
+        )
+
+    row_range = None
+    if tracks_watermark:
+        start_row = watermark["rows_processed"] if watermark else 0
+        row_range = {
+            "start_row": start_row,
+            "end_row": start_row + input_count,
+            "start_byte": byte_range[0],
+            "end_byte": byte_range[1],
+            "resumed_from_watermark": watermark is not None
+        }
+        if watermark_column:
+            previous = (watermark or {}).get("high_water") or {}
+            row_range["high_water"] = {
+                "column": watermark_column,
+                "value": merge_high_water(
+                    previous.get("value"), high_water_value(high_water)
+                )
+            }
+        execution_summary["row_range"] = row_range
+
+    if state["profile"] is not None:
+        # Incremental runs extend the cumulative profile of the run
+        # whose watermark they resumed from
+        with measure_stage(stages, "profiling"):
+            execution_summary["column_profile"] = write_column_profile(
+                run_id,
+                metadata["dataset_id"],
+                execution_profile,
+                state["profile"],
+                carried_from_run=watermark["run_id"] if watermark else None,
+                commit=commit
+            )
+
+    with measure_stage(stages, "summary_write"):
+        write_execution_summary(execution_summary, commit)
+        write_rejection_summary(
+            build_rejection_summary(rejection_counts, transformation_plan),
+            commit
+        )
+    perform_change_impact_analysis(execution_summary, commit, stages=stages)
+    record_data_lineage(
+        run_id, metadata, metadata_version, row_range, commit=commit,
+        stages=stages
+    )
+    ingested_bytes = stages["data_ingestion"]["bytes_read"]
+    ingestion_seconds = stages["data_ingestion"]["wall_seconds"]
+    ingestion_metrics = {
+        "engine": engine,
+        "rows": input_count,
+        "bytes": ingested_bytes,
+        "seconds": ingestion_seconds,
+        "rows_per_second": (
+            round(input_count / ingestion_seconds, 2)
+            if ingestion_seconds > 0 else None
+        ),
+        "mb_per_second": (
+            round(ingested_bytes / 1e6 / ingestion_seconds, 3)
+            if ingestion_seconds > 0 else None
+        )
+    }
+
+    if compression_stats is not None:
+        ingestion_metrics["compression"] = {
+            **compression_stats,
+            "ratio": (
+                round(
+                    compression_stats["uncompressed_bytes"]
+                    / compression_stats["compressed_bytes"], 3
+                )
+                if compression_stats["compressed_bytes"] else None
+            )
+        }
+
+    write_performance_metrics(
+        run_id, stages, output_metrics, ingestion_metrics,
+        memory=(
+            summarize_memory_savings(state["memory"])
+            if state["memory"] is not None else None
+        ),
+        wall_seconds=time.perf_counter() - run_started,
+        commit=commit
+    )
+    record_pipeline_speciation(run_id, execution_profile, commit)
+
+    # The watermark only moves with the outputs it describes
+    if row_range is not None:
+        save_watermark(
+            metadata["dataset_id"],
+            metadata["source"]["path"],
+            run_id,
+            byte_offset=row_range["end_byte"],
+            rows_processed=row_range["end_row"],
+            high_water=row_range.get("high_water"),
+            seen_keys=seen_keys,
+            commit=commit
+        )
+
+    run["manifest"] = commit_run(
+        commit, manifest_details(plan, execution_profile)
+    )
+
+    # Committed outputs supersede the run's checkpoints
+    if checkpoint_config is not None:
+        discard_checkpoint(run_id)
+
+    # Cache entries sign the committed outputs
+    if cache_key is not None:
+        store_cached_run(cache_key, {
+            "dataset_id": metadata["dataset_id"],
+            "run_id": run_id,
+            "execution_profile": execution_profile,
+            "summary": execution_summary,
+            "rejection_summary": build_rejection_summary(
+                rejection_counts, transformation_plan
+            ),
+            "outputs": output_metrics
+        }, cache_policy)
+
+    run["records"] = execution_summary["records"]
+    run["schema_validation"] = schema_report
+    return run
+
+
+# ===============================
+# PIPELINE API
+# ===============================
+class PipelineRunError(Exception):
+    """
+    Failure of an in-process pipeline run. The original exception is
+    kept as `cause` (and __cause__) so failure classification sees
+    its real type.
+    """
+
+    def __init__(self, cause, run_id=None, dataset_id=None,
+                 execution_profile=None):
+        super().__init__(f"{type(cause).__name__}: {cause}")
+        self.cause = cause
+        self.run_id = run_id
+        self.dataset_id = dataset_id
+        self.execution_profile = execution_profile
+
+
+def run_pipeline(metadata_path, execution_profile=None, full_refresh=False,
+                 bypass_cache=False, raise_on_error=False, resume=True):
+    """
+    Run the pipeline in the calling process, without reading any
+    environment variables.
+
+    Parameters:
+        metadata_path (str): Dataset metadata YAML
+        execution_profile (str): Profile to run; None uses the
+                                 metadata default
+        full_refresh (bool): Reprocess the whole source, ignoring the
+                             watermark and the run cache
+        bypass_cache (bool): Ignore the run cache
+        raise_on_error (bool): Raise PipelineRunError instead of
+                               returning a FAILED result
+        resume (bool): Continue a suspended run of the same dataset,
+                       profile, metadata and source from its last
+                       checkpoint; False discards it and starts over
+
+    Returns:
+        dict: Run result with status (SUCCESS | FAILED), run_id,
+              dataset_id, metadata_file, execution_profile, records
+              (input / output / rejected, None for validate_only),
+              cache_hit, stages, wall_seconds, manifest (the run's
+              commit manifest, None when it failed), checkpoint (the
+              last checkpoint written, which a failed run can be
+              resumed from), resumed_from (the checkpoint this run
+              resumed, under the same run_id) and error
+              (PipelineRunError or None)
+    """
+    run = {
+        "status": None,
+        "run_id": str(uuid.uuid4()),
+        "dataset_id": None,
+        "metadata_file": metadata_path,
+        "execution_profile": execution_profile,
+        "records": None,
+        "cache_hit": False,
+        "stages": {},
+        "wall_seconds": None,
+        "manifest": None,
+        "checkpoint": None,
+        "resumed_from": None,
+        "error": None
+    }
+    started = time.perf_counter()
+
+    try:
+        if execution_profile is None:
+            # Metadata default, still ignoring EXECUTION_PROFILE
+            execution_profile = load_metadata(metadata_path).get(
+                "execution_profile", "full_run"
+            )
+        run_metadata_pipeline(
+            metadata_path, execution_profile,
+            full_refresh=full_refresh, bypass_cache=bypass_cache, run=run,
+            resume=resume
+        )
+        run["status"] = "SUCCESS"
+    except Exception as e:
+        run["status"] = "FAILED"
+        run["error"] = PipelineRunError(
+            e, run["run_id"], run["dataset_id"], run["execution_profile"]
+        )
+        run["error"].__cause__ = e
+    finally:
+        run["wall_seconds"] = time.perf_counter() - started
+
+    if run["error"] is not None and raise_on_error:
+        raise run["error"]
+
+    return run
 
 
 # ===============================
@@ -1,10 +1,19 @@
 from agent.failure_classifier import classify_failure
 from agent.healing_policy import resolve_healing_action
+from metadata_pipeline import (
+    PipelineRunError,
+    env_flag,
+    load_plan,
+    resolve_execution_profile,
+    run_pipeline
+)
+from storage.artifact_commit import update_json
 
 import subprocess
 import json
 import os
 from datetime import datetime
+import time
 import uuid
 
 # =====================================================
@@ -24,6 +33,11 @@ PIPELINES = [
     }
 ]
 
+# Datasets run in this process through the pipeline API; set
+# PIPELINE_ISOLATION=subprocess (or "isolation" on a pipeline) to
+# run each attempt in its own interpreter instead
+PIPELINE_ISOLATION = os.getenv("PIPELINE_ISOLATION", "in_process")
+
 ORCHESTRATION_LOG_PATH = "experiments/orchestration_log.json"
 QUANTUM_AGENT_SCRIPT = "agent/quantum_agent.py"
 QUANTUM_AGENT_DECISION_PATH = "agent/quantum_agent_decision.json"
@@ -61,17 +75,116 @@ def run_quantum_agent():
 # ORCHESTRATION LOGGER
 # =====================================================
 def log_orchestration(entry):
-    os.makedirs("experiments", exist_ok=True)
+    # Appended under the commit lock and replaced atomically, so
+    # concurrent orchestrators neither truncate nor drop entries
+    update_json(ORCHESTRATION_LOG_PATH, lambda logs: logs + [entry])
 
-    logs = []
-    if os.path.exists(ORCHESTRATION_LOG_PATH):
-        with open(ORCHESTRATION_LOG_PATH, "r") as f:
-            logs = json.load(f)
 
-    logs.append(entry)
+# =====================================================
+# PIPELINE ATTEMPT
+# =====================================================
+def subprocess_checkpoint(pipeline, execution_profile):
+    """
+    Checkpoint left by a failed subprocess attempt, or None. Runs
+    checkpoint under the profile they resolved, which needs the
+    metadata; metadata that does not load failed before any run
+    could checkpoint.
+    """
+    from storage.checkpoints import suspended_checkpoint
 
-    with open(ORCHESTRATION_LOG_PATH, "w") as f:
-        json.dump(logs, f, indent=2)
+    try:
+        metadata = load_plan(pipeline["metadata_file"])["metadata"]
+        execution_profile = resolve_execution_profile(
+            metadata, execution_profile
+        )
+    except Exception:
+        return None
+
+    return suspended_checkpoint(pipeline["dataset_id"], execution_profile)
+
+
+def run_pipeline_subprocess(pipeline, execution_profile):
+    """
+    Run one attempt in a fresh interpreter. Returns a result shaped
+    like run_pipeline's; counts and stages are not available. A failed
+    attempt reports the checkpoint its suspended run left for the
+    retry to resume.
+    """
+    env = os.environ.copy()
+    env["EXECUTION_PROFILE"] = execution_profile
+    env["METADATA_FILE"] = pipeline["metadata_file"]
+
+    result = {
+        "status": "SUCCESS",
+        "run_id": None,
+        "dataset_id": pipeline["dataset_id"],
+        "metadata_file": pipeline["metadata_file"],
+        "execution_profile": execution_profile,
+        "records": None,
+        "cache_hit": False,
+        "stages": {},
+        "wall_seconds": None,
+        "checkpoint": None,
+        "resumed_from": None,
+        "error": None
+    }
+    started = time.perf_counter()
+
+    try:
+        subprocess.run(
+            ["python", pipeline["pipeline_script"]],
+            check=True,
+            env=env,
+            capture_output=True,
+            text=True
+        )
+    except Exception as e:
+        result["status"] = "FAILED"
+        result["error"] = PipelineRunError(
+            e, dataset_id=pipeline["dataset_id"],
+            execution_profile=execution_profile
+        )
+        result["checkpoint"] = subprocess_checkpoint(
+            pipeline, execution_profile
+        )
+        if result["checkpoint"] is not None:
+            result["run_id"] = result["checkpoint"]["run_id"]
+
+    result["wall_seconds"] = time.perf_counter() - started
+    return result
+
+
+def run_pipeline_attempt(pipeline, execution_profile):
+    isolation = pipeline.get("isolation", PIPELINE_ISOLATION)
+
+    if isolation == "subprocess":
+        return run_pipeline_subprocess(pipeline, execution_profile)
+
+    # Environment flags still apply to orchestrated runs
+    return run_pipeline(
+        pipeline["metadata_file"],
+        execution_profile,
+        full_refresh=env_flag("FULL_REFRESH"),
+        bypass_cache=env_flag("BYPASS_CACHE"),
+        resume=not env_flag("NO_RESUME")
+    )
+
+
+def summarize_attempt(result):
+    return {
+        "run_id": result["run_id"],
+        "execution_profile": result["execution_profile"],
+        "status": result["status"],
+        "records": result["records"],
+        "cache_hit": result["cache_hit"],
+        "checkpoint": result["checkpoint"],
+        "resumed_from": result["resumed_from"],
+        "wall_seconds": result["wall_seconds"],
+        "stage_seconds": {
+            stage: record["wall_seconds"]
+            for stage, record in result["stages"].items()
+        }
+    }
 
 
 # =====================================================
@@ -80,10 +193,7 @@ def log_orchestration(entry):
 def run_single_dataset(pipeline, execution_profile, agent_decision):
     orchestration_run_id = str(uuid.uuid4())
     start_time = datetime.now()
-
-    env = os.environ.copy()
-    env["EXECUTION_PROFILE"] = execution_profile
-    env["METADATA_FILE"] = pipeline["metadata_file"]
+    isolation = pipeline.get("isolation", PIPELINE_ISOLATION)
 
     status = None
     failure_diagnosis = None
@@ -95,49 +205,64 @@ def run_single_dataset(pipeline, execution_profile, agent_decision):
     print(f"\n[ORCHESTRATOR] Dataset: {pipeline['dataset_id']} — STARTED")
     print(f"[ORCHESTRATOR] Metadata: {pipeline['metadata_file']}")
     print(f"[ORCHESTRATOR] Execution profile: {execution_profile}")
+    print(f"[ORCHESTRATOR] Isolation: {isolation}")
 
-    try:
-        subprocess.run(
-    ["python", pipeline["pipeline_script"]],
-    check=True,
-    env=env,
-    capture_output=True,
-    text=True
-)
+    attempts = []
+    result = run_pipeline_attempt(pipeline, execution_profile)
+    attempts.append(summarize_attempt(result))
 
+    if result["status"] == "SUCCESS":
         status = "SUCCESS"
 
-    except Exception as e:
+    else:
         status = "FAILED"
-        error_message = str(e)
+        error_message = str(result["error"].cause)
 
-        failure_diagnosis = classify_failure(e)
+        # Classified on the original exception, not the wrapper
+        failure_diagnosis = classify_failure(result["error"].cause)
         healing_action = resolve_healing_action(
-            failure_diagnosis["failure_class"]
+            failure_diagnosis["failure_class"],
+            checkpointed=result["checkpoint"] is not None
         )
 
-        if failure_diagnosis["recoverable"] and healing_action != "HALT":
+        resumes = healing_action == "RESUME_FROM_CHECKPOINT"
+
+        if resumes or (
+            failure_diagnosis["recoverable"] and healing_action != "HALT"
+        ):
             retry_attempted = True
+            retry_profile = execution_profile
 
             if healing_action == "RETRY_VALIDATE_ONLY":
-                env["EXECUTION_PROFILE"] = "validate_only"
+                retry_profile = "validate_only"
             elif healing_action == "RETRY_DRY_RUN":
-                env["EXECUTION_PROFILE"] = "dry_run"
-
-            try:
-                subprocess.run(
-    ["python", pipeline["pipeline_script"]],
-    check=True,
-    env=env,
-    capture_output=True,
-    text=True
-)
+                retry_profile = "dry_run"
+
+            # Retrying with the same profile continues the failed run
+            # from its last checkpoint instead of the first row
+            checkpoint = result["checkpoint"]
+            if checkpoint is not None and retry_profile == execution_profile:
+                progress = (
+                    f"with {checkpoint['partitions_completed']} of "
+                    f"{checkpoint['partitions']} partitions done"
+                    if checkpoint["partitions"] is not None
+                    else f"after chunk {checkpoint['chunks']}"
+                )
+                print(
+                    f"[ORCHESTRATOR] Retry resumes run {result['run_id']} "
+                    f"{progress}"
+                )
+
+            retry = run_pipeline_attempt(pipeline, retry_profile)
+            attempts.append(summarize_attempt(retry))
+
+            if retry["status"] == "SUCCESS":
                 retry_outcome = "SUCCESS"
                 status = "RECOVERED"
 
-            except Exception as retry_error:
+            else:
                 retry_outcome = "FAILED"
-                error_message = str(retry_error)
+                error_message = str(retry["error"].cause)
                 status = "FAILED_AFTER_RETRY"
 
     end_time = datetime.now()
@@ -147,6 +272,7 @@ def run_single_dataset(pipeline, execution_profile, agent_decision):
         "dataset_id": pipeline["dataset_id"],
         "metadata_file": pipeline["metadata_file"],
         "pipeline_script": pipeline["pipeline_script"],
+        "isolation": isolation,
         "execution_profile": execution_profile,
         "agent_decision": agent_decision,
         "status": status,
@@ -155,6 +281,7 @@ def run_single_dataset(pipeline, execution_profile, agent_decision):
         "retry_attempted": retry_attempted,
         "retry_outcome": retry_outcome,
         "error_message": error_message,
+        "attempts": attempts,
         "started_at": start_time.isoformat(),
         "completed_at": end_time.isoformat(),
         "duration_seconds": (end_time - start_time).total_seconds()
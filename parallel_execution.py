@@ -0,0 +1,353 @@
+"""
+PARALLEL PARTITION EXECUTION
+----------------------------
+Purpose:
+    Run the chunk stages of one large dataset across a process pool.
+    The source is split into quote-aware byte ranges, each range is
+    read, transformed and validated by a worker, and the partial
+    results are merged back in partition order.
+
+Design Rules:
+    - Workers reuse the serial chunk processor, so accepted and
+      rejected counts are identical to the serial path
+    - Workers never write to the targets: they spill their accepted
+      and rejected chunks to a scratch directory and the parent
+      replays them, in partition order, through the normal writers
+    - Merging is deterministic (ordered by partition index)
+    - Duplicate keys are resolved by the parent: workers spill the key
+      fingerprints of their accepted rows and the parent marks
+      duplicates in partition order, so the first occurrence in the
+      source is kept exactly as in the serial path. A chunk's
+      duplicates are replayed with its rejected rows, in source
+      order, so both targets are written in the serial row order
+    - A checkpointed run (storage/checkpoints.py) spills into its
+      checkpoint directory and is told about every completed
+      partition, so a resumed run only executes the partitions that
+      had not completed
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import os
+import shutil
+import tempfile
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from ingestion.partitioning import plan_byte_ranges
+from ingestion.pushdown import iter_pushdown_chunks
+from transformations.chunk_processor import (
+    new_chunk_state,
+    timed_chunks,
+    process_chunk,
+    process_pruned,
+    merge_chunk_states
+)
+from transformations.deduplication import (
+    dedup_rule,
+    key_fingerprints,
+    mark_duplicates
+)
+from transformations.rejection import merge_rejection_counts
+from profiling.instrumentation import (
+    start_instrumentation,
+    add_to_stage,
+    measure_stage
+)
+
+
+FINGERPRINT_COLUMN = "__key_fingerprint__"
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+def resolve_parallel_config(metadata: Dict) -> Optional[Dict]:
+    """
+    Parallel settings from the metadata `parallel` block, or None
+    when the dataset runs serially.
+    """
+
+    parallel = metadata.get("parallel") or {}
+    workers = int(parallel.get("workers") or 1)
+
+    if not parallel.get("enabled") or workers < 2:
+        return None
+
+    return {
+        "workers": workers,
+        "partitions": int(parallel.get("partitions") or workers),
+        "spill_dir": parallel.get("spill_dir")
+    }
+
+
+# =====================================================
+# WORKER
+# =====================================================
+
+def _run_partition(task: Dict) -> Tuple[int, Dict, List[Tuple[str, str]]]:
+    """
+    Process one byte range. Runs inside a pool worker.
+
+    Returns:
+        tuple: (partition index, chunk state,
+                ordered list of (role, spilled chunk path))
+    """
+
+    index = task["index"]
+    start_instrumentation(task["instrumentation"])
+    state = new_chunk_state(task["profiling"], task["memory"])
+    spilled = []
+
+    rule = dedup_rule(task["plan"])
+    raw_columns = [cast["column"] for cast in task["plan"]["casts"]]
+
+    chunks = iter_pushdown_chunks(
+        task["metadata"], task["pushdown"], task["byte_range"]
+    )
+
+    for chunk_id, (df, pruned) in enumerate(timed_chunks(chunks, state)):
+        if pruned is not None:
+            process_pruned(pruned, task["plan"], state, task["watermark_column"])
+
+        accepted, rejected = process_chunk(
+            df, task["plan"], state, task["watermark_column"]
+        )
+
+        if task["scratch_dir"] is None:
+            continue
+
+        frames = []
+        if rule is not None:
+            # Key fingerprints of the accepted rows, plus their source
+            # values of cast columns so duplicates are rejected as read
+            keys = df.loc[accepted.index, [c for c in raw_columns if c in df.columns]]
+            keys[FINGERPRINT_COLUMN] = key_fingerprints(accepted, rule["columns"])
+            frames.append(("keys", keys))
+
+        if task["keep_outputs"]:
+            frames += [("curated", accepted), ("rejected", rejected)]
+
+        for role, frame in frames:
+            path = os.path.join(
+                task["scratch_dir"],
+                f"part-{index:05d}-{chunk_id:05d}-{role}.pkl"
+            )
+            frame.to_pickle(path)
+            spilled.append((role, path))
+
+    start, end = task["byte_range"]
+    add_to_stage(state["stages"], "data_ingestion", bytes_read=max(0, end - start))
+
+    return index, state, spilled
+
+
+# =====================================================
+# EXECUTION
+# =====================================================
+
+def run_partitions(
+    metadata: Dict,
+    plan: Dict,
+    byte_range: Tuple[int, int],
+    config: Dict,
+    watermark_column: Optional[str] = None,
+    keep_outputs: bool = True,
+    profiling: Optional[Dict] = None,
+    memory: Optional[Dict] = None,
+    instrumentation: Optional[Dict] = None,
+    pushdown: Optional[Dict] = None,
+    scratch_dir: Optional[str] = None,
+    ranges: Optional[List[Tuple[int, int]]] = None,
+    completed: Optional[Dict] = None,
+    on_partition: Optional[Callable[[List, Dict], None]] = None
+) -> Dict:
+    """
+    Execute all partitions of a byte range in a process pool.
+
+    Parameters:
+        metadata (dict): Dataset metadata
+        plan (dict): Compiled transformation plan
+        byte_range (tuple): (start, end) data bytes to process
+        config (dict): Output of resolve_parallel_config
+        watermark_column (str): Physical column tracked for high-water
+        keep_outputs (bool): Spill accepted/rejected rows for writing
+        profiling (dict): Column profiler config, or None
+        memory (dict): Memory optimizer config, or None
+        instrumentation (dict): Stage instrumentation config, or None
+        pushdown (dict): Predicates pushed into the partition readers
+                         (resolve_run_pushdown), or None
+        scratch_dir (str): Directory to spill into, kept on failure
+                           (a checkpointed run's); by default a temp
+                           directory removed on failure
+        ranges (list): Partition byte ranges of a resumed run
+        completed (dict): Partition index -> (chunk state, spilled)
+                          of partitions a resumed run already has
+        on_partition (callable): Called with (ranges, completed)
+                                 after every partition completes
+
+    Returns:
+        dict: merged chunk `state`, `partitions` (byte ranges), and
+              `spilled` (role, path) pairs in partition order;
+              call cleanup_partitions when done with them
+    """
+
+    if ranges is None:
+        ranges = plan_byte_ranges(
+            metadata["source"]["path"],
+            byte_range[0],
+            byte_range[1],
+            config["partitions"],
+            quoted_newlines=metadata["source"].get("quoted_newlines", True)
+        )
+
+    completed = dict(completed or {})
+    owns_scratch = scratch_dir is None
+
+    if not keep_outputs and dedup_rule(plan) is None:
+        scratch_dir = None
+    elif owns_scratch:
+        if config.get("spill_dir"):
+            os.makedirs(config["spill_dir"], exist_ok=True)
+        scratch_dir = tempfile.mkdtemp(
+            prefix="partitions-", dir=config.get("spill_dir")
+        )
+
+    tasks = [
+        {
+            "index": index,
+            "metadata": metadata,
+            "plan": plan,
+            "byte_range": partition,
+            "watermark_column": watermark_column,
+            "profiling": profiling,
+            "memory": memory,
+            "instrumentation": instrumentation,
+            "pushdown": pushdown,
+            "keep_outputs": keep_outputs,
+            "scratch_dir": scratch_dir
+        }
+        for index, partition in enumerate(ranges)
+        if index not in completed
+    ]
+
+    try:
+        if tasks:
+            with ProcessPoolExecutor(max_workers=config["workers"]) as pool:
+                futures = [pool.submit(_run_partition, task) for task in tasks]
+                failure = None
+
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    try:
+                        index, state, spilled = future.result()
+                    except Exception as e:
+                        # Partitions not started yet are dropped; the
+                        # running ones still complete (and checkpoint)
+                        if failure is None:
+                            failure = e
+                            for other in futures:
+                                other.cancel()
+                        continue
+
+                    completed[index] = (state, spilled)
+                    if on_partition is not None:
+                        on_partition(ranges, completed)
+
+                if failure is not None:
+                    raise failure
+    except Exception:
+        if scratch_dir and owns_scratch:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+        raise
+
+    order = sorted(completed)
+
+    return {
+        "state": merge_chunk_states([completed[index][0] for index in order]),
+        "partitions": ranges,
+        "spilled": [item for index in order for item in completed[index][1]],
+        "scratch_dir": scratch_dir if owns_scratch else None
+    }
+
+
+def _count_duplicates(state: Dict, rule: Dict, count: int) -> None:
+    state["output"] -= count
+    state["rejected"] += count
+    merge_rejection_counts(state["rejection_counts"], {rule["rule_id"]: count})
+
+    outcome = state["rule_outcomes"].setdefault(
+        rule["rule_id"], {"accepted": 0, "rejected": 0}
+    )
+    outcome["accepted"] -= count
+    outcome["rejected"] += count
+
+
+def iter_spilled_chunks(
+    result: Dict,
+    plan: Optional[Dict] = None,
+    dedup: Optional[Dict] = None,
+    stages: Optional[Dict] = None
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Yield (role, DataFrame) for every spilled chunk in partition order.
+
+    With a dedup state, accepted rows whose key was already seen are
+    yielded with the chunk's `rejected` rows instead, tagged
+    duplicate_key and in source order, and the merged state counts
+    are corrected. Key batches are consumed even
+    when no outputs were spilled (dry_run). Reading spilled chunks is
+    measured as partition_replay, key checks as deduplication.
+    """
+
+    stages = {} if stages is None else stages
+    rule = dedup_rule(plan) if plan is not None else None
+    duplicate = None
+    raw_values = None
+    duplicates = None
+
+    for role, path in result["spilled"]:
+        with measure_stage(
+            stages, "partition_replay", bytes_read=os.path.getsize(path)
+        ) as sample:
+            frame = pd.read_pickle(path)
+            sample["rows_out"] = len(frame)
+
+        if role == "keys":
+            if dedup is None or rule is None:
+                continue
+            with measure_stage(stages, "deduplication", rows_in=len(frame)) as sample:
+                fingerprints = frame.pop(FINGERPRINT_COLUMN).to_numpy(np.uint64)
+                duplicate = mark_duplicates(dedup, fingerprints)
+                raw_values = frame
+                if duplicate.any():
+                    _count_duplicates(result["state"], rule, int(duplicate.sum()))
+                sample["rows_out"] = len(frame) - int(duplicate.sum())
+            continue
+
+        if role == "curated" and duplicate is not None and duplicate.any():
+            source_values = {
+                column: raw_values[column].to_numpy()[duplicate]
+                for column in raw_values.columns
+            }
+            duplicates = frame[duplicate].assign(
+                **source_values,
+                rejection_reason=rule["rule_id"],
+                rejection_category=rule["category"]
+            )
+            frame = frame[~duplicate]
+
+        if role == "rejected" and duplicates is not None:
+            # Row labels are source positions within the chunk
+            frame = pd.concat([duplicates, frame]).sort_index(kind="stable")
+            duplicates = None
+
+        yield role, frame
+
+
+def cleanup_partitions(result: Dict) -> None:
+    if result.get("scratch_dir"):
+        shutil.rmtree(result["scratch_dir"], ignore_errors=True)
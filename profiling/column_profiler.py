@@ -0,0 +1,390 @@
+"""
+COLUMN PROFILER
+---------------
+Purpose:
+    Build per-column statistics while chunks stream through the
+    pipeline and persist them, with their sketches, once per run:
+        - row and null counts
+        - min / max, mean and variance of numeric columns
+        - approximate distinct counts (HyperLogLog)
+        - approximate quantiles (KLL compactors)
+
+    Each run is compared against the previous profile of the same
+    dataset, so distribution drift is visible without re-reading
+    the data.
+
+Design Rules:
+    - A profile is a plain dict of mergeable sketches; chunk and
+      partition profiles merge into the same result in any grouping
+    - Profiling sees the transformed (type-cast) rows of every chunk
+    - Persisted sketches can be reloaded and merged (incremental
+      runs carry a cumulative profile forward)
+    - One JSON artifact per run under experiments/column_profiles/,
+      committed with the run's other artifacts when a run commit is
+      given (storage/artifact_commit.py)
+"""
+
+from typing import Dict, Optional
+import json
+import os
+from datetime import datetime
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from profiling.sketches import (
+    DEFAULT_HLL_PRECISION,
+    DEFAULT_KLL_CAPACITY,
+    hll_new, hll_add, hll_merge, hll_estimate, hll_to_json, hll_from_json,
+    kll_new, kll_add, kll_merge, kll_quantiles, kll_to_json, kll_from_json,
+    moments_new, moments_from_values, moments_merge
+)
+from storage.artifact_commit import write_json, update_json
+
+
+PROFILE_DIR = "experiments/column_profiles"
+PROFILE_INDEX_PATH = os.path.join(PROFILE_DIR, "index.json")
+
+DEFAULT_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+def resolve_profiling_config(metadata: Dict) -> Optional[Dict]:
+    """
+    Profiler settings from the metadata `profiling` block, or None
+    when profiling is disabled. Profiling is on by default for every
+    mapped column.
+    """
+
+    profiling = metadata.get("profiling") or {}
+    if profiling.get("enabled", True) is False:
+        return None
+
+    mapping = metadata["columns"]
+    logical_columns = profiling.get("columns") or list(mapping)
+
+    for logical in logical_columns:
+        if logical not in mapping:
+            raise ValueError(
+                f"Metadata validation failed: profiling refers to unknown "
+                f"column '{logical}'"
+            )
+
+    return {
+        "columns": [mapping[logical] for logical in logical_columns],
+        "quantiles": list(profiling.get("quantiles") or DEFAULT_QUANTILES),
+        "hll_precision": int(profiling.get("hll_precision") or DEFAULT_HLL_PRECISION),
+        "kll_capacity": int(profiling.get("kll_capacity") or DEFAULT_KLL_CAPACITY)
+    }
+
+
+# =====================================================
+# PROFILE STATE
+# =====================================================
+
+def new_profile(config: Dict) -> Dict:
+    return {"config": config, "rows": 0, "columns": {}}
+
+
+def _new_column(config: Dict) -> Dict:
+    return {
+        "count": 0,
+        "nulls": 0,
+        "numeric": False,
+        "moments": moments_new(),
+        "hll": hll_new(config["hll_precision"]),
+        "kll": kll_new(config["kll_capacity"])
+    }
+
+
+def update_profile(profile: Dict, df: pd.DataFrame) -> None:
+    """
+    Fold one transformed chunk into the profile.
+    """
+
+    config = profile["config"]
+    profile["rows"] += len(df)
+
+    for column in config["columns"]:
+        if column not in df.columns:
+            continue
+
+        series = df[column]
+        sketch = profile["columns"].setdefault(column, _new_column(config))
+
+        sketch["count"] += len(series)
+        sketch["nulls"] += int(series.isna().sum())
+        hll_add(sketch["hll"], series)
+
+        if (
+            pd.api.types.is_numeric_dtype(series)
+            and not pd.api.types.is_bool_dtype(series)
+        ):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            sketch["numeric"] = True
+            sketch["moments"] = moments_merge(
+                sketch["moments"], moments_from_values(values)
+            )
+            kll_add(sketch["kll"], values)
+
+
+def merge_profiles(left: Optional[Dict], right: Optional[Dict]) -> Optional[Dict]:
+    """
+    Merge two profiles built with the same configuration.
+    """
+
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    merged = new_profile(left["config"])
+    merged["rows"] = left["rows"] + right["rows"]
+
+    for column in list(left["columns"]) + [
+        c for c in right["columns"] if c not in left["columns"]
+    ]:
+        a = left["columns"].get(column)
+        b = right["columns"].get(column)
+
+        if a is None or b is None:
+            merged["columns"][column] = a or b
+            continue
+
+        merged["columns"][column] = {
+            "count": a["count"] + b["count"],
+            "nulls": a["nulls"] + b["nulls"],
+            "numeric": a["numeric"] or b["numeric"],
+            "moments": moments_merge(a["moments"], b["moments"]),
+            "hll": hll_merge(a["hll"], b["hll"]),
+            "kll": kll_merge(a["kll"], b["kll"])
+        }
+
+    return merged
+
+
+# =====================================================
+# SUMMARY AND COMPARISON
+# =====================================================
+
+def summarize_profile(profile: Dict) -> Dict[str, Dict]:
+    """
+    Per-column statistics read from the sketches.
+    """
+
+    quantiles = profile["config"]["quantiles"]
+    summary = {}
+
+    for column, sketch in profile["columns"].items():
+        count = sketch["count"]
+        entry = {
+            "count": count,
+            "nulls": sketch["nulls"],
+            "null_rate": round(sketch["nulls"] / count, 6) if count else 0.0,
+            "distinct_estimate": hll_estimate(sketch["hll"])
+        }
+
+        moments = sketch["moments"]
+        if sketch["numeric"] and moments["n"]:
+            variance = moments["m2"] / (moments["n"] - 1) if moments["n"] > 1 else 0.0
+            entry.update({
+                "min": moments["min"],
+                "max": moments["max"],
+                "mean": moments["mean"],
+                "variance": variance,
+                "std": float(np.sqrt(variance)),
+                "quantiles": kll_quantiles(sketch["kll"], quantiles)
+            })
+
+        summary[column] = entry
+
+    return summary
+
+
+def compare_profiles(previous: Dict[str, Dict], current: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Column-level drift between two profile summaries.
+
+    Returns:
+        dict: Per shared column, the change in null rate, the relative
+              change in distinct count and, for numeric columns, the
+              mean shift in units of the previous standard deviation
+              and the shift of each quantile
+    """
+
+    drift = {}
+
+    for column, now in current.items():
+        before = previous.get(column)
+        if before is None:
+            continue
+
+        entry = {
+            "null_rate_delta": round(now["null_rate"] - before["null_rate"], 6),
+            "distinct_change_ratio": (
+                round(now["distinct_estimate"] / before["distinct_estimate"] - 1, 4)
+                if before["distinct_estimate"] else None
+            )
+        }
+
+        if "mean" in now and "mean" in before:
+            entry["mean_shift_std"] = (
+                round((now["mean"] - before["mean"]) / before["std"], 4)
+                if before["std"] else None
+            )
+            entry["quantile_shift"] = {
+                q: now["quantiles"][q] - before["quantiles"][q]
+                for q in now["quantiles"]
+                if q in before["quantiles"]
+            }
+
+        drift[column] = entry
+
+    return drift
+
+
+# =====================================================
+# SERIALIZATION
+# =====================================================
+
+def profile_to_json(profile: Dict) -> Dict:
+    return {
+        "config": profile["config"],
+        "rows": profile["rows"],
+        "columns": {
+            column: {
+                "count": sketch["count"],
+                "nulls": sketch["nulls"],
+                "numeric": sketch["numeric"],
+                "moments": sketch["moments"],
+                "hll": hll_to_json(sketch["hll"]),
+                "kll": kll_to_json(sketch["kll"])
+            }
+            for column, sketch in profile["columns"].items()
+        }
+    }
+
+
+def profile_from_json(data: Dict) -> Dict:
+    return {
+        "config": data["config"],
+        "rows": data["rows"],
+        "columns": {
+            column: {
+                "count": sketch["count"],
+                "nulls": sketch["nulls"],
+                "numeric": sketch["numeric"],
+                "moments": sketch["moments"],
+                "hll": hll_from_json(sketch["hll"]),
+                "kll": kll_from_json(sketch["kll"])
+            }
+            for column, sketch in data["columns"].items()
+        }
+    }
+
+
+# =====================================================
+# PROFILE STORE
+# =====================================================
+
+def _profile_path(dataset_id: str, run_id: str) -> str:
+    return os.path.join(PROFILE_DIR, dataset_id, f"{run_id}.json")
+
+
+def _load_index() -> Dict:
+    if not os.path.exists(PROFILE_INDEX_PATH):
+        return {}
+    with open(PROFILE_INDEX_PATH, "r") as f:
+        return json.load(f)
+
+
+def load_column_profile(dataset_id: str, run_id: str) -> Optional[Dict]:
+    """
+    Stored profile record of one run, or None.
+    """
+
+    path = _profile_path(dataset_id, run_id)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def write_column_profile(
+    run_id: str,
+    dataset_id: str,
+    execution_profile: str,
+    profile: Dict,
+    carried_from_run: Optional[str] = None,
+    commit: Optional[Dict] = None
+) -> Dict:
+    """
+    Persist one run's profile and compare it with the dataset's
+    previous profile.
+
+    Parameters:
+        run_id (str): Current run
+        dataset_id (str): Dataset profiled
+        execution_profile (str): Execution profile of the run
+        profile (dict): Merged profile of every chunk of the run
+        carried_from_run (str): Run whose cumulative profile this run
+                                extends (incremental runs resuming
+                                from that run's watermark)
+        commit (dict): Run commit the record is staged against, or
+                       None to write it at once
+
+    Returns:
+        dict: Reference for the execution summary (path, profiled
+              columns and the run it was compared with)
+    """
+
+    index = _load_index()
+    previous_run = (index.get(dataset_id) or {}).get("run_id")
+    previous = load_column_profile(dataset_id, previous_run) if previous_run else None
+
+    summary = summarize_profile(profile)
+
+    record = {
+        "run_id": run_id,
+        "dataset_id": dataset_id,
+        "execution_profile": execution_profile,
+        "timestamp": datetime.now().isoformat(),
+        "rows": profile["rows"],
+        "summary": summary,
+        "sketches": profile_to_json(profile)
+    }
+
+    if carried_from_run:
+        carried = load_column_profile(dataset_id, carried_from_run)
+        if carried is not None:
+            base = carried.get("cumulative_sketches") or carried["sketches"]
+            cumulative = merge_profiles(profile_from_json(base), profile)
+            record["cumulative_from_run"] = carried_from_run
+            record["cumulative_summary"] = summarize_profile(cumulative)
+            record["cumulative_sketches"] = profile_to_json(cumulative)
+
+    if previous is not None:
+        record["compared_to_run"] = previous_run
+        record["drift"] = compare_profiles(previous["summary"], summary)
+
+    path = _profile_path(dataset_id, run_id)
+    write_json(path, record, commit)
+
+    entry = {
+        "run_id": run_id,
+        "path": path,
+        "timestamp": record["timestamp"]
+    }
+    update_json(
+        PROFILE_INDEX_PATH, lambda index: {**index, dataset_id: entry},
+        default=dict, commit=commit
+    )
+
+    return {
+        "path": path,
+        "columns": sorted(summary),
+        "compared_to_run": previous_run if previous is not None else None
+    }
@@ -0,0 +1,230 @@
+"""
+STAGE INSTRUMENTATION
+---------------------
+Purpose:
+    Measure every pipeline stage the same way and collect the results
+    into the `stages` block of experiments/performance_metrics.json.
+    Each stage record holds:
+
+        wall_seconds, cpu_seconds       : perf_counter / process_time
+        peak_rss_bytes                  : process RSS high-water mark
+        tracemalloc_peak_bytes          : traced allocations above the
+                                          level at stage entry
+        rows_in, rows_out               : rows entering / leaving
+        bytes_read, bytes_written       : source and target bytes
+        calls                           : times the stage was entered
+
+Design Rules:
+    - Stages are measured with measure_stage (context manager) or the
+      instrumented decorator; stages never nest, so the wall times of
+      a serial run add up to its stage total
+    - A stage entered once per chunk accumulates: times, rows, bytes
+      and calls are summed, peaks are maxima
+    - On Linux the RSS high-water mark is reset at stage entry
+      (/proc/self/clear_refs), so it is the stage's own peak;
+      elsewhere it is the process peak so far (getrusage)
+    - tracemalloc is opt-in (metadata `instrumentation.tracemalloc`):
+      it is only read while tracing is active
+    - Records from parallel workers merge by the same sum/max rules
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+import functools
+import time
+import tracemalloc
+
+
+CLEAR_REFS_PATH = "/proc/self/clear_refs"
+STATUS_PATH = "/proc/self/status"
+
+SUMMED_FIELDS = (
+    "wall_seconds", "cpu_seconds", "rows_in", "rows_out",
+    "bytes_read", "bytes_written", "calls"
+)
+PEAK_FIELDS = ("peak_rss_bytes", "tracemalloc_peak_bytes")
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+def resolve_instrumentation_config(metadata: Dict) -> Dict:
+    """
+    Settings of the metadata `instrumentation` block.
+    """
+
+    options = metadata.get("instrumentation") or {}
+    return {"tracemalloc": bool(options.get("tracemalloc", False))}
+
+
+def start_instrumentation(config: Optional[Dict]) -> None:
+    """
+    Start allocation tracing when the config asks for it (once per
+    process; parallel workers call this too).
+    """
+
+    if config and config.get("tracemalloc") and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+# =====================================================
+# PROCESS MEMORY
+# =====================================================
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open(CLEAR_REFS_PATH, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss() -> Optional[int]:
+    try:
+        with open(STATUS_PATH) as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    try:
+        import resource
+        # ru_maxrss is in KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if peak > 1 << 32 else peak * 1024
+    except (ImportError, ValueError):
+        return None
+
+
+# =====================================================
+# STAGE RECORDS
+# =====================================================
+
+def new_stage_record() -> Dict:
+    record = {field: 0 for field in SUMMED_FIELDS}
+    record["wall_seconds"] = 0.0
+    record["cpu_seconds"] = 0.0
+    record.update({field: None for field in PEAK_FIELDS})
+    return record
+
+
+def _max(left: Optional[int], right: Optional[int]) -> Optional[int]:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return max(left, right)
+
+
+def add_to_stage(stages: Dict, name: str, **values) -> Dict:
+    """
+    Add measured values (e.g. bytes known only at the end of a run)
+    to a stage record, creating it if needed.
+    """
+
+    record = stages.setdefault(name, new_stage_record())
+    for field, value in values.items():
+        if field in PEAK_FIELDS:
+            record[field] = _max(record[field], value)
+        else:
+            record[field] += value
+    return record
+
+
+@contextmanager
+def measure_stage(
+    stages: Dict,
+    name: str,
+    rows_in: int = 0,
+    bytes_read: int = 0
+) -> Iterator[Dict]:
+    """
+    Measure one entry into a stage.
+
+    Parameters:
+        stages (dict): Stage name -> record, updated in place
+        name (str): Stage name
+        rows_in (int): Rows entering the stage
+        bytes_read (int): Bytes read by the stage
+
+    Yields:
+        dict: Counters the block may raise (rows_in, rows_out,
+              bytes_read, bytes_written)
+    """
+
+    sample = {
+        "rows_in": rows_in, "rows_out": 0,
+        "bytes_read": bytes_read, "bytes_written": 0
+    }
+
+    _reset_peak_rss()
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        traced_at_entry = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    wall0 = time.perf_counter()
+    cpu0 = time.process_time()
+
+    try:
+        yield sample
+    finally:
+        add_to_stage(
+            stages, name,
+            wall_seconds=time.perf_counter() - wall0,
+            cpu_seconds=time.process_time() - cpu0,
+            calls=1,
+            peak_rss_bytes=_peak_rss(),
+            tracemalloc_peak_bytes=(
+                max(0, tracemalloc.get_traced_memory()[1] - traced_at_entry)
+                if tracing and tracemalloc.is_tracing() else None
+            ),
+            **sample
+        )
+
+
+def instrumented(
+    name: str,
+    rows_in: Optional[Callable] = None,
+    rows_out: Optional[Callable] = None
+) -> Callable:
+    """
+    Decorator form of measure_stage. The wrapped function takes an
+    extra `stages` keyword; without it the call is not measured.
+    rows_in(*args, **kwargs) and rows_out(result) count rows.
+    """
+
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, stages: Optional[Dict] = None, **kwargs):
+            if stages is None:
+                return fn(*args, **kwargs)
+
+            counted = rows_in(*args, **kwargs) if rows_in else 0
+            with measure_stage(stages, name, rows_in=counted) as sample:
+                result = fn(*args, **kwargs)
+                if rows_out:
+                    sample["rows_out"] += rows_out(result)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def merge_stage_metrics(left: Dict, right: Dict) -> Dict:
+    """
+    Combine the stage records of two processes (partitions).
+    """
+
+    merged = {name: dict(record) for name, record in left.items()}
+    for name, record in right.items():
+        add_to_stage(merged, name, **record)
+    return merged
+
+
+def total_wall_seconds(stages: Dict) -> float:
+    return sum(record["wall_seconds"] for record in stages.values())
@@ -0,0 +1,274 @@
+"""
+MERGEABLE SKETCHES
+------------------
+Purpose:
+    Small, mergeable summaries used by the column profiler:
+        - HyperLogLog registers for approximate distinct counts
+        - KLL-style compactor levels for approximate quantiles
+        - Moments (count, mean, M2, min, max) merged with Chan's formula
+
+Design Rules:
+    - Updates are vectorized over a whole chunk (numpy), never per row
+    - Every sketch merges associatively, so chunks and parallel
+      partitions can be combined in any grouping
+    - Compaction is deterministic (alternating offsets), so a rerun
+      over the same data produces the same sketch
+    - Sketches are plain dicts and serialize to JSON
+"""
+
+from typing import Dict, List
+import base64
+import math
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+
+DEFAULT_HLL_PRECISION = 12
+DEFAULT_KLL_CAPACITY = 200
+
+
+# =====================================================
+# HYPERLOGLOG
+# =====================================================
+
+def hll_new(precision: int = DEFAULT_HLL_PRECISION) -> Dict:
+    return {
+        "precision": precision,
+        "registers": np.zeros(1 << precision, dtype=np.uint8)
+    }
+
+
+def hll_add(sketch: Dict, values: pd.Series) -> None:
+    """
+    Add the non-null values of a series to the sketch. Numeric values
+    are widened first, so a value hashes the same whatever width a
+    chunk was read or downcast to.
+    """
+
+    values = values.dropna()
+    if values.empty:
+        return
+
+    if isinstance(values.dtype, np.dtype) and not pd.api.types.is_bool_dtype(values):
+        if pd.api.types.is_unsigned_integer_dtype(values):
+            values = values.astype(np.uint64)
+        elif pd.api.types.is_integer_dtype(values):
+            values = values.astype(np.int64)
+        elif pd.api.types.is_float_dtype(values):
+            values = values.astype(np.float64)
+
+    p = sketch["precision"]
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(np.uint64)
+
+    index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+    remainder = hashes & np.uint64((1 << (64 - p)) - 1)
+
+    # rank = position of the leftmost 1-bit in the remaining 64-p bits
+    width = 64 - p
+    bit_length = np.zeros(len(remainder), dtype=np.int64)
+    nonzero = remainder > 0
+    bit_length[nonzero] = np.floor(
+        np.log2(remainder[nonzero].astype(np.float64))
+    ).astype(np.int64) + 1
+    rank = (width - bit_length + 1).astype(np.uint8)
+
+    np.maximum.at(sketch["registers"], index, rank)
+
+
+def hll_merge(left: Dict, right: Dict) -> Dict:
+    return {
+        "precision": left["precision"],
+        "registers": np.maximum(left["registers"], right["registers"])
+    }
+
+
+def hll_estimate(sketch: Dict) -> int:
+    registers = sketch["registers"]
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+
+    estimate = alpha * m * m / np.sum(np.power(2.0, -registers.astype(np.float64)))
+
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        # Small-range correction (linear counting)
+        estimate = m * math.log(m / zeros)
+
+    return int(round(estimate))
+
+
+# =====================================================
+# KLL QUANTILES
+# =====================================================
+
+def kll_new(capacity: int = DEFAULT_KLL_CAPACITY) -> Dict:
+    return {"capacity": capacity, "levels": [], "offsets": []}
+
+
+def _kll_compact(sketch: Dict) -> None:
+    capacity = sketch["capacity"]
+    levels = sketch["levels"]
+    level = 0
+
+    while level < len(levels):
+        items = levels[level]
+        if len(items) <= capacity:
+            level += 1
+            continue
+
+        if level + 1 == len(levels):
+            levels.append(np.empty(0, dtype=np.float64))
+            sketch["offsets"].append(0)
+
+        items = np.sort(items)
+        # An odd item out stays at this level
+        keep = items[-1:] if len(items) % 2 else items[:0]
+        paired = items[:len(items) - len(keep)]
+
+        offset = sketch["offsets"][level]
+        sketch["offsets"][level] = 1 - offset
+
+        levels[level + 1] = np.concatenate([levels[level + 1], paired[offset::2]])
+        levels[level] = keep
+        level += 1
+
+
+def kll_add(sketch: Dict, values: np.ndarray) -> None:
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return
+
+    if not sketch["levels"]:
+        sketch["levels"].append(np.empty(0, dtype=np.float64))
+        sketch["offsets"].append(0)
+
+    sketch["levels"][0] = np.concatenate([sketch["levels"][0], values])
+    _kll_compact(sketch)
+
+
+def kll_merge(left: Dict, right: Dict) -> Dict:
+    depth = max(len(left["levels"]), len(right["levels"]))
+    empty = np.empty(0, dtype=np.float64)
+
+    merged = {
+        "capacity": left["capacity"],
+        "levels": [
+            np.concatenate([
+                left["levels"][i] if i < len(left["levels"]) else empty,
+                right["levels"][i] if i < len(right["levels"]) else empty
+            ])
+            for i in range(depth)
+        ],
+        "offsets": [
+            (left["offsets"][i] if i < len(left["offsets"]) else 0)
+            for i in range(depth)
+        ]
+    }
+
+    _kll_compact(merged)
+    return merged
+
+
+def kll_quantiles(sketch: Dict, quantiles: List[float]) -> Dict[str, float]:
+    if not sketch["levels"]:
+        return {}
+
+    items = np.concatenate(sketch["levels"])
+    if items.size == 0:
+        return {}
+
+    weights = np.concatenate([
+        np.full(len(level), 2.0 ** i) for i, level in enumerate(sketch["levels"])
+    ])
+
+    order = np.argsort(items, kind="stable")
+    items = items[order]
+    cumulative = np.cumsum(weights[order])
+    total = cumulative[-1]
+
+    result = {}
+    for q in quantiles:
+        position = np.searchsorted(cumulative, q * total, side="left")
+        result[f"p{round(q * 100, 2):g}"] = float(items[min(position, len(items) - 1)])
+
+    return result
+
+
+# =====================================================
+# MOMENTS
+# =====================================================
+
+def moments_new() -> Dict:
+    return {"n": 0, "mean": 0.0, "m2": 0.0, "min": None, "max": None}
+
+
+def moments_from_values(values: np.ndarray) -> Dict:
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return moments_new()
+
+    mean = float(values.mean())
+    return {
+        "n": int(values.size),
+        "mean": mean,
+        "m2": float(np.sum((values - mean) ** 2)),
+        "min": float(values.min()),
+        "max": float(values.max())
+    }
+
+
+def moments_merge(left: Dict, right: Dict) -> Dict:
+    if left["n"] == 0:
+        return dict(right)
+    if right["n"] == 0:
+        return dict(left)
+
+    n = left["n"] + right["n"]
+    delta = right["mean"] - left["mean"]
+
+    return {
+        "n": n,
+        "mean": left["mean"] + delta * right["n"] / n,
+        "m2": left["m2"] + right["m2"] + delta * delta * left["n"] * right["n"] / n,
+        "min": min(left["min"], right["min"]),
+        "max": max(left["max"], right["max"])
+    }
+
+
+# =====================================================
+# SERIALIZATION
+# =====================================================
+
+def hll_to_json(sketch: Dict) -> Dict:
+    return {
+        "precision": sketch["precision"],
+        "registers": base64.b64encode(sketch["registers"].tobytes()).decode()
+    }
+
+
+def hll_from_json(data: Dict) -> Dict:
+    return {
+        "precision": data["precision"],
+        "registers": np.frombuffer(
+            base64.b64decode(data["registers"]), dtype=np.uint8
+        ).copy()
+    }
+
+
+def kll_to_json(sketch: Dict) -> Dict:
+    return {
+        "capacity": sketch["capacity"],
+        "levels": [level.tolist() for level in sketch["levels"]],
+        "offsets": list(sketch["offsets"])
+    }
+
+
+def kll_from_json(data: Dict) -> Dict:
+    return {
+        "capacity": data["capacity"],
+        "levels": [np.asarray(level, dtype=np.float64) for level in data["levels"]],
+        "offsets": list(data["offsets"])
+    }
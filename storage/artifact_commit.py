@@ -0,0 +1,606 @@
+"""
+ARTIFACT COMMITS
+----------------
+Purpose:
+    Crash-safe writes of the pipeline's outputs (curated, rejected and
+    child targets) and governance artifacts (execution summary,
+    lineage, metrics, watermarks, ...). A file is never written in
+    place: it is written to a temp file in its own directory, fsynced
+    and atomically renamed over the final path. All the files of one
+    run are committed together under a run manifest.
+
+Design Rules:
+    - Readers only ever see the previous or the new complete file
+    - A run stages its outputs while it executes and its artifacts at
+      the end, then commits them in one step (commit_run):
+        1. under the commit lock, artifact updates are applied to the
+           current file contents (concurrent runs never lose each
+           other's appends) and written to fsynced temp files
+        2. the manifest experiments/run_manifests/<run_id>.json is
+           written with status PREPARED and the list of renames
+        3. the renames are applied and the manifest is marked
+           COMMITTED
+    - Until PREPARED the run's manifest is <run_id>.pending.json with
+      status STAGING. A failed run discards its staged files
+      (abort_run); a crashed run
+      is cleaned up, or rolled forward when it reached PREPARED, by
+      recover_pending_commits at the start of the next run
+    - A run that saved a checkpoint (storage/checkpoints.py) is
+      resumable: when it fails or crashes its commit is SUSPENDED
+      instead, keeping the staged files for the run that resumes it
+      (resume_run_commit) until that run commits or the suspended run
+      is discarded (discard_suspended_run)
+    - Outputs never append in place: appends are staged and applied
+      on commit (the "append" operation)
+    - Commit operations are idempotent, so recovery can replay them
+    - Standard library only
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import json
+import os
+import shutil
+import socket
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+MANIFEST_DIR = "experiments/run_manifests"
+LOCK_PATH = "experiments/.commit.lock"
+
+STAGING = "STAGING"
+PREPARED = "PREPARED"
+COMMITTED = "COMMITTED"
+ABORTED = "ABORTED"
+SUSPENDED = "SUSPENDED"
+
+PENDING_STATUSES = {STAGING, PREPARED, SUSPENDED}
+
+
+# =====================================================
+# ATOMIC FILE WRITES
+# =====================================================
+
+def staged_path(path: str, tag: str, suffix: str = "tmp") -> str:
+    """
+    Hidden sibling of a final path, where its new content is staged.
+    """
+
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.{tag}.{suffix}")
+
+
+def _fsync_dir(directory: str) -> None:
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def fsync_tree(path: str) -> None:
+    """
+    fsync a file, or every file and directory under a directory.
+    """
+
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
+        return
+
+    for root, _, names in os.walk(path):
+        for name in names:
+            with open(os.path.join(root, name), "rb") as f:
+                os.fsync(f.fileno())
+        _fsync_dir(root)
+
+
+def fsync_files(paths) -> None:
+    """
+    fsync files and the directories that hold them.
+    """
+
+    directories = set()
+    for path in paths:
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
+        directories.add(os.path.dirname(path))
+
+    for directory in directories:
+        _fsync_dir(directory)
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _write_staged(path: str, data: bytes, tag: str) -> str:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = staged_path(path, tag)
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """
+    Replace a file with new content: temp file in the same directory,
+    fsync, rename, directory fsync.
+    """
+
+    os.replace(_write_staged(path, data, f"{os.getpid()}"), path)
+    _fsync_dir(os.path.dirname(path))
+
+
+def _encode(value, kind: str) -> bytes:
+    if kind == "json":
+        return json.dumps(value, indent=2).encode()
+    return value.encode()
+
+
+def _read_json(path: str, default):
+    if not os.path.exists(path):
+        return default() if callable(default) else default
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+@contextmanager
+def commit_lock():
+    """
+    Exclusive lock serializing artifact updates and commits across
+    processes.
+    """
+
+    os.makedirs(os.path.dirname(LOCK_PATH), exist_ok=True)
+    with open(LOCK_PATH, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# =====================================================
+# ARTIFACT WRITERS
+# Without a run commit the write is applied at once
+# (atomically); with one it is staged until commit_run
+# =====================================================
+
+def _stage_artifact(commit: Dict, path: str, kind: str, update: Callable,
+                    default=None) -> None:
+    commit["pending_artifacts"].append({
+        "path": path, "kind": kind, "update": update, "default": default
+    })
+
+
+def write_json(path: str, value, commit: Optional[Dict] = None) -> None:
+    if commit is not None:
+        _stage_artifact(commit, path, "json", lambda _: value)
+        return
+    atomic_write(path, _encode(value, "json"))
+
+
+def write_text(path: str, text: str, commit: Optional[Dict] = None) -> None:
+    if commit is not None:
+        _stage_artifact(commit, path, "text", lambda _: text)
+        return
+    atomic_write(path, _encode(text, "text"))
+
+
+def update_json(
+    path: str,
+    update: Callable,
+    default=list,
+    commit: Optional[Dict] = None
+):
+    """
+    Read-modify-write of a JSON artifact. `update` receives the
+    current value (or `default` when the file does not exist) and
+    returns the new one; it runs under the commit lock, on the
+    content current at commit time.
+
+    Returns:
+        The new value when applied at once, None when staged
+    """
+
+    if commit is not None:
+        _stage_artifact(commit, path, "json", update, default)
+        return None
+
+    with commit_lock():
+        value = update(_read_json(path, default))
+        atomic_write(path, _encode(value, "json"))
+    return value
+
+
+# =====================================================
+# COMMIT OPERATIONS
+# =====================================================
+
+def output_operation(
+    op: str,
+    src: str,
+    dst: str,
+    tag: str,
+    size: Optional[int] = None,
+    scratch: Optional[List[str]] = None
+) -> Dict:
+    """
+    Commit operation moving a staged output (file or directory `src`)
+    to `dst`:
+        replace     : file replaces dst
+        replace_dir : directory replaces dst
+        merge_dir   : directory's files are moved into dst
+        append      : file is appended to dst, first cut back to
+                      `size` (its length when staged)
+    `scratch` paths are removed once the operation is applied or
+    discarded.
+    """
+
+    operation = {"op": op, "src": src, "dst": dst, "tag": tag}
+    if size is not None:
+        operation["size"] = size
+    if scratch:
+        operation["scratch"] = list(scratch)
+    return operation
+
+
+def apply_operation(operation: Dict) -> None:
+    """
+    Move one staged output into place. Idempotent: a missing source
+    means the operation already ran (or nothing was staged).
+    """
+
+    src, dst = operation["src"], operation["dst"]
+
+    if operation["op"] == "replace":
+        if os.path.exists(src):
+            if os.path.isdir(dst):
+                shutil.rmtree(dst)
+            os.replace(src, dst)
+
+    elif operation["op"] == "replace_dir":
+        old = staged_path(dst, operation["tag"], "old")
+        if os.path.exists(src):
+            if os.path.exists(dst):
+                os.replace(dst, old)
+            os.replace(src, dst)
+        if os.path.isdir(old):
+            shutil.rmtree(old)
+        elif os.path.exists(old):
+            os.remove(old)
+
+    elif operation["op"] == "merge_dir":
+        if os.path.isdir(src):
+            for root, _, names in os.walk(src):
+                target_dir = os.path.join(dst, os.path.relpath(root, src))
+                os.makedirs(target_dir, exist_ok=True)
+                for name in names:
+                    os.replace(os.path.join(root, name), os.path.join(target_dir, name))
+            shutil.rmtree(src)
+
+    elif operation["op"] == "append":
+        if os.path.exists(src):
+            with open(dst, "r+b") as out, open(src, "rb") as staged:
+                out.truncate(operation["size"])
+                out.seek(operation["size"])
+                shutil.copyfileobj(staged, out)
+                out.flush()
+                os.fsync(out.fileno())
+            os.remove(src)
+
+    else:
+        raise ValueError(f"Unknown commit operation '{operation['op']}'")
+
+    for path in operation.get("scratch", []):
+        _remove(path)
+
+    _fsync_dir(os.path.dirname(dst))
+
+
+def discard_operation(operation: Dict) -> None:
+    for path in [operation["src"]] + operation.get("scratch", []):
+        _remove(path)
+
+
+# =====================================================
+# RUN COMMITS
+# =====================================================
+
+def _manifest_path(run_id: str, pending: bool) -> str:
+    suffix = ".pending.json" if pending else ".json"
+    return os.path.join(MANIFEST_DIR, f"{run_id}{suffix}")
+
+
+def _write_manifest(commit: Dict) -> None:
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    pending = commit["status"] in PENDING_STATUSES
+    manifest = {
+        key: commit[key]
+        for key in (
+            "run_id", "status", "host", "pid", "started_at", "resumable",
+            "details", "operations", "artifacts"
+        )
+    }
+    manifest.update({k: commit[k] for k in ("committed_at", "recovered") if k in commit})
+
+    atomic_write(_manifest_path(commit["run_id"], pending), _encode(manifest, "json"))
+    if not pending:
+        final_pending = _manifest_path(commit["run_id"], True)
+        if os.path.exists(final_pending):
+            os.remove(final_pending)
+
+
+def new_run_commit(run_id: str) -> Dict:
+    """
+    Empty run commit. Outputs and artifacts staged against it become
+    visible together in commit_run.
+    """
+
+    return {
+        "run_id": run_id,
+        "tag": run_id[:8],
+        "status": STAGING,
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+        "started_at": datetime.now().isoformat(),
+        "resumable": False,
+        "details": {},
+        "operations": [],
+        "artifacts": [],
+        "pending_artifacts": [],
+        "manifest_written": False
+    }
+
+
+def stage_output(commit: Dict, operation: Dict) -> None:
+    """
+    Register a staged output (output_operation) to be applied on
+    commit. Registering the same staged path again replaces it.
+    """
+
+    commit["operations"] = [
+        staged for staged in commit["operations"]
+        if staged["src"] != operation["src"]
+    ] + [operation]
+    _write_manifest(commit)
+    commit["manifest_written"] = True
+
+
+def mark_resumable(commit: Dict) -> None:
+    """
+    Record that the run saved a checkpoint: from now on a failure or
+    crash suspends it instead of discarding its staged outputs.
+    """
+
+    if commit["resumable"]:
+        return
+    commit["resumable"] = True
+    _write_manifest(commit)
+    commit["manifest_written"] = True
+
+
+def resume_run_commit(commit: Dict, run_id: str) -> None:
+    """
+    Continue a suspended run under a fresh commit: the commit takes
+    over the run's id, staging tag and staged outputs, which its
+    writers find (and register) again. Must precede any staging.
+    """
+
+    manifest = _load_manifest(run_id) or {}
+    commit.update(
+        run_id=run_id,
+        tag=run_id[:8],
+        resumable=True,
+        operations=list(manifest.get("operations", []))
+    )
+
+
+def commit_run(commit: Dict, details: Optional[Dict] = None) -> Dict:
+    """
+    Make every staged output and artifact of a run visible together.
+
+    Parameters:
+        commit (dict): Run commit (new_run_commit)
+        details (dict): Run details recorded in the manifest
+
+    Returns:
+        dict: The committed manifest's artifact list and status
+    """
+
+    commit["details"].update(details or {})
+
+    with commit_lock():
+        # Updates of the same artifact are applied in staging order
+        values = {}
+        for artifact in commit["pending_artifacts"]:
+            path = artifact["path"]
+            if path in values:
+                current = values[path][1]
+            elif artifact["default"] is not None:
+                current = _read_json(path, artifact["default"])
+            else:
+                current = None
+            values[path] = (artifact["kind"], artifact["update"](current))
+
+        for path, (kind, value) in values.items():
+            data = _encode(value, kind)
+            commit["operations"].append({
+                "op": "replace",
+                "src": _write_staged(path, data, commit["tag"]),
+                "dst": path,
+                "tag": commit["tag"]
+            })
+
+        for operation in commit["operations"]:
+            if os.path.exists(operation["src"]):
+                fsync_tree(operation["src"])
+        commit["artifacts"] = sorted(
+            {operation["dst"] for operation in commit["operations"]}
+        )
+        commit["status"] = PREPARED
+        _write_manifest(commit)
+
+        for operation in commit["operations"]:
+            apply_operation(operation)
+
+        commit["status"] = COMMITTED
+        commit["committed_at"] = datetime.now().isoformat()
+        _write_manifest(commit)
+
+    return {
+        "run_id": commit["run_id"],
+        "status": commit["status"],
+        "path": _manifest_path(commit["run_id"], False),
+        "artifacts": len(commit["artifacts"])
+    }
+
+
+def abort_run(commit: Dict) -> None:
+    """
+    Discard everything a failed run staged; the previous outputs and
+    artifacts stay as they were. A resumable run is suspended instead,
+    with its staged outputs kept.
+    """
+
+    if commit["status"] != STAGING:
+        return
+
+    if commit["resumable"]:
+        commit["status"] = SUSPENDED
+        _write_manifest(commit)
+        return
+
+    for operation in commit["operations"]:
+        discard_operation(operation)
+
+    commit["status"] = ABORTED
+    if commit["manifest_written"]:
+        _write_manifest(commit)
+
+
+def _load_manifest(run_id: str) -> Optional[Dict]:
+    for pending in (True, False):
+        path = _manifest_path(run_id, pending)
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return None
+    return None
+
+
+def run_commit_status(run_id: str) -> Optional[str]:
+    """
+    Status of a run's commit, or None when it never staged anything.
+    """
+
+    manifest = _load_manifest(run_id)
+    return manifest["status"] if manifest else None
+
+
+def discard_suspended_run(run_id: str) -> None:
+    """
+    Give up on a suspended run: its staged outputs are discarded and
+    its manifest marked ABORTED.
+    """
+
+    with commit_lock():
+        manifest = _load_manifest(run_id)
+        if manifest is None or manifest["status"] != SUSPENDED:
+            return
+
+        for operation in manifest["operations"]:
+            discard_operation(operation)
+
+        _write_manifest({**manifest, "status": ABORTED})
+
+
+def _alive(manifest: Dict) -> bool:
+    if manifest.get("host") != socket.gethostname():
+        return True
+    if manifest.get("pid") == os.getpid():
+        return True
+    try:
+        os.kill(manifest["pid"], 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def recover_pending_commits() -> List[Dict]:
+    """
+    Finish the commits of crashed runs: PREPARED runs are rolled
+    forward, STAGING runs of dead processes are discarded (suspended
+    when resumable). Suspended runs are left for their resume.
+
+    Returns:
+        list: {run_id, status} of every recovered run
+    """
+
+    if not os.path.isdir(MANIFEST_DIR):
+        return []
+
+    recovered = []
+
+    with commit_lock():
+        for name in sorted(os.listdir(MANIFEST_DIR)):
+            if not name.endswith(".pending.json"):
+                continue
+
+            try:
+                with open(os.path.join(MANIFEST_DIR, name)) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            if manifest["status"] == SUSPENDED:
+                continue
+            if manifest["status"] == STAGING and _alive(manifest):
+                continue
+
+            commit = {
+                "resumable": False, **manifest,
+                "recovered": datetime.now().isoformat()
+            }
+
+            if manifest["status"] == STAGING and manifest.get("resumable"):
+                commit["status"] = SUSPENDED
+            elif manifest["status"] == PREPARED:
+                for operation in manifest["operations"]:
+                    apply_operation(operation)
+                commit["status"] = COMMITTED
+                commit["committed_at"] = commit["recovered"]
+            else:
+                for operation in manifest["operations"]:
+                    discard_operation(operation)
+                commit["status"] = ABORTED
+
+            _write_manifest(commit)
+            recovered.append({"run_id": manifest["run_id"], "status": commit["status"]})
+
+    return recovered
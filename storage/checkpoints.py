@@ -0,0 +1,332 @@
+"""
+RUN CHECKPOINTS
+---------------
+Purpose:
+    Let a long streaming run resume where it stopped. After each
+    committed chunk (every `checkpoint.interval_chunks` chunks) the
+    serial pipeline records how far it read the source, its cumulative
+    counts, the partial rejection summary, the column profile sketches
+    and the positions of its staged outputs. A parallel run records
+    the same after every completed partition, keeping the partition's
+    chunk state and spilled chunks. A rerun of the same run (same
+    dataset, execution profile, metadata hash and source) continues
+    from the last checkpoint instead of the first row, or runs only
+    the partitions that had not completed.
+
+Design Rules:
+    - One directory per run under experiments/run_checkpoints/:
+        checkpoint.json : the checkpoint record, replaced atomically;
+                          writing it is what commits a checkpoint
+        state-NNNNN.pkl : the rest of the chunk state (memory and
+                          child table dictionaries, sampling counters,
+                          stage records, high-water value)
+        dedup.u64       : append-only journal of the deduplication
+                          fingerprints claimed; the record holds its
+                          valid length
+        partitions/     : chunks spilled by the partitions of a
+                          parallel run (parallel_execution.py)
+    - The staged outputs of a checkpointed run outlive its failure
+      (its commit is SUSPENDED, storage/artifact_commit.py) and are
+      cut back to the recorded positions when the run resumes
+    - A checkpoint is only resumed while the source is unchanged (for
+      a watermarked byte range: still starts with the same bytes and
+      covers the range); otherwise its run is discarded
+    - At most one suspended run per dataset and execution profile;
+      checkpoints are removed once their run commits
+    - numpy is only imported to read and write the fingerprint journal
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import json
+import os
+import pickle
+import shutil
+
+from ingestion.byte_range import head_fingerprint
+from storage.artifact_commit import (
+    SUSPENDED,
+    STAGING,
+    atomic_write,
+    fsync_files,
+    run_commit_status,
+    discard_suspended_run
+)
+from storage.run_cache import source_fingerprint
+from storage.watermarks import FINGERPRINT_BYTES
+
+
+CHECKPOINT_DIR = "experiments/run_checkpoints"
+RECORD_NAME = "checkpoint.json"
+JOURNAL_NAME = "dedup.u64"
+PARTITIONS_NAME = "partitions"
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+def resolve_checkpoint_config(metadata: Dict) -> Optional[Dict]:
+    """
+    Settings of the metadata `checkpoint` block, or None when runs are
+    not checkpointed.
+    """
+
+    checkpoint = metadata.get("checkpoint") or {}
+    if not checkpoint or checkpoint.get("enabled", True) is False:
+        return None
+
+    interval = int(checkpoint.get("interval_chunks", 1))
+    if interval < 1:
+        raise ValueError(
+            "Metadata validation failed: checkpoint interval_chunks must "
+            "be at least 1"
+        )
+
+    return {"interval_chunks": interval}
+
+
+# =====================================================
+# SOURCE IDENTITY
+# =====================================================
+
+def checkpoint_source(path: str, byte_range: Optional[Tuple[int, int]]) -> Dict:
+    """
+    What a checkpoint must find again to be resumed: the whole source
+    unchanged, or for a byte range the bytes it starts with.
+    """
+
+    if byte_range is None:
+        return {"path": path, "byte_range": None, "fingerprint": source_fingerprint(path)}
+
+    length = min(FINGERPRINT_BYTES, byte_range[1])
+    return {
+        "path": path,
+        "byte_range": list(byte_range),
+        "fingerprint_bytes": length,
+        "fingerprint": head_fingerprint(path, length)
+    }
+
+
+def _source_matches(recorded: Dict, path: str,
+                    byte_range: Optional[Tuple[int, int]]) -> bool:
+    if recorded["path"] != path or not os.path.exists(path):
+        return False
+
+    if recorded["byte_range"] is None:
+        return byte_range is None and recorded["fingerprint"] == source_fingerprint(path)
+
+    start, end = recorded["byte_range"]
+    return (
+        byte_range is not None
+        and byte_range[0] == start
+        and os.path.getsize(path) >= end
+        and head_fingerprint(path, recorded["fingerprint_bytes"]) == recorded["fingerprint"]
+    )
+
+
+# =====================================================
+# CHECKPOINT STORE
+# =====================================================
+
+def _checkpoint_dir(run_id: str) -> str:
+    return os.path.join(CHECKPOINT_DIR, run_id)
+
+
+def _read_record(run_id: str) -> Optional[Dict]:
+    path = os.path.join(_checkpoint_dir(run_id), RECORD_NAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_checkpoint(run_id: str, record: Dict, state: Dict, fingerprints) -> Dict:
+    """
+    Write one checkpoint of a run.
+
+    Parameters:
+        run_id (str): Run being checkpointed
+        record (dict): Checkpoint record (offset, counts, rejection
+                       summary, profile sketches, output positions)
+        state (dict): Remaining chunk state, pickled
+        fingerprints (ndarray): Dedup fingerprints claimed since the
+                                previous checkpoint, or None
+
+    Returns:
+        dict: The record as written (sequence and file names added)
+    """
+
+    directory = _checkpoint_dir(run_id)
+    os.makedirs(directory, exist_ok=True)
+
+    previous = _read_record(run_id)
+    sequence = previous["sequence"] + 1 if previous else 1
+    journal_keys = previous["dedup_journal_keys"] if previous else 0
+
+    journal = os.path.join(directory, JOURNAL_NAME)
+    if fingerprints is not None:
+        # A crashed checkpoint may have appended past the valid length
+        with open(journal, "ab") as f:
+            f.truncate(journal_keys * 8)
+            fingerprints.tofile(f)
+            journal_keys += len(fingerprints)
+        fsync_files([journal])
+
+    state_file = f"state-{sequence:05d}.pkl"
+    atomic_write(
+        os.path.join(directory, state_file),
+        pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    )
+
+    record = {
+        **record,
+        "run_id": run_id,
+        "sequence": sequence,
+        "state_file": state_file,
+        "dedup_journal_keys": journal_keys,
+        "created_at": datetime.now().isoformat()
+    }
+    atomic_write(os.path.join(directory, RECORD_NAME), json.dumps(record, indent=2).encode())
+
+    if previous:
+        stale = os.path.join(directory, previous["state_file"])
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    return record
+
+
+def load_checkpoint_state(record: Dict) -> Tuple[Dict, object]:
+    """
+    Chunk state and dedup fingerprints of a checkpoint.
+
+    Returns:
+        tuple: (unpickled state, uint64 fingerprint array)
+    """
+    import numpy as np  # type: ignore
+
+    directory = _checkpoint_dir(record["run_id"])
+
+    with open(os.path.join(directory, record["state_file"]), "rb") as f:
+        state = pickle.load(f)
+
+    journal = os.path.join(directory, JOURNAL_NAME)
+    fingerprints = np.empty(0, dtype=np.uint64)
+    if record["dedup_journal_keys"]:
+        fingerprints = np.fromfile(
+            journal, dtype=np.uint64, count=record["dedup_journal_keys"]
+        )
+
+    return state, fingerprints
+
+
+def checkpoint_scratch_dir(run_id: str) -> str:
+    """
+    Directory a checkpointed parallel run spills its partitions into;
+    it lives (and is removed) with the run's checkpoints.
+    """
+
+    path = os.path.join(_checkpoint_dir(run_id), PARTITIONS_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def discard_checkpoint(run_id: str) -> None:
+    shutil.rmtree(_checkpoint_dir(run_id), ignore_errors=True)
+
+
+def find_resumable_checkpoint(
+    dataset_id: str,
+    execution_profile: str,
+    metadata_hash: str,
+    source_path: str,
+    byte_range: Optional[Tuple[int, int]] = None,
+    resume: bool = True
+) -> Optional[Dict]:
+    """
+    Last checkpoint of a suspended run this run can continue.
+
+    Suspended runs of the same dataset and execution profile that do
+    not match (other metadata hash, changed source, resume=False) are
+    discarded with their staged outputs; checkpoints of runs that
+    committed or were aborted are removed.
+
+    Returns:
+        dict: The checkpoint record, or None to start from the first row
+    """
+
+    if not os.path.isdir(CHECKPOINT_DIR):
+        return None
+
+    found = None
+
+    for run_id in sorted(os.listdir(CHECKPOINT_DIR)):
+        record = _read_record(run_id)
+        status = run_commit_status(run_id)
+
+        if status == STAGING:
+            # Still running in another process
+            continue
+
+        if record is None or status != SUSPENDED:
+            discard_checkpoint(run_id)
+            continue
+
+        if record["dataset_id"] != dataset_id or record["execution_profile"] != execution_profile:
+            continue
+
+        if (
+            resume and found is None
+            and record["metadata_hash"] == metadata_hash
+            and _source_matches(record["source"], source_path, byte_range)
+        ):
+            found = record
+            continue
+
+        discard_suspended_run(run_id)
+        discard_checkpoint(run_id)
+
+    return found
+
+
+def suspended_checkpoint(dataset_id: str, execution_profile: str) -> Optional[Dict]:
+    """
+    Summary of the last checkpoint of a suspended run of a dataset and
+    execution profile, e.g. one that failed in another process.
+    """
+
+    if not os.path.isdir(CHECKPOINT_DIR):
+        return None
+
+    for run_id in sorted(os.listdir(CHECKPOINT_DIR)):
+        record = _read_record(run_id)
+        if (
+            record is not None
+            and record["dataset_id"] == dataset_id
+            and record["execution_profile"] == execution_profile
+            and run_commit_status(run_id) == SUSPENDED
+        ):
+            return summarize_checkpoint(record)
+
+    return None
+
+
+def summarize_checkpoint(record: Dict) -> Dict:
+    partitions = record["offset"].get("partitions")
+
+    return {
+        "run_id": record["run_id"],
+        "sequence": record["sequence"],
+        "chunks": record["offset"]["chunks"],
+        "byte_offset": record["offset"]["byte_offset"],
+        "partitions_completed": (
+            len(partitions["completed"]) if partitions else None
+        ),
+        "partitions": len(partitions["ranges"]) if partitions else None,
+        "records": record["records"],
+        "created_at": record["created_at"]
+    }
@@ -0,0 +1,499 @@
+"""
+OUTPUT WRITER MODULE
+--------------------
+Purpose:
+    Write curated and rejected targets chunk by chunk in the format
+    declared by the metadata `target` block.
+
+Supported formats:
+    - csv      : header on the first chunk, appended afterwards
+    - parquet  : one file with configurable compression and row-group
+                 size, or a hive-style dataset partitioned by a
+                 declared column (e.g. the month of InvoiceDate)
+
+Append mode (incremental runs) keeps existing output: csv rows are
+appended, partitioned datasets gain new part files, and a single
+parquet file is rewritten with its existing row groups carried over.
+
+Outputs are staged next to their final path and only become visible
+when they are committed (storage/artifact_commit.py): new files are
+written to a hidden temp file and renamed over the target, datasets
+are written to a hidden staging directory that replaces the target
+(or is merged into it when appending). Rows appended to an existing
+csv are written to a hidden temp file and appended to it on commit.
+
+Resumable writers (checkpointed runs, storage/checkpoints.py) report
+a durable position after each checkpoint (checkpoint_output_writer)
+and can continue from it in a later process (resume_output_writer).
+A single parquet file they write is split into one segment per
+checkpoint, assembled into the staged file when the writer closes.
+
+Design Rules:
+    - One writer per target path, opened once and closed once per run
+    - With a run commit, the staged output is committed with the rest
+      of the run; without one, it is committed when the writer closes
+    - Writers record their own write time and bytes written
+    - pyarrow is only imported when a parquet target is used
+"""
+
+from typing import Dict, Optional
+import os
+import shutil
+import time
+
+import pandas as pd  # type: ignore
+
+from storage.artifact_commit import (
+    staged_path,
+    output_operation,
+    stage_output,
+    apply_operation,
+    fsync_tree,
+    fsync_files
+)
+
+
+SUPPORTED_FORMATS = {"csv", "parquet"}
+PARTITION_GRANULARITIES = {
+    "year": "%Y",
+    "month": "%Y-%m",
+    "day": "%Y-%m-%d"
+}
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+def validate_target_config(target: Dict) -> None:
+    """
+    Validate the output options of a metadata `target` block.
+    """
+
+    output_format = target.get("format", "csv")
+    if output_format not in SUPPORTED_FORMATS:
+        raise ValueError(
+            f"Metadata validation failed: unsupported target format "
+            f"'{output_format}'"
+        )
+
+    partition = target.get("partition_by")
+    if partition:
+        if output_format != "parquet":
+            raise ValueError(
+                "Metadata validation failed: partition_by requires "
+                "target format 'parquet'"
+            )
+        granularity = partition.get("granularity")
+        if granularity and granularity not in PARTITION_GRANULARITIES:
+            raise ValueError(
+                f"Metadata validation failed: unsupported partition "
+                f"granularity '{granularity}'"
+            )
+
+
+# =====================================================
+# WRITER LIFECYCLE
+# =====================================================
+
+def open_output_writer(
+    path: Optional[str],
+    target: Dict,
+    partitioned: bool = False,
+    append: bool = False,
+    run_tag: str = "run",
+    commit: Optional[Dict] = None,
+    resumable: bool = False
+) -> Optional[Dict]:
+    """
+    Create a writer for one target path.
+
+    Parameters:
+        path (str): Output path (a directory for partitioned parquet)
+        target (dict): Metadata `target` block
+        partitioned (bool): Apply target.partition_by to this output
+        append (bool): Keep existing output and add to it
+        run_tag (str): Prefix for part files written by this run
+        commit (dict): Run commit the output is staged against
+                       (new_run_commit), or None to commit on close
+        resumable (bool): Write so the output can be resumed from a
+                          checkpoint (checkpoint_output_writer)
+
+    Returns:
+        dict: Writer state, or None when no path is configured
+    """
+
+    if not path:
+        return None
+
+    output_format = target.get("format", "csv")
+    partition = target.get("partition_by") if partitioned else None
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    carry_forward = None
+    header_written = False
+    size = None
+    segment_dir = None
+
+    if partition:
+        # A previous run may have left a dataset directory (or a
+        # single file) at this path; each run replaces it unless
+        # appending
+        write_path = staged_path(path, run_tag, "staging")
+        os.makedirs(write_path, exist_ok=True)
+        op = "merge_dir" if append and os.path.isdir(path) else "replace_dir"
+    elif append and output_format == "csv" and os.path.isfile(path):
+        header_written = os.path.getsize(path) > 0
+        write_path = staged_path(path, run_tag, "append")
+        op = "append"
+        size = os.path.getsize(path)
+    else:
+        write_path = staged_path(path, run_tag)
+        op = "replace"
+        if append and output_format == "parquet" and os.path.isfile(path):
+            carry_forward = path
+        if resumable and output_format == "parquet":
+            segment_dir = staged_path(path, run_tag, "segments")
+            os.makedirs(segment_dir, exist_ok=True)
+
+    operation = output_operation(
+        op, write_path, path, run_tag, size=size,
+        scratch=[segment_dir] if segment_dir else None
+    )
+    if commit is not None:
+        stage_output(commit, operation)
+
+    return {
+        "path": path,
+        "write_path": write_path,
+        "operation": operation,
+        "commit": commit,
+        "format": output_format,
+        "compression": target.get("compression", "snappy"),
+        "row_group_size": target.get("row_group_size"),
+        "partition_by": partition,
+        "parquet_writer": None,
+        "schema": None,
+        "segment_dir": segment_dir,
+        "segments": [],
+        "synced": set(),
+        "empty_chunk": None,
+        "append": append,
+        "run_tag": run_tag,
+        "carry_forward": carry_forward,
+        "header_written": header_written,
+        "chunks": 0,
+        "rows": 0,
+        "write_seconds": 0.0,
+        "files": set()
+    }
+
+
+def write_output_chunk(writer: Optional[Dict], df: pd.DataFrame) -> None:
+    """
+    Write one chunk of rows to an open writer.
+    """
+
+    if writer is None:
+        return
+
+    # Appending nothing must leave existing output untouched
+    if writer["append"] and df.empty:
+        return
+
+    t0 = time.perf_counter()
+
+    if writer["format"] == "parquet":
+        _write_parquet_chunk(writer, df)
+    else:
+        df.to_csv(
+            writer["write_path"],
+            mode="a" if writer["header_written"] else "w",
+            header=not writer["header_written"],
+            index=False
+        )
+        writer["header_written"] = True
+        writer["files"].add(writer["write_path"])
+
+    writer["chunks"] += 1
+    writer["rows"] += len(df)
+    writer["write_seconds"] += time.perf_counter() - t0
+
+
+def close_output_writer(writer: Optional[Dict]) -> Optional[Dict]:
+    """
+    Flush and close a writer. Without a run commit, its output is
+    committed here.
+
+    Returns:
+        dict: Output metrics (format, rows, write time, bytes written)
+    """
+
+    if writer is None:
+        return None
+
+    t0 = time.perf_counter()
+    if writer["empty_chunk"] is not None and writer["schema"] is None:
+        # Only empty chunks were written: the file still gets the columns
+        _write_parquet_chunk(writer, writer["empty_chunk"], hold_empty=False)
+    if writer["segment_dir"] is not None:
+        _seal_segment(writer)
+        _assemble_segments(writer)
+    elif writer["parquet_writer"] is not None:
+        writer["parquet_writer"].close()
+        writer["parquet_writer"] = None
+    writer["write_seconds"] += time.perf_counter() - t0
+
+    # Measured on the staged files, before they are moved into place
+    bytes_written = sum(
+        os.path.getsize(f) for f in writer["files"] if os.path.exists(f)
+    )
+
+    if writer["commit"] is None:
+        t0 = time.perf_counter()
+        if os.path.exists(writer["write_path"]):
+            fsync_tree(writer["write_path"])
+        apply_operation(writer["operation"])
+        writer["write_seconds"] += time.perf_counter() - t0
+
+    return {
+        "path": writer["path"],
+        "format": writer["format"],
+        "compression": (
+            writer["compression"] if writer["format"] == "parquet" else None
+        ),
+        "partitioned_by": (
+            writer["partition_by"]["column"] if writer["partition_by"] else None
+        ),
+        "rows": writer["rows"],
+        "files": len(writer["files"]),
+        "bytes_written": bytes_written,
+        "write_seconds": writer["write_seconds"]
+    }
+
+
+# =====================================================
+# CHECKPOINTS
+# =====================================================
+
+def checkpoint_output_writer(writer: Optional[Dict]) -> Optional[Dict]:
+    """
+    Make every row written so far durable (sealing the current parquet
+    segment) and return the writer's position.
+
+    Returns:
+        dict: Position for resume_output_writer
+    """
+
+    if writer is None:
+        return None
+
+    t0 = time.perf_counter()
+
+    if writer["segment_dir"] is not None:
+        _seal_segment(writer)
+
+    written = {
+        path for path in writer["files"] | set(writer["segments"])
+        if path not in writer["synced"] and os.path.isfile(path)
+    }
+    fsync_files(written)
+
+    # csv files keep growing, so they are synced at every checkpoint
+    if writer["format"] == "parquet":
+        writer["synced"] |= written
+
+    writer["write_seconds"] += time.perf_counter() - t0
+
+    return {
+        "chunks": writer["chunks"],
+        "rows": writer["rows"],
+        "header_written": writer["header_written"],
+        "size": (
+            os.path.getsize(writer["write_path"])
+            if writer["format"] == "csv" and os.path.isfile(writer["write_path"])
+            else None
+        ),
+        "files": sorted(writer["files"]),
+        "segments": list(writer["segments"])
+    }
+
+
+def resume_output_writer(writer: Optional[Dict], position: Dict) -> None:
+    """
+    Continue a resumable writer from a checkpointed position: rows
+    written after it (by the run that was interrupted) are dropped.
+    """
+
+    if writer is None:
+        return
+
+    writer["chunks"] = position["chunks"]
+    writer["rows"] = position["rows"]
+    writer["header_written"] = position["header_written"]
+    writer["files"] = set(position["files"])
+    writer["segments"] = list(position["segments"])
+
+    if writer["format"] == "csv":
+        if os.path.isfile(writer["write_path"]):
+            with open(writer["write_path"], "r+b") as f:
+                f.truncate(position["size"] or 0)
+
+    elif writer["partition_by"]:
+        for root, _, names in os.walk(writer["write_path"]):
+            for name in names:
+                path = os.path.join(root, name)
+                if path not in writer["files"]:
+                    os.remove(path)
+
+    else:
+        for name in os.listdir(writer["segment_dir"]):
+            path = os.path.join(writer["segment_dir"], name)
+            if path not in writer["segments"]:
+                os.remove(path)
+        if writer["segments"]:
+            writer["schema"] = _written_schema(writer["segments"][0])
+
+    writer["synced"] = writer["files"] | set(writer["segments"])
+
+
+# =====================================================
+# PARQUET BACKEND
+# =====================================================
+
+def _partition_key(df: pd.DataFrame, partition: Dict) -> pd.Series:
+    column = partition["column"]
+    fmt = PARTITION_GRANULARITIES.get(partition.get("granularity"))
+
+    if fmt is None:
+        return df[column].astype("string")
+
+    return pd.to_datetime(df[column], errors="coerce").dt.strftime(fmt)
+
+
+def _write_parquet_chunk(writer: Dict, df: pd.DataFrame,
+                         hold_empty: bool = True) -> None:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    partition = writer["partition_by"]
+
+    # An empty chunk has no values to type its columns by (object
+    # columns become null, float64 ones double), so the first rows fix
+    # the file schema; a single file of only empty chunks is written
+    # when the writer closes
+    if df.empty and hold_empty:
+        if writer["schema"] is None and not partition:
+            writer["empty_chunk"] = df
+        return
+
+    if partition:
+        key = f"{partition['column']}_{partition.get('granularity', 'value')}"
+        table = pa.Table.from_pandas(
+            df.assign(**{key: _partition_key(df, partition)}),
+            preserve_index=False
+        )
+        basename = f"part-{writer['run_tag']}-{writer['chunks']:05d}"
+
+        pq.write_to_dataset(
+            table,
+            root_path=writer["write_path"],
+            partition_cols=[key],
+            basename_template=basename + "-{i}.parquet",
+            compression=writer["compression"],
+            row_group_size=writer["row_group_size"],
+            file_visitor=lambda written: writer["files"].add(written.path)
+        )
+        return
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    if writer["parquet_writer"] is None:
+        # Rows carried over from the existing file go first (into the
+        # first segment of a resumable writer)
+        previous = writer["carry_forward"] if writer["schema"] is None else None
+        schema = writer["schema"] or (
+            pq.read_schema(previous) if previous else table.schema
+        )
+
+        writer["parquet_writer"] = pq.ParquetWriter(
+            _segment_path(writer) if writer["segment_dir"] else writer["write_path"],
+            schema,
+            compression=writer["compression"]
+        )
+        writer["schema"] = writer["parquet_writer"].schema
+        writer["files"].add(writer["write_path"])
+
+        if previous:
+            existing = pq.ParquetFile(previous)
+            for i in range(existing.num_row_groups):
+                writer["parquet_writer"].write_table(existing.read_row_group(i))
+            existing.close()
+        if previous or writer["segments"]:
+            table = table.cast(schema)
+    else:
+        # Later chunks may infer a looser type (e.g. an all-null column)
+        table = table.cast(writer["parquet_writer"].schema)
+
+    writer["parquet_writer"].write_table(
+        table, row_group_size=writer["row_group_size"]
+    )
+
+
+def _written_schema(path: str):
+    """
+    Arrow schema a parquet file was written with. pq.read_schema maps
+    dictionary values back to string (large_string is lost), so a
+    resumed writer would assemble a file that differs in its footer.
+    """
+    import base64
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    stored = (pq.read_metadata(path).metadata or {}).get(b"ARROW:schema")
+    if stored is None:
+        return pq.read_schema(path)
+
+    return pa.ipc.read_schema(pa.py_buffer(base64.b64decode(stored)))
+
+
+def _segment_path(writer: Dict) -> str:
+    return os.path.join(
+        writer["segment_dir"], f"segment-{len(writer['segments']):05d}.parquet"
+    )
+
+
+def _seal_segment(writer: Dict) -> None:
+    if writer["parquet_writer"] is None:
+        return
+    writer["parquet_writer"].close()
+    writer["parquet_writer"] = None
+    writer["segments"].append(_segment_path(writer))
+
+
+def _assemble_segments(writer: Dict) -> None:
+    """
+    Write the segments of a resumable writer into its staged file.
+    """
+    import pyarrow.parquet as pq  # type: ignore
+
+    segments = writer["segments"]
+
+    if len(segments) == 1:
+        os.replace(segments[0], writer["write_path"])
+    elif segments:
+        with pq.ParquetWriter(
+            writer["write_path"], writer["schema"],
+            compression=writer["compression"]
+        ) as assembled:
+            for segment in segments:
+                parquet = pq.ParquetFile(segment)
+                # Dictionary value types are not kept by the round trip
+                for i in range(parquet.num_row_groups):
+                    assembled.write_table(
+                        parquet.read_row_group(i).cast(writer["schema"])
+                    )
+                parquet.close()
+
+    shutil.rmtree(writer["segment_dir"], ignore_errors=True)
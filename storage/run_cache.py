@@ -0,0 +1,205 @@
+"""
+RUN RESULT CACHE
+----------------
+Purpose:
+    Content-addressed cache of completed pipeline runs, keyed by
+    (metadata hash, source fingerprint, execution profile). A hit lets
+    the pipeline skip ingestion, validation and output writing and
+    reuse the stored summary, rejection counts and outputs.
+
+Design Rules:
+    - Entries are only reused while their recorded outputs still exist
+      unchanged (size and modification time)
+    - Eviction is per dataset: entry TTL and a maximum entry count
+      (least recently used first)
+    - The index is read and rewritten under the commit lock and
+      replaced atomically (storage/artifact_commit.py); entries are
+      stored after a run's outputs are committed, since they record
+      the committed files' signatures
+    - No pipeline execution logic
+"""
+
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+from storage.artifact_commit import commit_lock, write_json
+
+
+CACHE_INDEX_PATH = "experiments/run_cache.json"
+SAMPLE_BLOCK_SIZE = 64 * 1024
+
+DEFAULT_CACHE_POLICY = {
+    "enabled": True,
+    "max_entries": 10,
+    "ttl_hours": 168
+}
+
+
+# =====================================================
+# KEYS
+# =====================================================
+
+def source_fingerprint(path: str) -> str:
+    """
+    Fingerprint a source file from its size, modification time and
+    sampled head, middle and tail blocks. Reads at most three blocks
+    regardless of file size.
+    """
+
+    stat = os.stat(path)
+    digest = hashlib.md5(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    offsets = {0, max(0, stat.st_size // 2), max(0, stat.st_size - SAMPLE_BLOCK_SIZE)}
+
+    with open(path, "rb") as f:
+        for offset in sorted(offsets):
+            f.seek(offset)
+            digest.update(f.read(SAMPLE_BLOCK_SIZE))
+
+    return digest.hexdigest()
+
+
+def build_cache_key(metadata_hash: str, fingerprint: str, profile: str) -> str:
+    return hashlib.sha256(
+        f"{metadata_hash}|{fingerprint}|{profile}".encode()
+    ).hexdigest()
+
+
+def resolve_cache_policy(metadata: Dict) -> Dict:
+    """
+    Merge the metadata `cache` block over the defaults.
+    """
+
+    policy = dict(DEFAULT_CACHE_POLICY)
+    policy.update(metadata.get("cache") or {})
+    return policy
+
+
+# =====================================================
+# INDEX
+# =====================================================
+
+def _load_index() -> Dict:
+    if not os.path.exists(CACHE_INDEX_PATH):
+        return {}
+    with open(CACHE_INDEX_PATH, "r") as f:
+        return json.load(f)
+
+
+def _save_index(index: Dict) -> None:
+    write_json(CACHE_INDEX_PATH, index)
+
+
+def output_signature(path: str) -> Optional[str]:
+    """
+    Size and modification time of an output file, or of every file
+    under an output directory (partitioned datasets).
+    """
+
+    if not os.path.exists(path):
+        return None
+
+    if os.path.isfile(path):
+        files = [path]
+    else:
+        files = sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(path)
+            for name in names
+        )
+
+    digest = hashlib.md5()
+    for file_path in files:
+        stat = os.stat(file_path)
+        digest.update(f"{file_path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    return digest.hexdigest()
+
+
+def _outputs_intact(entry: Dict) -> bool:
+    return all(
+        output_signature(path) == signature
+        for path, signature in (entry.get("output_signatures") or {}).items()
+    )
+
+
+def _expired(entry: Dict, policy: Dict, now: datetime) -> bool:
+    ttl = policy.get("ttl_hours")
+    if not ttl:
+        return False
+    created = datetime.fromisoformat(entry["created_at"])
+    return now - created > timedelta(hours=ttl)
+
+
+# =====================================================
+# LOOKUP / STORE
+# =====================================================
+
+def lookup_cached_run(key: str, policy: Dict) -> Optional[Dict]:
+    """
+    Return the cached run for a key, or None on a miss.
+    A hit refreshes the entry's last_used timestamp.
+    """
+
+    with commit_lock():
+        index = _load_index()
+        entry = index.get(key)
+
+        if entry is None:
+            return None
+
+        now = datetime.now()
+        if _expired(entry, policy, now) or not _outputs_intact(entry):
+            del index[key]
+            _save_index(index)
+            return None
+
+        entry["last_used"] = now.isoformat()
+        entry["hits"] = entry.get("hits", 0) + 1
+        _save_index(index)
+
+    return entry
+
+
+def store_cached_run(key: str, entry: Dict, policy: Dict) -> None:
+    """
+    Store a completed run and apply the dataset's eviction policy.
+    """
+
+    with commit_lock():
+        index = _load_index()
+        now = datetime.now()
+
+        entry = dict(entry)
+        entry["output_signatures"] = {
+            output["path"]: output_signature(output["path"])
+            for output in (entry.get("outputs") or {}).values()
+        }
+        entry["created_at"] = now.isoformat()
+        entry["last_used"] = now.isoformat()
+        entry["hits"] = 0
+        index[key] = entry
+
+        dataset_id = entry["dataset_id"]
+        dataset_keys = [
+            k for k, e in index.items()
+            if e["dataset_id"] == dataset_id
+        ]
+
+        for k in dataset_keys:
+            if k != key and _expired(index[k], policy, now):
+                del index[k]
+
+        dataset_keys = sorted(
+            (k for k in dataset_keys if k in index),
+            key=lambda k: index[k]["last_used"]
+        )
+        max_entries = policy.get("max_entries")
+        if max_entries:
+            for k in dataset_keys[:max(0, len(dataset_keys) - int(max_entries))]:
+                del index[k]
+
+        _save_index(index)
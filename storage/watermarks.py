@@ -0,0 +1,175 @@
+"""
+INGESTION WATERMARKS
+--------------------
+Purpose:
+    Persist a per-dataset cursor for incremental ingestion of
+    append-only sources: the byte offset already processed, the
+    number of data rows before it, an optional high-water value of a
+    declared column and, for deduplicated datasets, the key
+    fingerprints seen so far.
+
+Design Rules:
+    - One entry per dataset_id in a single JSON artifact, committed
+      with the run's outputs when a run commit is given
+      (storage/artifact_commit.py)
+    - A watermark is only trusted while the source still starts with
+      the bytes it was taken from (append-only check)
+    - Seen keys are a sorted uint64 file per dataset under
+      SEEN_KEYS_DIR, committed with the watermark that refers to it;
+      a deduplicated dataset only resumes a watermark that has one
+    - No parsing of the source itself
+    - pandas is only imported to scan chunks, so loading and saving
+      watermarks stays light
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Optional
+import json
+import os
+from datetime import datetime
+
+from ingestion.byte_range import head_fingerprint
+from storage.artifact_commit import update_json
+
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
+
+
+WATERMARK_PATH = "experiments/ingestion_watermarks.json"
+SEEN_KEYS_DIR = "experiments/ingestion_seen_keys"
+FINGERPRINT_BYTES = 64 * 1024
+
+
+# =====================================================
+# HIGH-WATER VALUES
+# =====================================================
+
+def chunk_high_water(series: "pd.Series") -> Any:
+    """
+    Highest value of the watermark column in one chunk.
+    Dates are compared as timestamps, other columns as-is.
+    """
+    import pandas as pd  # type: ignore
+
+    values = series.dropna()
+    if values.empty:
+        return None
+
+    if not pd.api.types.is_numeric_dtype(values):
+        parsed = pd.to_datetime(values, errors="coerce")
+        if parsed.notna().any():
+            return parsed.max()
+
+    return values.max()
+
+
+def merge_high_water(current: Any, candidate: Any) -> Any:
+    if candidate is None:
+        return current
+    if current is None or type(current) is not type(candidate):
+        return candidate
+    return max(current, candidate)
+
+
+def high_water_value(value: Any) -> Any:
+    """
+    JSON-safe form of a high-water value. Timestamps become ISO
+    strings, which still order correctly across runs.
+    """
+
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+# =====================================================
+# WATERMARK STORE
+# =====================================================
+
+def seen_keys_path(dataset_id: str) -> str:
+    return os.path.join(SEEN_KEYS_DIR, f"{dataset_id}.u64")
+
+
+def _load_all() -> Dict:
+    if not os.path.exists(WATERMARK_PATH):
+        return {}
+    with open(WATERMARK_PATH, "r") as f:
+        return json.load(f)
+
+
+def load_watermark(
+    dataset_id: str,
+    source_path: str,
+    seen_keys: bool = False
+) -> Optional[Dict]:
+    """
+    Return the stored watermark for a dataset, or None when there is
+    none or the source no longer extends the data it was taken from
+    (truncated or replaced files trigger a full reprocess). With
+    seen_keys=True, a watermark saved without its seen keys (before
+    the dataset was deduplicated) is not resumed either.
+    """
+
+    watermark = _load_all().get(dataset_id)
+    if not watermark:
+        return None
+
+    if seen_keys and not (
+        watermark.get("seen_keys") and os.path.exists(watermark["seen_keys"])
+    ):
+        return None
+
+    if watermark.get("source_path") != source_path:
+        return None
+
+    if os.path.getsize(source_path) < watermark["byte_offset"]:
+        return None
+
+    fingerprint = head_fingerprint(source_path, watermark["fingerprint_bytes"])
+    if fingerprint != watermark["fingerprint"]:
+        return None
+
+    return watermark
+
+
+def save_watermark(
+    dataset_id: str,
+    source_path: str,
+    run_id: str,
+    byte_offset: int,
+    rows_processed: int,
+    high_water: Optional[Dict] = None,
+    seen_keys: Optional[str] = None,
+    commit: Optional[Dict] = None
+) -> Dict:
+    """
+    Persist the cursor reached by a successful incremental run. With
+    a run commit, it only moves when the run's outputs (and staged
+    seen keys) are committed.
+    """
+
+    fingerprint_bytes = min(FINGERPRINT_BYTES, byte_offset)
+
+    watermark = {
+        "dataset_id": dataset_id,
+        "source_path": source_path,
+        "run_id": run_id,
+        "byte_offset": byte_offset,
+        "rows_processed": rows_processed,
+        "high_water": high_water,
+        "seen_keys": seen_keys,
+        "fingerprint_bytes": fingerprint_bytes,
+        "fingerprint": head_fingerprint(source_path, fingerprint_bytes),
+        "updated_at": datetime.now().isoformat()
+    }
+
+    update_json(
+        WATERMARK_PATH,
+        lambda watermarks: {**watermarks, dataset_id: watermark},
+        default=dict, commit=commit
+    )
+
+    return watermark
@@ -0,0 +1,303 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import metadata_pipeline
+import storage.output_writer as output_writer
+
+
+# =====================================================
+# SOURCES
+# =====================================================
+
+def write_retail_source(path, rows=3000):
+    rng = np.random.default_rng(0)
+    invoices = rng.integers(489000, 540000, rows).astype(str).astype(object)
+    invoices[rng.random(rows) < 0.01] = None
+    codes = rng.choice([f"S{i}" for i in range(300)], rows).astype(object)
+    codes[rng.random(rows) < 0.01] = None
+    prices = np.round(rng.random(rows) * 20, 2)
+    prices[rng.random(rows) < 0.02] = 0
+    customers = rng.integers(12000, 18000, rows).astype(float)
+    customers[rng.random(rows) < 0.2] = np.nan
+    dates = pd.Timestamp("2010-01-01") + pd.to_timedelta(
+        np.sort(rng.integers(0, 700, rows)), unit="D"
+    )
+
+    df = pd.DataFrame({
+        "Invoice": invoices,
+        "StockCode": codes,
+        "Description": rng.choice(["WHITE MUG", "RED, BOX", "CANDLE\nSET"], rows),
+        "Quantity": rng.integers(-5, 50, rows),
+        "InvoiceDate": dates.strftime("%Y-%m-%d %H:%M:%S"),
+        "Price": prices,
+        "Customer ID": customers,
+        "Country": rng.choice(["United Kingdom", "France", "EIRE"], rows)
+    })
+    # Repeated invoice lines land in later partitions than their
+    # first occurrence
+    df = pd.concat([df, df.sample(frac=0.02, random_state=1)])
+    df.to_csv(path, index=False)
+
+
+def write_amazon_source(path, rows=400):
+    rng = np.random.default_rng(1)
+    ids = np.array([f"B0{i:08d}" for i in range(rows)], dtype=object)
+    ids[rng.random(rows) < 0.02] = None
+    actual = [f"₹{v:,}" for v in rng.integers(100, 90000, rows)]
+    actual[3] = "jjjjj"
+
+    df = pd.DataFrame({
+        "product_id": ids,
+        "product_name": [f"Cable {i}, USB \"fast\"\nline2" for i in range(rows)],
+        "category": rng.choice([
+            "Computers&Accessories|Cables|USBCables",
+            "Electronics|HomeTheater|TV",
+            "Home|Kitchen"
+        ], rows),
+        "discounted_price": [f"₹{v:,}" for v in rng.integers(50, 5000, rows)],
+        "actual_price": actual,
+        "discount_percentage": [f"{v}%" for v in rng.integers(0, 90, rows)],
+        "rating": rng.choice(["4.2", "3.9", "|", "5.0"], rows),
+        "rating_count": [f"{v:,}" for v in rng.integers(1, 90000, rows)],
+        "about_product": ["Great, really\ngreat|Fast"] * rows,
+        "user_id": [f"U{i}a,U{i}b" for i in range(rows)],
+        "user_name": ["A,B"] * rows,
+        "review_id": [f"R{i}a,R{i}b" for i in range(rows)],
+        "review_title": ["Good,Bad"] * rows,
+        "review_content": ["x\ny,z"] * rows,
+        "img_link": ["https://img"] * rows,
+        "product_link": ["https://p"] * rows
+    })
+    df = pd.concat([df, df.iloc[:5], df.iloc[200:203]])
+    df.to_csv(path, index=False)
+
+
+def write_zstd_frames(source, path, frame_bytes=16384):
+    """
+    Multi-frame zstd copy of `source`, one frame per block of lines.
+    """
+    pa = pytest.importorskip("pyarrow")
+    codec = pa.Codec("zstd")
+
+    with open(source, "rb") as f:
+        raw = f.read()
+
+    with open(path, "wb") as out:
+        start = 0
+        while start < len(raw):
+            end = raw.find(b"\n", start + frame_bytes)
+            end = len(raw) if end < 0 else end + 1
+            out.write(codec.compress(raw[start:end], asbytes=True))
+            start = end
+
+
+# =====================================================
+# RUNS
+# =====================================================
+
+def dataset_metadata(name, tag, source, parallel=False, checkpoint=False,
+                     chunk_size=500, **source_options):
+    """
+    Repository metadata redirected to a test source and to outputs
+    under out/<tag>/, written to metadata/<tag>.yaml.
+    """
+    with open(os.path.join(REPO, "metadata", name)) as f:
+        metadata = yaml.safe_load(f)
+
+    def output(path):
+        return os.path.join("out", tag, os.path.basename(path))
+
+    metadata["source"] = dict(
+        metadata["source"], path=source, chunk_size=chunk_size, engine="streaming",
+        **source_options
+    )
+    target = dict(metadata["target"])
+    target["path"] = output(target["path"])
+    target["rejected_path"] = output(target["rejected_path"])
+    metadata["target"] = target
+
+    for child in (metadata.get("child_tables") or {}).values():
+        for key in ("path", "nodes_path"):
+            if key in child:
+                child[key] = output(child[key])
+
+    metadata["parallel"] = {"enabled": parallel, "workers": 3, "partitions": 5}
+    metadata["checkpoint"] = {"enabled": checkpoint, "interval_chunks": 1}
+    metadata.pop("incremental", None)
+    metadata.pop("cache", None)
+
+    os.makedirs("metadata", exist_ok=True)
+    metadata_path = os.path.join("metadata", f"{tag}.yaml")
+    with open(metadata_path, "w") as f:
+        yaml.safe_dump(metadata, f, sort_keys=False, allow_unicode=True)
+    return metadata_path
+
+
+def run(metadata_path, **options):
+    return metadata_pipeline.run_pipeline(
+        metadata_path, "full_run", bypass_cache=True, **options
+    )
+
+
+def output_files(tag, run_id):
+    """
+    Bytes of every file a run wrote under out/<tag>/, keyed by path
+    with the run tag (part file names) masked.
+    """
+    root = os.path.join("out", tag)
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                key = os.path.relpath(path, root).replace(run_id[:8], "RUN")
+                files[key] = f.read()
+    return files
+
+
+def read_outputs(tag):
+    root = os.path.join("out", tag)
+    frames = {}
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        frame = (
+            pd.read_parquet(path) if name.endswith(".parquet")
+            else pd.read_csv(path)
+        )
+        frames[name] = frame.reset_index(drop=True)
+    return frames
+
+
+def assert_same_outputs(expected_tag, actual_tag):
+    expected = read_outputs(expected_tag)
+    actual = read_outputs(actual_tag)
+
+    assert sorted(expected) == sorted(actual)
+    for name, frame in expected.items():
+        assert len(frame) > 0
+        pd.testing.assert_frame_equal(frame, actual[name], obj=name)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("raw")
+    write_retail_source("raw/online_retail.csv")
+    write_amazon_source("raw/amazon.csv")
+    return tmp_path
+
+
+# =====================================================
+# PARTITION BOUNDARIES
+# =====================================================
+
+def test_parallel_online_retail_matches_serial(workdir):
+    serial = run(dataset_metadata("online_retail.yaml", "serial", "raw/online_retail.csv"))
+    parallel = run(dataset_metadata(
+        "online_retail.yaml", "parallel", "raw/online_retail.csv", parallel=True
+    ))
+
+    assert serial["status"] == parallel["status"] == "SUCCESS"
+    assert parallel["records"] == serial["records"]
+    assert serial["records"]["rejected"] > 0
+    assert_same_outputs("serial", "parallel")
+
+
+def test_parallel_amazon_quoted_newlines_match_serial(workdir):
+    serial = run(dataset_metadata("amazon_sales.yaml", "serial", "raw/amazon.csv", chunk_size=60))
+    parallel = run(dataset_metadata(
+        "amazon_sales.yaml", "parallel", "raw/amazon.csv", parallel=True, chunk_size=60
+    ))
+
+    assert serial["status"] == parallel["status"] == "SUCCESS"
+    assert parallel["records"] == serial["records"]
+
+    # Curated, rejected and child tables, byte for byte
+    expected = output_files("serial", serial["run_id"])
+    assert len(expected) == 5
+    assert output_files("parallel", parallel["run_id"]) == expected
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd"])
+def test_compressed_source_matches_parallel_plain_source(workdir, codec):
+    if codec == "gzip":
+        import gzip
+
+        source = "raw/online_retail.csv.gz"
+        with open("raw/online_retail.csv", "rb") as f, gzip.open(source, "wb") as out:
+            out.write(f.read())
+        options = {}
+    else:
+        source = "raw/online_retail.csv.zst"
+        write_zstd_frames("raw/online_retail.csv", source)
+        options = {"decompression_workers": 3}
+
+    compressed = run(dataset_metadata(
+        "online_retail.yaml", "compressed", source, parallel=True, **options
+    ))
+    plain = run(dataset_metadata(
+        "online_retail.yaml", "plain", "raw/online_retail.csv", parallel=True
+    ))
+
+    assert compressed["status"] == plain["status"] == "SUCCESS"
+    assert compressed["records"] == plain["records"]
+    assert_same_outputs("plain", "compressed")
+
+
+# =====================================================
+# CHECKPOINT RESUME
+# =====================================================
+
+def fail_on_write(monkeypatch, call):
+    """
+    Make the `call`-th output chunk write raise, as a full disk would.
+    """
+    write = output_writer.write_output_chunk
+    calls = {"n": 0}
+
+    def failing(writer, df):
+        calls["n"] += 1
+        if calls["n"] == call:
+            raise OSError("injected write failure")
+        write(writer, df)
+
+    monkeypatch.setattr(output_writer, "write_output_chunk", failing)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_resumed_run_matches_uninterrupted_run(workdir, monkeypatch, parallel):
+    reference = run(dataset_metadata(
+        "online_retail.yaml", "reference", "raw/online_retail.csv",
+        parallel=parallel, checkpoint=True
+    ))
+    assert reference["status"] == "SUCCESS"
+
+    metadata_path = dataset_metadata(
+        "online_retail.yaml", "resumed", "raw/online_retail.csv",
+        parallel=parallel, checkpoint=True
+    )
+    with monkeypatch.context() as patch:
+        fail_on_write(patch, 7)
+        failed = run(metadata_path)
+
+    assert failed["status"] == "FAILED"
+    assert failed["checkpoint"] is not None
+
+    resumed = run(metadata_path)
+
+    assert resumed["status"] == "SUCCESS"
+    assert resumed["run_id"] == failed["run_id"]
+    assert resumed["resumed_from"] is not None
+    assert resumed["records"] == reference["records"]
+    assert (
+        output_files("resumed", resumed["run_id"])
+        == output_files("reference", reference["run_id"])
+    )
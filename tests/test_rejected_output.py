@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transformations.rejection import route_rejections
+from storage.output_writer import (
+    open_output_writer,
+    write_output_chunk,
+    close_output_writer
+)
+
+
+PLAN = {"rules": [{"rule_id": "non_positive_quantity", "category": "value"}]}
+
+
+def rejected_chunk(quantities):
+    df = pd.DataFrame({"Invoice": [f"I{q}" for q in quantities], "Quantity": quantities})
+    failures = pd.DataFrame({"non_positive_quantity": df["Quantity"] <= 0})
+    return route_rejections(df, failures, PLAN)[0]
+
+
+def test_chunk_without_rejections_has_string_tags():
+    rejected = rejected_chunk([1, 2])
+
+    assert rejected.empty
+    assert rejected["rejection_reason"].dtype == object
+    assert rejected["rejection_category"].dtype == object
+
+
+def test_first_chunk_without_rejections_does_not_fix_parquet_schema(tmp_path):
+    path = str(tmp_path / "rejected.parquet")
+    writer = open_output_writer(path, {"format": "parquet"})
+
+    write_output_chunk(writer, rejected_chunk([1, 2]))
+    write_output_chunk(writer, rejected_chunk([3, -1, 0]))
+    close_output_writer(writer)
+
+    written = pd.read_parquet(path)
+    assert list(written["rejection_reason"]) == ["non_positive_quantity"] * 2
+    assert list(written["Quantity"]) == [-1, 0]
+
+
+def test_only_empty_chunks_still_write_the_columns(tmp_path):
+    path = str(tmp_path / "rejected.parquet")
+    writer = open_output_writer(path, {"format": "parquet"})
+
+    write_output_chunk(writer, rejected_chunk([1]))
+    write_output_chunk(writer, rejected_chunk([2]))
+    close_output_writer(writer)
+
+    written = pd.read_parquet(path)
+    assert written.empty
+    assert "rejection_reason" in written.columns
@@ -0,0 +1,325 @@
+"""
+CHILD TABLE EXTRACTION
+----------------------
+Purpose:
+    Split multi-valued cells of curated rows into normalized child
+    outputs declared in the metadata `child_tables` block:
+
+        split      : parallel delimited lists (review_id, user_id,
+                     review_title, ...) exploded to one row per
+                     element, keyed by the parent key and position
+        hierarchy  : a delimited path (category "A|B|C") exploded to
+                     one row per level, with every path prefix
+                     dictionary-encoded as a node id; the node table
+                     (node_id, parent_node_id, level, name, path) is
+                     written once at the end of the run
+
+Design Rules:
+    - Vectorized str.split + explode; elements are aligned on
+      (row, position) offsets, never by per-row Python code
+    - A list whose element count differs from the anchor column is
+      not aligned: its values are left empty for that row and the
+      row is counted as misaligned
+    - Node ids are stable across chunks (the dictionary only grows)
+      and, in append mode, across runs (seeded from the node table)
+    - Columns only read for child tables are dropped from the
+      curated parent output
+"""
+
+from typing import Dict, Optional
+import os
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+
+RESERVED_OUTPUTS = {"curated", "rejected"}
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+def compile_child_plan(metadata: Dict) -> Optional[Dict]:
+    """
+    Validate the metadata `child_tables` block.
+
+    Returns:
+        dict: `tables` (one spec per child output) and `drop_columns`
+              (source columns only needed by child tables), or None
+              when no child tables are declared
+    """
+
+    declared = metadata.get("child_tables") or {}
+    if not declared:
+        return None
+
+    columns = metadata["columns"]
+    kept = set(columns.values()) | set(
+        metadata["source"].get("passthrough_columns") or []
+    )
+
+    tables = []
+    sources = []
+
+    for name, child in declared.items():
+        if name in RESERVED_OUTPUTS or not child.get("path"):
+            raise ValueError(
+                f"Metadata validation failed: child table '{name}' needs a "
+                f"path and a name other than {sorted(RESERVED_OUTPUTS)}"
+            )
+
+        parent_key = child.get("parent_key")
+        if parent_key not in columns:
+            raise ValueError(
+                f"Metadata validation failed: child table '{name}' refers "
+                f"to unknown parent_key '{parent_key}'"
+            )
+
+        spec = {
+            "name": name,
+            "path": child["path"],
+            "parent_key": columns[parent_key]
+        }
+
+        if child.get("split"):
+            split = child["split"]
+            split_columns = list(split.get("columns") or [])
+            anchor = split.get("anchor") or (split_columns[:1] or [None])[0]
+            if not split_columns or anchor not in split_columns:
+                raise ValueError(
+                    f"Metadata validation failed: child table '{name}' "
+                    f"needs split columns including its anchor"
+                )
+            spec.update({
+                "kind": "split",
+                "columns": split_columns,
+                "anchor": anchor,
+                "delimiter": split.get("delimiter", ",")
+            })
+            sources += split_columns
+
+        elif child.get("hierarchy"):
+            hierarchy = child["hierarchy"]
+            spec.update({
+                "kind": "hierarchy",
+                "column": hierarchy["column"],
+                "delimiter": hierarchy.get("delimiter", "|"),
+                "nodes_path": child.get("nodes_path")
+            })
+            sources.append(hierarchy["column"])
+
+        else:
+            raise ValueError(
+                f"Metadata validation failed: child table '{name}' must "
+                f"declare split or hierarchy"
+            )
+
+        tables.append(spec)
+
+    return {
+        "tables": tables,
+        "source_columns": list(dict.fromkeys(sources)),
+        "drop_columns": [c for c in dict.fromkeys(sources) if c not in kept]
+    }
+
+
+def new_child_state(child_plan: Dict, append: bool = False) -> Dict:
+    """
+    Running counts and hierarchy dictionaries. In append mode the
+    node dictionaries are seeded from the existing node tables.
+    """
+
+    tables = {}
+    for spec in child_plan["tables"]:
+        entry = {"rows": 0, "misaligned": {}}
+
+        if spec["kind"] == "hierarchy":
+            entry["paths"] = pd.Index([], dtype=object)
+            entry["nodes"] = []
+            nodes_path = spec.get("nodes_path")
+            if append and nodes_path and os.path.exists(nodes_path):
+                existing = (
+                    pd.read_parquet(nodes_path)
+                    if nodes_path.endswith(".parquet")
+                    else pd.read_csv(nodes_path)
+                ).sort_values("node_id")
+                entry["paths"] = pd.Index(existing["path"].astype(object))
+                entry["nodes"] = [existing]
+
+        tables[spec["name"]] = entry
+
+    return {"tables": tables}
+
+
+# =====================================================
+# EXTRACTION
+# =====================================================
+
+def _explode(series: pd.Series, delimiter: str) -> pd.Series:
+    """
+    One element per (row, position): index is a 2-level
+    MultiIndex of the parent row label and the element position.
+    """
+
+    exploded = series.dropna().astype(object).str.split(
+        delimiter, regex=False
+    ).explode()
+    position = exploded.groupby(level=0).cumcount()
+
+    exploded.index = pd.MultiIndex.from_arrays([exploded.index, position.to_numpy()])
+    return exploded
+
+
+def _extract_split(df: pd.DataFrame, spec: Dict, entry: Dict) -> pd.DataFrame:
+    delimiter = spec["delimiter"]
+    anchor = _explode(df[spec["anchor"]], delimiter)
+    counts = df[spec["anchor"]].str.count(delimiter).add(1).fillna(0)
+
+    child = {
+        spec["parent_key"]: df[spec["parent_key"]].reindex(
+            anchor.index.get_level_values(0)
+        ).to_numpy(),
+        "position": anchor.index.get_level_values(1).to_numpy(dtype=np.int32)
+    }
+
+    for column in spec["columns"]:
+        if column == spec["anchor"]:
+            child[column] = anchor.to_numpy()
+            continue
+
+        aligned = df[column].str.count(delimiter).add(1).eq(counts)
+        misaligned = int((df[column].notna() & ~aligned).sum())
+        if misaligned:
+            entry["misaligned"][column] = entry["misaligned"].get(column, 0) + misaligned
+
+        values = _explode(df[column].where(aligned), delimiter)
+        child[column] = values.reindex(anchor.index).to_numpy()
+
+    return pd.DataFrame(child)
+
+
+def _extract_hierarchy(df: pd.DataFrame, spec: Dict, entry: Dict) -> pd.DataFrame:
+    levels = _explode(df[spec["column"]], spec["delimiter"])
+
+    rows = levels.index.get_level_values(0)
+    level = levels.index.get_level_values(1).to_numpy()
+    names = levels.to_numpy(dtype=object)
+
+    # Path prefix of every element, built one level at a time
+    paths = np.empty(len(levels), dtype=object)
+    parent_paths = np.full(len(levels), None, dtype=object)
+    previous = pd.Series(dtype=object)
+
+    for depth in range(int(level.max()) + 1 if len(level) else 0):
+        at = level == depth
+        if depth == 0:
+            current = names[at]
+        else:
+            parent = previous.reindex(rows[at]).to_numpy(dtype=object)
+            parent_paths[at] = parent
+            current = parent + spec["delimiter"] + names[at]
+        paths[at] = current
+        previous = pd.Series(current, index=rows[at])
+
+    dictionary = entry["paths"]
+    codes, unique_paths = pd.factorize(paths)
+    _, first = np.unique(codes, return_index=True)
+    is_new = ~pd.Index(unique_paths).isin(dictionary)
+    new_paths = pd.Index(unique_paths[is_new], dtype=object)
+    first = first[is_new]
+
+    if len(new_paths):
+        start = len(dictionary)
+        dictionary = dictionary.append(new_paths)
+        entry["paths"] = dictionary
+
+        new_ids = np.arange(start, start + len(new_paths))
+        parents = parent_paths[first]
+        has_parent = pd.notna(parents)
+        parent_ids = np.full(len(new_paths), -1)
+        parent_ids[has_parent] = dictionary.get_indexer(parents[has_parent])
+
+        entry["nodes"].append(pd.DataFrame({
+            "node_id": new_ids,
+            "parent_node_id": parent_ids,
+            "level": level[first],
+            "name": names[first],
+            "path": np.asarray(new_paths, dtype=object)
+        }))
+
+    return pd.DataFrame({
+        spec["parent_key"]: df[spec["parent_key"]].reindex(rows).to_numpy(),
+        "level": level.astype(np.int16),
+        "node_id": dictionary.get_indexer(paths).astype(np.int32)
+    })
+
+
+def extract_child_tables(
+    df: pd.DataFrame,
+    child_plan: Dict,
+    state: Dict
+) -> Dict[str, pd.DataFrame]:
+    """
+    Extract every declared child table from one curated chunk.
+
+    Parameters:
+        df (DataFrame): Curated rows (source dtypes)
+        child_plan (dict): Output of compile_child_plan
+        state (dict): Child state, updated in place
+
+    Returns:
+        dict: Child table name -> rows for this chunk
+    """
+
+    extracted = {}
+
+    for spec in child_plan["tables"]:
+        entry = state["tables"][spec["name"]]
+
+        if spec["kind"] == "split":
+            table = _extract_split(df, spec, entry)
+        else:
+            table = _extract_hierarchy(df, spec, entry)
+
+        entry["rows"] += len(table)
+        extracted[spec["name"]] = table
+
+    return extracted
+
+
+def hierarchy_node_tables(child_plan: Dict, state: Dict) -> Dict[str, pd.DataFrame]:
+    """
+    Complete node table of every hierarchy child (by nodes_path).
+    """
+
+    tables = {}
+    for spec in child_plan["tables"]:
+        if spec["kind"] != "hierarchy" or not spec.get("nodes_path"):
+            continue
+
+        nodes = state["tables"][spec["name"]]["nodes"]
+        tables[spec["nodes_path"]] = (
+            pd.concat(nodes, ignore_index=True) if nodes
+            else pd.DataFrame(
+                columns=["node_id", "parent_node_id", "level", "name", "path"]
+            )
+        )
+
+    return tables
+
+
+def summarize_child_tables(child_plan: Dict, state: Dict) -> Dict[str, Dict]:
+    summary = {}
+    for spec in child_plan["tables"]:
+        entry = state["tables"][spec["name"]]
+        summary[spec["name"]] = {
+            "kind": spec["kind"],
+            "path": spec["path"],
+            "rows": entry["rows"],
+            "misaligned_rows": dict(entry["misaligned"])
+        }
+        if spec["kind"] == "hierarchy":
+            summary[spec["name"]]["nodes"] = len(entry["paths"])
+            summary[spec["name"]]["nodes_path"] = spec.get("nodes_path")
+    return summary
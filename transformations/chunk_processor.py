@@ -0,0 +1,285 @@
+"""
+CHUNK PROCESSOR
+---------------
+Purpose:
+    Run the per-chunk stages (memory optimization, transformation
+    plan, deduplication, column profiling, rejection routing, and the
+    accounting of rows pruned by predicate pushdown) and
+    fold their results into a running chunk state. The serial
+    pipeline loop and the parallel partition workers both use this
+    module, so both paths produce identical counts.
+
+Design Rules:
+    - A chunk state is a plain dict of counts, rule outcomes,
+      rejection counts, high-water value, column profile, memory
+      savings, seen-key fingerprints, stage records
+      (profiling/instrumentation.py) and, for sampled dry runs, the
+      per-stratum sample counters (transformations/sampling.py)
+    - Sampled states count every row read as input, but accepted and
+      rejected rows of the sample only; sampled runs are serial
+    - Rows pruned in the reader (ingestion/pushdown.py) are counted
+      as input and rejected by their first-failing rule, exactly as if
+      they had gone through process_chunk
+    - Parallel workers run without a dedup state; duplicates across
+      partitions are resolved by the parent in partition order
+    - States from several partitions merge deterministically in
+      partition order
+    - No I/O
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from transformations.transform import (
+    apply_transformation_plan,
+    select_accepted,
+    summarize_rule_outcomes,
+    merge_rule_outcomes
+)
+from transformations.rejection import route_rejections, merge_rejection_counts
+from transformations.deduplication import (
+    new_dedup_state,
+    dedup_rule,
+    key_fingerprints,
+    mark_duplicates
+)
+from transformations.sampling import sample_chunk, record_sample_outcome
+from storage.watermarks import chunk_high_water, merge_high_water
+from profiling.column_profiler import new_profile, update_profile, merge_profiles
+from ingestion.memory_optimizer import (
+    new_memory_state,
+    optimize_chunk,
+    merge_memory_states
+)
+from profiling.instrumentation import (
+    new_stage_record,
+    measure_stage,
+    merge_stage_metrics
+)
+
+
+CHUNK_STAGES = [
+    "data_ingestion",
+    "predicate_pushdown",
+    "sampling",
+    "memory_optimization",
+    "transformation",
+    "deduplication",
+    "profiling",
+    "rejection_routing"
+]
+
+
+def new_chunk_state(
+    profiling: Optional[Dict] = None,
+    memory: Optional[Dict] = None,
+    dedup: Optional[Dict] = None,
+    sampling: Optional[Dict] = None,
+    journal: bool = False
+) -> Dict:
+    """
+    Empty chunk state. A profiling config (resolve_profiling_config)
+    enables the column profile, a memory config
+    (resolve_memory_config) chunk memory optimization, a dedup
+    config (resolve_dedup_config) the duplicate_key rule, and a
+    sampling state (new_sampling_state) row sampling. journal=True
+    keeps the claimed dedup fingerprints for run checkpoints.
+    """
+
+    return {
+        "input": 0,
+        "output": 0,
+        "rejected": 0,
+        "chunks": 0,
+        "rule_outcomes": {},
+        "rejection_counts": {},
+        "high_water": None,
+        "profile": new_profile(profiling) if profiling else None,
+        "memory": new_memory_state(memory) if memory else None,
+        "dedup": new_dedup_state(dedup, journal) if dedup else None,
+        "sampling": sampling,
+        "stages": {stage: new_stage_record() for stage in CHUNK_STAGES}
+    }
+
+
+def timed_chunks(
+    chunks: Iterator[Tuple[pd.DataFrame, Optional[pd.DataFrame]]],
+    state: Dict
+) -> Iterator[Tuple[pd.DataFrame, Optional[pd.DataFrame]]]:
+    """
+    Pull (rows, pruned rows) pairs from a source iterator
+    (iter_pushdown_chunks), charging the time spent waiting on the
+    reader to the data_ingestion stage.
+    """
+
+    while True:
+        with measure_stage(state["stages"], "data_ingestion") as sample:
+            item = next(chunks, None)
+            sample["rows_out"] = 0 if item is None else sum(
+                len(frame) for frame in item if frame is not None
+            )
+
+        if item is None:
+            return
+
+        yield item
+
+
+def process_pruned(
+    pruned: pd.DataFrame,
+    plan: Dict,
+    state: Dict,
+    watermark_column: Optional[str] = None
+) -> None:
+    """
+    Count the rows a pushdown reader pruned: input, high-water, rule
+    outcomes and first-failure rejection counts. Pruned rows only
+    carry the predicate columns and never claim a deduplication key;
+    in a sampled run they include the rows outside the sample, which
+    are only counted in their stratum.
+
+    Parameters:
+        pruned (DataFrame): Predicate columns of the pruned rows
+        plan (dict): Compiled transformation plan
+        state (dict): Running chunk state, updated in place
+        watermark_column (str): Physical column tracked for high-water
+    """
+
+    with measure_stage(
+        state["stages"], "predicate_pushdown", rows_in=len(pruned)
+    ) as sample:
+        state["input"] += len(pruned)
+
+        if watermark_column and watermark_column in pruned.columns:
+            state["high_water"] = merge_high_water(
+                state["high_water"], chunk_high_water(pruned[watermark_column])
+            )
+
+        if state["sampling"] is not None:
+            rule = dedup_rule(plan)
+            pruned, _ = sample_chunk(
+                pruned, state["sampling"],
+                rule["columns"] if rule is not None and state["dedup"] is not None
+                else None
+            )
+
+        _, failures = apply_transformation_plan(pruned, plan)
+        merge_rule_outcomes(state["rule_outcomes"], summarize_rule_outcomes(failures))
+
+        rejected, chunk_rejections = route_rejections(pruned, failures, plan)
+        merge_rejection_counts(state["rejection_counts"], chunk_rejections)
+        state["rejected"] += len(rejected)
+
+        sample["rows_out"] = 0
+
+
+def process_chunk(
+    df: pd.DataFrame,
+    plan: Dict,
+    state: Dict,
+    watermark_column: Optional[str] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Transform, validate and route one chunk.
+
+    Parameters:
+        df (DataFrame): Source rows of one chunk
+        plan (dict): Compiled transformation plan
+        state (dict): Running chunk state, updated in place
+        watermark_column (str): Physical column tracked for high-water
+
+    Returns:
+        tuple: (accepted rows, tagged rejected rows), with optimized
+               dtypes when memory optimization is enabled
+    """
+
+    stages = state["stages"]
+
+    state["chunks"] += 1
+    state["input"] += len(df)
+
+    if watermark_column and watermark_column in df.columns:
+        state["high_water"] = merge_high_water(
+            state["high_water"], chunk_high_water(df[watermark_column])
+        )
+
+    rule = dedup_rule(plan)
+
+    strata = None
+    if state["sampling"] is not None:
+        with measure_stage(stages, "sampling", rows_in=len(df)) as sample:
+            df, strata = sample_chunk(
+                df, state["sampling"],
+                rule["columns"] if rule is not None and state["dedup"] is not None
+                else None
+            )
+            sample["rows_out"] = len(df)
+
+    if state["memory"] is not None:
+        with measure_stage(stages, "memory_optimization", rows_in=len(df)) as sample:
+            df = optimize_chunk(df, state["memory"])
+            sample["rows_out"] = len(df)
+
+    with measure_stage(stages, "transformation", rows_in=len(df)):
+        transformed, failures = apply_transformation_plan(df, plan)
+
+    if rule is not None and state["dedup"] is not None:
+        with measure_stage(stages, "deduplication") as sample:
+            # Only rows passing every other rule claim their key
+            others = failures.drop(columns=rule["rule_id"]).to_numpy(dtype=bool)
+            passing = ~others.any(axis=1)
+            duplicate = np.zeros(len(failures), dtype=bool)
+            duplicate[passing] = mark_duplicates(
+                state["dedup"], key_fingerprints(transformed[passing], rule["columns"])
+            )
+            failures[rule["rule_id"]] = duplicate
+            sample["rows_in"] = int(passing.sum())
+            sample["rows_out"] = sample["rows_in"] - int(duplicate.sum())
+
+    with measure_stage(stages, "transformation") as sample:
+        accepted = select_accepted(transformed, failures)
+        merge_rule_outcomes(state["rule_outcomes"], summarize_rule_outcomes(failures))
+        sample["rows_out"] = len(accepted)
+
+    if strata is not None:
+        record_sample_outcome(state["sampling"], strata, accepted.index)
+
+    if state["profile"] is not None:
+        with measure_stage(stages, "profiling", rows_in=len(transformed)):
+            update_profile(state["profile"], transformed)
+
+    with measure_stage(stages, "rejection_routing", rows_in=len(df)) as sample:
+        rejected, chunk_rejections = route_rejections(df, failures, plan)
+        merge_rejection_counts(state["rejection_counts"], chunk_rejections)
+        sample["rows_out"] = len(rejected)
+
+    state["output"] += len(accepted)
+    state["rejected"] += len(rejected)
+
+    return accepted, rejected
+
+
+def merge_chunk_states(states: List[Dict]) -> Dict:
+    """
+    Merge partition states in the given (partition) order.
+    """
+
+    merged = new_chunk_state()
+
+    for state in states:
+        for key in ("input", "output", "rejected", "chunks"):
+            merged[key] += state[key]
+
+        merge_rule_outcomes(merged["rule_outcomes"], state["rule_outcomes"])
+        merge_rejection_counts(merged["rejection_counts"], state["rejection_counts"])
+        merged["high_water"] = merge_high_water(
+            merged["high_water"], state["high_water"]
+        )
+        merged["profile"] = merge_profiles(merged["profile"], state["profile"])
+        merged["memory"] = merge_memory_states(merged["memory"], state["memory"])
+
+        merged["stages"] = merge_stage_metrics(merged["stages"], state["stages"])
+
+    return merged
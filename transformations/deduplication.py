@@ -0,0 +1,361 @@
+"""
+DEDUPLICATION STAGE
+-------------------
+Purpose:
+    Reject rows whose declared key (metadata `deduplication.key`) was
+    already seen earlier in the run, across chunks and partitions, or
+    by an earlier incremental run of the dataset. The first
+    occurrence in source order is kept; later ones are routed to the
+    rejection stream as `duplicate_key`.
+
+Design Rules:
+    - Keys are reduced to 64-bit fingerprints (vectorized hashing of
+      the key columns); only fingerprints are retained
+    - Seen fingerprints live in sorted numpy runs and are probed with
+      searchsorted; past the memory budget a run is spilled to disk
+      and probed through a memory map, so the set can outgrow RAM.
+      Past MAX_DISK_RUNS spilled runs they are merged (k-way, a block
+      of each at a time) into one, so a probe opens a bounded number
+      of maps
+    - Only rows that pass every other rule are fingerprinted, so a
+      rejected row never hides a valid later one
+    - A 64-bit collision (about n^2 / 2^65 for n keys) would reject
+      a distinct row; the spill directory is removed after the run
+    - Checkpointed runs journal the fingerprints they claim
+      (drain_journal), so a resumed run rebuilds the set
+      (restore_dedup_state) without rereading the source
+    - Incremental runs carry the set over: a run writes every
+      fingerprint seen so far as one sorted file (write_seen_keys),
+      committed with its watermark, and the next run probes it
+      read-only (load_seen_keys)
+"""
+
+from typing import Dict, List, Optional
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+
+DUPLICATE_RULE_ID = "duplicate_key"
+DEFAULT_MEMORY_BUDGET_MB = 64
+MAX_MEMORY_RUNS = 16
+MAX_DISK_RUNS = 8
+MIN_MERGE_BLOCK_KEYS = 65536
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+def resolve_dedup_config(metadata: Dict) -> Optional[Dict]:
+    """
+    Settings of the metadata `deduplication` block, or None when no
+    key is declared.
+    """
+
+    dedup = metadata.get("deduplication") or {}
+    if not dedup.get("key") or dedup.get("enabled", True) is False:
+        return None
+
+    budget_mb = float(dedup.get("memory_budget_mb") or DEFAULT_MEMORY_BUDGET_MB)
+
+    return {
+        "budget_keys": max(1, int(budget_mb * 1024 * 1024) // 8),
+        "spill_dir": dedup.get("spill_dir")
+    }
+
+
+def dedup_rule(plan: Dict) -> Optional[Dict]:
+    """
+    The plan's uniqueness rule, if the dataset declares a key.
+    """
+
+    for rule in plan["rules"]:
+        if rule["kind"] == "unique":
+            return rule
+    return None
+
+
+# =====================================================
+# FINGERPRINTS
+# =====================================================
+
+def key_fingerprints(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """
+    64-bit fingerprint of the key columns of every row.
+
+    Numeric key columns are widened first, so a value hashes the same
+    whatever width a chunk was read or downcast to.
+    """
+
+    keys = {}
+    for column in columns:
+        series = df[column]
+        if pd.api.types.is_integer_dtype(series) and isinstance(series.dtype, np.dtype):
+            series = series.astype(np.int64)
+        elif pd.api.types.is_float_dtype(series):
+            series = series.astype(np.float64)
+        keys[column] = series
+
+    return pd.util.hash_pandas_object(
+        pd.DataFrame(keys, index=df.index), index=False
+    ).to_numpy(np.uint64)
+
+
+# =====================================================
+# FINGERPRINT SET
+# =====================================================
+
+def new_dedup_state(config: Dict, journal: bool = False) -> Dict:
+    """
+    Empty fingerprint set. With journal=True, the fingerprints claimed
+    since the last drain_journal are also kept aside.
+    """
+
+    return {
+        "config": config,
+        "memory_runs": [],
+        "memory_keys": 0,
+        "disk_runs": [],
+        "seen_runs": [],
+        "disk_files": 0,
+        "spilled_runs": 0,
+        "merges": 0,
+        "scratch_dir": None,
+        "fingerprints": 0,
+        "duplicates": 0,
+        "spilled_bytes": 0,
+        "seconds": 0.0,
+        "journal": [] if journal else None
+    }
+
+
+def _in_sorted(run: np.ndarray, values: np.ndarray) -> np.ndarray:
+    if len(run) == 0 or len(values) == 0:
+        return np.zeros(len(values), dtype=bool)
+
+    position = np.searchsorted(run, values)
+    position[position == len(run)] = len(run) - 1
+    return run[position] == values
+
+
+def _seen(state: Dict, values: np.ndarray) -> np.ndarray:
+    found = np.zeros(len(values), dtype=bool)
+
+    for run in state["memory_runs"]:
+        found[~found] = _in_sorted(run, values[~found])
+
+    for path in state["seen_runs"] + state["disk_runs"]:
+        if found.all():
+            break
+        run = np.memmap(path, dtype=np.uint64, mode="r")
+        found[~found] = _in_sorted(run, values[~found])
+        del run
+
+    return found
+
+
+def _disk_run_path(state: Dict) -> str:
+    if state["scratch_dir"] is None:
+        spill_dir = state["config"].get("spill_dir")
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        state["scratch_dir"] = tempfile.mkdtemp(prefix="dedup-", dir=spill_dir)
+
+    state["disk_files"] += 1
+    return os.path.join(state["scratch_dir"], f"run-{state['disk_files']:05d}.u64")
+
+
+def _spill(state: Dict) -> None:
+    run = np.sort(np.concatenate(state["memory_runs"]))
+    path = _disk_run_path(state)
+    run.tofile(path)
+
+    state["disk_runs"].append(path)
+    state["spilled_runs"] += 1
+    state["spilled_bytes"] += run.nbytes
+    state["memory_runs"] = []
+    state["memory_keys"] = 0
+
+    if len(state["disk_runs"]) > MAX_DISK_RUNS:
+        _merge_disk_runs(state)
+
+
+def _merge_runs(paths: List[str], path: str, budget_keys: int) -> int:
+    """
+    Merge sorted run files into one sorted file at `path`, reading a
+    block of each run at a time (about `budget_keys` in total).
+    Returns the number of keys written.
+    """
+
+    runs = [
+        np.memmap(run_path, dtype=np.uint64, mode="r")
+        for run_path in paths if os.path.getsize(run_path) > 0
+    ]
+    block = max(MIN_MERGE_BLOCK_KEYS, budget_keys // max(1, len(runs)))
+    offsets = [0] * len(runs)
+    written = 0
+
+    with open(path, "wb") as merged:
+        while True:
+            live = [i for i, run in enumerate(runs) if offsets[i] < len(run)]
+            if not live:
+                break
+
+            # Runs are sorted, so every value up to the smallest block
+            # end is final; the run that ends there contributes its
+            # whole block
+            bound = min(
+                runs[i][min(offsets[i] + block, len(runs[i])) - 1] for i in live
+            )
+            parts = []
+            for i in live:
+                window = runs[i][offsets[i]:offsets[i] + block]
+                take = int(np.searchsorted(window, bound, side="right"))
+                parts.append(window[:take])
+                offsets[i] += take
+
+            block_keys = np.sort(np.concatenate(parts))
+            block_keys.tofile(merged)
+            written += len(block_keys)
+
+    del runs
+    return written
+
+
+def _merge_disk_runs(state: Dict) -> None:
+    """
+    Merge the spilled runs into one sorted run.
+    """
+
+    path = _disk_run_path(state)
+    _merge_runs(state["disk_runs"], path, state["config"]["budget_keys"])
+
+    for stale in state["disk_runs"]:
+        os.remove(stale)
+
+    state["disk_runs"] = [path]
+    state["merges"] += 1
+
+
+def _remember(state: Dict, values: np.ndarray) -> None:
+    if len(values) == 0:
+        return
+
+    if state["journal"] is not None:
+        state["journal"].append(values)
+
+    state["memory_runs"].append(np.sort(values))
+    state["memory_keys"] += len(values)
+    state["fingerprints"] += len(values)
+
+    if state["memory_keys"] > state["config"]["budget_keys"]:
+        _spill(state)
+    elif len(state["memory_runs"]) > MAX_MEMORY_RUNS:
+        # Keep probes cheap: fold small chunk runs into one
+        state["memory_runs"] = [np.sort(np.concatenate(state["memory_runs"]))]
+
+
+def mark_duplicates(state: Dict, fingerprints: np.ndarray) -> np.ndarray:
+    """
+    Flag fingerprints already seen (earlier in the run or earlier in
+    this batch) and remember the new ones.
+
+    Parameters:
+        state (dict): Dedup state, updated in place
+        fingerprints (ndarray): uint64 fingerprints in source order
+
+    Returns:
+        ndarray: Boolean mask, True for duplicates
+    """
+
+    t0 = time.perf_counter()
+
+    duplicate = pd.Series(fingerprints).duplicated().to_numpy(copy=True)
+
+    first = ~duplicate
+    duplicate[first] = _seen(state, fingerprints[first])
+
+    _remember(state, fingerprints[~duplicate])
+    state["duplicates"] += int(duplicate.sum())
+    state["seconds"] += time.perf_counter() - t0
+
+    return duplicate
+
+
+def drain_journal(state: Dict) -> np.ndarray:
+    """
+    Fingerprints claimed since the previous drain, in claim order.
+    """
+
+    values = state["journal"]
+    state["journal"] = []
+    if not values:
+        return np.empty(0, dtype=np.uint64)
+    return np.concatenate(values)
+
+
+def restore_dedup_state(
+    config: Dict,
+    fingerprints: np.ndarray,
+    duplicates: int = 0
+) -> Dict:
+    """
+    Journaling dedup state holding the fingerprints of a checkpoint
+    (spilled past the memory budget as usual).
+    """
+
+    state = new_dedup_state(config, journal=True)
+    _remember(state, fingerprints)
+    state["journal"] = []
+    state["duplicates"] = duplicates
+    return state
+
+
+def load_seen_keys(state: Dict, path: Optional[str]) -> None:
+    """
+    Treat the keys of a seen-keys file (write_seen_keys) as already
+    seen. The file is probed through a memory map and never modified.
+    """
+
+    if path and os.path.exists(path) and os.path.getsize(path) > 0:
+        state["seen_runs"].append(path)
+
+
+def write_seen_keys(state: Dict, path: str) -> int:
+    """
+    Write every fingerprint of the set, including loaded seen keys,
+    to `path` as one sorted run. Returns the number of keys.
+    """
+
+    paths = state["seen_runs"] + state["disk_runs"]
+    if state["memory_runs"]:
+        memory_path = _disk_run_path(state)
+        np.sort(np.concatenate(state["memory_runs"])).tofile(memory_path)
+        paths.append(memory_path)
+
+    return _merge_runs(paths, path, state["config"]["budget_keys"])
+
+
+def release_dedup_state(state: Optional[Dict]) -> Optional[Dict]:
+    """
+    Remove spilled runs and return the stage metrics.
+    """
+
+    if state is None:
+        return None
+
+    if state["scratch_dir"]:
+        shutil.rmtree(state["scratch_dir"], ignore_errors=True)
+
+    return {
+        "fingerprints": state["fingerprints"],
+        "duplicates": state["duplicates"],
+        "spilled_runs": state["spilled_runs"],
+        "spilled_bytes": state["spilled_bytes"],
+        "disk_merges": state["merges"]
+    }
@@ -0,0 +1,115 @@
+"""
+NUMERIC PARSERS
+---------------
+Purpose:
+    Normalize formatted numeric text into floats, one named format
+    per column, as referenced by the metadata `numeric_formats` block:
+
+        plain       : "1099", "4.2"           (pd.to_numeric)
+        currency    : "₹1,099", "$12.50"      (symbol and separators)
+        percentage  : "64%"                   (kept on the 0-100 scale)
+        thousands   : "24,269"                (comma-grouped integers)
+
+Design Rules:
+    - Whole-column string kernels (pyarrow-backed when available),
+      never a per-row apply
+    - Each distinct raw value is parsed once: columns are factorized
+      and the parsed uniques are gathered back by code
+    - A value that does not fully match its format becomes NaN; the
+      numeric validation rule then tags the row for rejection
+"""
+
+from typing import Dict
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+
+CURRENCY_SYMBOLS = "₹$€£¥"
+
+# Digit groups: either comma-grouped thousands or a plain run of digits
+_GROUPED = r"(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?"
+
+# `pattern` is the full-match validation regex; `strip` lists the
+# literal characters removed before the float conversion
+NUMERIC_FORMATS: Dict[str, Dict] = {
+    "plain": {},
+    "currency": {
+        "pattern": (
+            rf"(?:-?[{CURRENCY_SYMBOLS}]?|[{CURRENCY_SYMBOLS}]-) *{_GROUPED}"
+        ),
+        "strip": tuple(CURRENCY_SYMBOLS) + (",", " ")
+    },
+    "percentage": {
+        "pattern": r"-?\d+(?:\.\d+)? *%?",
+        "strip": ("%", " ")
+    },
+    "thousands": {
+        "pattern": rf"-?{_GROUPED}",
+        "strip": (",",)
+    }
+}
+
+
+def validate_numeric_formats(formats: Dict[str, str], columns: Dict[str, str]) -> None:
+    """
+    Validate a metadata `numeric_formats` block (logical column -> format).
+    """
+
+    for logical, name in formats.items():
+        if logical not in columns:
+            raise ValueError(
+                f"Metadata validation failed: numeric format declared for "
+                f"unknown column '{logical}'"
+            )
+        if name not in NUMERIC_FORMATS:
+            raise ValueError(
+                f"Metadata validation failed: unsupported numeric format "
+                f"'{name}' for column '{logical}'"
+            )
+
+
+def _string_dtype() -> str:
+    try:
+        import pyarrow  # type: ignore # noqa: F401
+        return "string[pyarrow]"
+    except ImportError:
+        return "string"
+
+
+def parse_numeric(series: pd.Series, fmt: str = "plain") -> pd.Series:
+    """
+    Parse one column with a named numeric format.
+
+    Parameters:
+        series (Series): Raw column values
+        fmt (str): Key of NUMERIC_FORMATS
+
+    Returns:
+        Series: float64 values, NaN where the value is missing or
+                does not match the format
+    """
+
+    spec = NUMERIC_FORMATS[fmt]
+
+    if not spec or pd.api.types.is_numeric_dtype(series):
+        return pd.to_numeric(series, errors="coerce")
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+
+    text = pd.Series(uniques).astype(_string_dtype()).str.strip()
+    valid = text.str.fullmatch(spec["pattern"]).fillna(False)
+    cleaned = text
+    for char in spec["strip"]:
+        cleaned = cleaned.str.replace(char, "", regex=False)
+
+    parsed = (
+        cleaned.where(valid)
+        .astype("float64")
+        .to_numpy(dtype=np.float64, na_value=np.nan)
+    )
+
+    # Append a NaN slot for the missing-value sentinel (-1)
+    values = np.append(parsed, np.nan)[codes]
+
+    return pd.Series(values, index=series.index, name=series.name)
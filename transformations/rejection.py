@@ -0,0 +1,111 @@
+"""
+REJECTION ROUTER
+----------------
+Purpose:
+    Tag every row that failed the transformation plan with its
+    first-failing rule (rejection_reason) and that rule's category
+    (rejection_category), and keep running rejection counts that
+    are merged chunk by chunk.
+
+Design Rules:
+    - First failure is resolved with vectorized priority masks
+      (argmax over the ordered failure matrix)
+    - Counts are merged incrementally, never recomputed from the
+      full rejected set
+    - No I/O
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+
+REJECTION_SUMMARY_COLUMNS = ["rejection_reason", "rejection_category", "count"]
+
+
+def route_rejections(
+    df: pd.DataFrame,
+    failure_matrix: pd.DataFrame,
+    plan: Dict
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Select and tag the rejected rows of one chunk.
+
+    Parameters:
+        df (DataFrame): Source rows with their original values
+        failure_matrix (DataFrame): Boolean matrix, one column per
+            rule in priority order (apply_transformation_plan)
+        plan (dict): Compiled transformation plan
+
+    Returns:
+        tuple: (rejected rows with rejection_reason and
+                rejection_category columns,
+                rejected row count per first-failing rule)
+    """
+
+    rule_ids = np.array(failure_matrix.columns, dtype=object)
+    categories = np.array(
+        [rule["category"] for rule in plan["rules"]], dtype=object
+    )
+
+    matrix = failure_matrix.to_numpy(dtype=bool)
+    rejected_mask = matrix.any(axis=1)
+
+    if not rejected_mask.any():
+        # Typed like the tags of a non-empty chunk, not as float64
+        no_tags = np.array([], dtype=object)
+        return (
+            df.iloc[0:0].assign(
+                rejection_reason=no_tags, rejection_category=no_tags
+            ),
+            {}
+        )
+
+    # argmax returns the first True column, i.e. the highest-priority failure
+    first_failure = matrix[rejected_mask].argmax(axis=1)
+
+    rejected = df[rejected_mask].assign(
+        rejection_reason=rule_ids[first_failure],
+        rejection_category=categories[first_failure]
+    )
+
+    counts = np.bincount(first_failure, minlength=len(rule_ids))
+
+    return rejected, {
+        rule_ids[i]: int(counts[i]) for i in np.flatnonzero(counts)
+    }
+
+
+def merge_rejection_counts(
+    totals: Dict[str, int],
+    chunk_counts: Dict[str, int]
+) -> Dict[str, int]:
+    """
+    Add one chunk's first-failure counts into the running totals.
+    """
+
+    for rule_id, count in chunk_counts.items():
+        totals[rule_id] = totals.get(rule_id, 0) + count
+
+    return totals
+
+
+def build_rejection_summary(
+    totals: Dict[str, int],
+    plan: Dict
+) -> List[Dict]:
+    """
+    Shape the running totals as rejection_summary.csv rows,
+    in rule priority order.
+    """
+
+    return [
+        {
+            "rejection_reason": rule["rule_id"],
+            "rejection_category": rule["category"],
+            "count": totals[rule["rule_id"]]
+        }
+        for rule in plan["rules"]
+        if totals.get(rule["rule_id"])
+    ]
@@ -0,0 +1,303 @@
+"""
+STRATIFIED SAMPLING
+-------------------
+Purpose:
+    Let the dry_run profile validate a reproducible stratified sample
+    of the source instead of every row, and extrapolate accepted and
+    rejected counts (with confidence intervals) to the full source.
+
+Design Rules:
+    - Every source row is counted in its stratum (metadata
+      `sampling.strata_column`); only sampled rows go through the
+      transformation, deduplication and rejection stages
+    - With predicate pushdown and a deduplication key, the reader
+      selects the sample (sampled_rows) from the key and strata
+      columns: unsampled rows are never converted in full nor
+      validated. Rows reach sample_chunk flagged in SAMPLED_COLUMN,
+      so they are only counted, not hashed again. Without pushdown
+      or a key every row is read in full and sampled per chunk,
+      which saves the transformation but not the read
+    - A row is sampled when a seeded 64-bit hash of its sampling unit
+      falls below the sampling rate, so the sample depends only on the
+      data and the seed, not on chunking. The unit is the
+      deduplication key when one is declared (all copies of a key are
+      sampled together, keeping the duplicate rate unbiased),
+      otherwise the whole row
+    - The rate is `fraction`, lowered so that about `max_rows` rows are
+      sampled from the estimated source size; allocation is
+      proportional to stratum size
+    - Counts are extrapolated per stratum (stratified estimator);
+      intervals use the normal approximation with a finite population
+      correction
+    - No I/O
+"""
+
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from transformations.deduplication import key_fingerprints
+
+
+DEFAULT_SEED = 42
+DEFAULT_CONFIDENCE = 0.95
+NULL_STRATUM = "__null__"
+SAMPLED_COLUMN = "__sampled__"
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+def resolve_sampling_config(metadata: Dict) -> Optional[Dict]:
+    """
+    Settings of the metadata `sampling` block, or None when dry runs
+    read the whole source.
+    """
+
+    sampling = metadata.get("sampling") or {}
+    if not sampling or sampling.get("enabled", True) is False:
+        return None
+
+    fraction = sampling.get("fraction")
+    max_rows = sampling.get("max_rows")
+
+    if fraction is None and max_rows is None:
+        raise ValueError(
+            "Metadata validation failed: sampling needs a fraction or "
+            "max_rows"
+        )
+    if fraction is not None and not 0 < float(fraction) <= 1:
+        raise ValueError(
+            "Metadata validation failed: sampling fraction must be in (0, 1]"
+        )
+    if max_rows is not None and int(max_rows) < 1:
+        raise ValueError(
+            "Metadata validation failed: sampling max_rows must be at least 1"
+        )
+
+    confidence = float(sampling.get("confidence", DEFAULT_CONFIDENCE))
+    if not 0 < confidence < 1:
+        raise ValueError(
+            "Metadata validation failed: sampling confidence must be in (0, 1)"
+        )
+
+    strata = sampling.get("strata_column")
+    if strata is not None and strata not in metadata["columns"]:
+        raise ValueError(
+            f"Metadata validation failed: sampling refers to unknown "
+            f"column '{strata}'"
+        )
+
+    return {
+        "fraction": float(fraction) if fraction is not None else 1.0,
+        "max_rows": int(max_rows) if max_rows is not None else None,
+        "strata_column": metadata["columns"][strata] if strata else None,
+        "seed": int(sampling.get("seed", DEFAULT_SEED)),
+        "confidence": confidence
+    }
+
+
+def sampling_rate(config: Dict, estimated_rows: Optional[int]) -> float:
+    rate = config["fraction"]
+    if config["max_rows"] is not None and estimated_rows:
+        rate = min(rate, config["max_rows"] / estimated_rows)
+    return rate
+
+
+# =====================================================
+# SAMPLE SELECTION
+# =====================================================
+
+def new_sampling_state(config: Dict, rate: float) -> Dict:
+    """
+    Per-stratum counters: rows read, rows sampled, sampled rows
+    accepted.
+    """
+
+    return {
+        "config": config,
+        "rate": rate,
+        "strata": {}
+    }
+
+
+def _uniform(hashes: np.ndarray, seed: int) -> np.ndarray:
+    """
+    Seeded splitmix64 finalizer of 64-bit hashes, as uniforms in [0, 1).
+    """
+
+    z = hashes ^ np.uint64((seed * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+
+def _strata_labels(df: pd.DataFrame, column: Optional[str]) -> pd.Series:
+    if column is None:
+        return pd.Series("all", index=df.index)
+    return df[column].astype("string").fillna(NULL_STRATUM)
+
+
+def _strata_counts(df: pd.DataFrame, column: Optional[str]) -> pd.Series:
+    """
+    Rows per stratum label, labelling only the distinct values.
+    """
+
+    if column is None:
+        return pd.Series({"all": len(df)} if len(df) else {}, dtype=np.int64)
+
+    counts = df[column].value_counts(dropna=False, sort=False)
+    counts = counts[counts > 0]
+    labels = _strata_labels(pd.DataFrame({column: counts.index}), column)
+
+    return pd.Series(counts.to_numpy(), index=labels.to_numpy()).groupby(
+        level=0, sort=False
+    ).sum()
+
+
+def sampled_rows(
+    df: pd.DataFrame,
+    state: Dict,
+    key_columns: Optional[List[str]] = None
+) -> np.ndarray:
+    """
+    Boolean mask of the rows in the sample, without counting them.
+    Needs the key columns (or every column when there is no key).
+    """
+
+    if key_columns:
+        hashes = key_fingerprints(df, key_columns)
+    else:
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy(np.uint64)
+
+    return _uniform(hashes, state["config"]["seed"]) < state["rate"]
+
+
+def sample_chunk(
+    df: pd.DataFrame,
+    state: Dict,
+    key_columns: Optional[List[str]] = None
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Select the sampled rows of one chunk and count every row in its
+    stratum. Rows a reader already sampled carry the decision in
+    SAMPLED_COLUMN, which is dropped.
+
+    Returns:
+        tuple: (sampled rows, stratum label of each sampled row)
+    """
+
+    column = state["config"]["strata_column"]
+
+    if SAMPLED_COLUMN in df.columns:
+        selected = df[SAMPLED_COLUMN].to_numpy(dtype=bool)
+        df = df.drop(columns=SAMPLED_COLUMN)
+    else:
+        selected = sampled_rows(df, state, key_columns)
+
+    read = _strata_counts(df, column)
+    sampled_labels = _strata_labels(df[selected], column)
+    sampled = sampled_labels.value_counts(sort=False)
+
+    for label, rows in read.items():
+        stratum = state["strata"].setdefault(
+            str(label), {"rows": 0, "sampled": 0, "accepted": 0}
+        )
+        stratum["rows"] += int(rows)
+        stratum["sampled"] += int(sampled.get(label, 0))
+
+    return df[selected], sampled_labels
+
+
+def record_sample_outcome(
+    state: Dict,
+    labels: pd.Series,
+    accepted_index: pd.Index
+) -> None:
+    """
+    Count the accepted rows of the sample per stratum.
+    """
+
+    accepted = labels[labels.index.isin(accepted_index)].value_counts(sort=False)
+    for label, rows in accepted.items():
+        state["strata"][str(label)]["accepted"] += int(rows)
+
+
+# =====================================================
+# EXTRAPOLATION
+# =====================================================
+
+def estimate_counts(state: Dict) -> Dict:
+    """
+    Stratified estimate of the accepted and rejected rows of the full
+    source, with a confidence interval.
+
+    Strata without a sample (too small for the rate) take the pooled
+    acceptance rate of the sample.
+    """
+
+    strata = state["strata"].values()
+    rows = sum(s["rows"] for s in strata)
+    sampled = sum(s["sampled"] for s in strata)
+    pooled = (
+        sum(s["accepted"] for s in strata) / sampled if sampled else 0.0
+    )
+
+    accepted = 0.0
+    variance = 0.0
+
+    for s in strata:
+        n, size = s["sampled"], s["rows"]
+        if n:
+            p = s["accepted"] / n
+            variance += size ** 2 * (1 - n / size) * p * (1 - p) / max(n - 1, 1)
+        else:
+            p = pooled
+            variance += size ** 2 * p * (1 - p)
+        accepted += size * p
+
+    z = NormalDist().inv_cdf((1 + state["config"]["confidence"]) / 2)
+    margin = z * variance ** 0.5
+
+    def interval(value):
+        return {
+            "estimate": int(round(value)),
+            "ci_low": int(max(0, np.floor(value - margin))),
+            "ci_high": int(min(rows, np.ceil(value + margin)))
+        }
+
+    return {
+        "confidence": state["config"]["confidence"],
+        "output": interval(accepted),
+        "rejected": interval(rows - accepted)
+    }
+
+
+def extrapolate_rejection_counts(totals: Dict[str, int], state: Dict) -> Dict[str, int]:
+    """
+    Scale the sample's per-rule rejection counts to the full source.
+    """
+
+    rows = sum(s["rows"] for s in state["strata"].values())
+    sampled = sum(s["sampled"] for s in state["strata"].values())
+    if not sampled:
+        return {}
+
+    scale = rows / sampled
+    return {rule_id: int(round(count * scale)) for rule_id, count in totals.items()}
+
+
+def summarize_sampling(state: Dict) -> Dict:
+    strata = state["strata"]
+    return {
+        "rate": round(state["rate"], 6),
+        "seed": state["config"]["seed"],
+        "strata_column": state["config"]["strata_column"],
+        "rows_read": sum(s["rows"] for s in strata.values()),
+        "rows_sampled": sum(s["sampled"] for s in strata.values()),
+        "strata": strata
+    }
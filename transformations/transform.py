@@ -0,0 +1,325 @@
+"""
+TRANSFORMATION ENGINE
+---------------------
+Purpose:
+    Compile the metadata `transformations` flags into a single
+    execution plan of column casts and validation rules, and apply
+    that plan to a DataFrame (or one streamed chunk) in one pass.
+
+Design Rules:
+    - Flags are resolved against the logical -> physical `columns` map
+    - Every rule is a vectorized boolean mask, no row-level Python loops
+    - The uniqueness rule needs state across chunks; it is filled in by
+      the deduplication stage (transformations/deduplication.py)
+    - Rules keep a fixed priority order (structural, type, domain)
+    - No I/O and no governance artifacts
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from transformations.numeric_parsers import parse_numeric, validate_numeric_formats
+from transformations.deduplication import DUPLICATE_RULE_ID
+
+
+# =====================================================
+# RULE CATEGORIES
+# =====================================================
+
+STRUCTURAL_VIOLATION = "Structural violation"
+TYPE_DOMAIN_VIOLATION = "Type/Domain violation"
+DOMAIN_VIOLATION = "Domain violation"
+UNIQUENESS_VIOLATION = "Uniqueness violation"
+
+RULE_PRIORITY = {
+    "not_null": 0,
+    "numeric": 1,
+    "non_negative": 2,
+    "positive": 2,
+    "unique": 3
+}
+
+
+# =====================================================
+# FLAG RESOLUTION
+# =====================================================
+
+def _resolve_logical_columns(token: str, columns: Dict[str, str]) -> List[str]:
+    """
+    Resolve a flag token such as `unit_price` or `prices` to the
+    logical columns it refers to.
+
+    Exact names win, then the singular form, then every logical
+    column containing the singular form (`prices` -> all *price*).
+    """
+
+    if token in columns:
+        return [token]
+
+    singular = token[:-1] if token.endswith("s") else token
+
+    if singular in columns:
+        return [singular]
+
+    matches = [logical for logical in columns if singular in logical]
+
+    if not matches:
+        raise ValueError(
+            f"Metadata validation failed: transformation flag refers to "
+            f"unknown column '{token}'"
+        )
+
+    return matches
+
+
+def _parse_flag(flag: str) -> Tuple[str, str]:
+    """
+    Split a transformation flag into (action, column token).
+    """
+
+    if flag.startswith("drop_null_"):
+        return "not_null", flag[len("drop_null_"):]
+
+    if flag.startswith("convert_") and flag.endswith("_to_numeric"):
+        return "numeric", flag[len("convert_"):-len("_to_numeric")]
+
+    if flag.startswith("validate_") and flag.endswith("_positive"):
+        return "positive", flag[len("validate_"):-len("_positive")]
+
+    if flag.startswith("validate_"):
+        return "non_negative", flag[len("validate_"):]
+
+    if flag.startswith("allow_zero_"):
+        return "allow_zero", flag[len("allow_zero_"):]
+
+    if flag.startswith("allow_negative_"):
+        return "allow_negative", flag[len("allow_negative_"):]
+
+    raise ValueError(
+        f"Metadata validation failed: unsupported transformation flag '{flag}'"
+    )
+
+
+# =====================================================
+# PLAN COMPILER
+# =====================================================
+
+def compile_transformation_plan(metadata: Dict) -> Dict:
+    """
+    Compile the metadata transformation flags into an execution plan.
+
+    Parameters:
+        metadata (dict): Loaded dataset metadata
+
+    Returns:
+        dict: Plan with `casts` (physical columns converted to numeric,
+              with their numeric format) and `rules` (ordered
+              validation rules)
+    """
+
+    columns = metadata["columns"]
+    flags = metadata.get("transformations") or {}
+    formats = metadata.get("numeric_formats") or {}
+
+    validate_numeric_formats(formats, columns)
+
+    enabled = {}
+    allow_zero = set()
+    allow_negative = set()
+
+    for flag, value in flags.items():
+        action, token = _parse_flag(flag)
+        logical_columns = _resolve_logical_columns(token, columns)
+
+        if action == "allow_zero":
+            if value:
+                allow_zero.update(logical_columns)
+        elif action == "allow_negative":
+            if value:
+                allow_negative.update(logical_columns)
+        elif value:
+            for logical in logical_columns:
+                enabled[(action, logical)] = True
+
+    casts = []
+    rules = []
+
+    for action, logical in enabled:
+        physical = columns[logical]
+
+        if action == "numeric":
+            casts.append({
+                "logical": logical,
+                "column": physical,
+                "format": formats.get(logical, "plain")
+            })
+            rules.append({
+                "rule_id": f"invalid_{logical}",
+                "kind": "numeric",
+                "logical": logical,
+                "column": physical,
+                "category": TYPE_DOMAIN_VIOLATION
+            })
+
+        elif action == "not_null":
+            rules.append({
+                "rule_id": f"null_{logical}",
+                "kind": "not_null",
+                "logical": logical,
+                "column": physical,
+                "category": STRUCTURAL_VIOLATION
+            })
+
+        elif logical not in allow_negative:
+            # allow_zero_* relaxes a strict positivity check to >= 0
+            kind = action
+            if kind == "positive" and logical in allow_zero:
+                kind = "non_negative"
+
+            rules.append({
+                "rule_id": (
+                    f"non_positive_{logical}"
+                    if kind == "positive"
+                    else f"negative_{logical}"
+                ),
+                "kind": kind,
+                "logical": logical,
+                "column": physical,
+                "category": DOMAIN_VIOLATION
+            })
+
+    dedup = metadata.get("deduplication") or {}
+    if dedup.get("key") and dedup.get("enabled", True) is not False:
+        key = dedup["key"] if isinstance(dedup["key"], list) else [dedup["key"]]
+        for logical in key:
+            if logical not in columns:
+                raise ValueError(
+                    f"Metadata validation failed: deduplication key refers "
+                    f"to unknown column '{logical}'"
+                )
+
+        # Evaluated across chunks by the deduplication stage; the plan
+        # only reserves its place (last) in the priority order
+        rules.append({
+            "rule_id": DUPLICATE_RULE_ID,
+            "kind": "unique",
+            "logical": "+".join(key),
+            "column": None,
+            "columns": [columns[logical] for logical in key],
+            "category": UNIQUENESS_VIOLATION
+        })
+
+    rules.sort(key=lambda rule: RULE_PRIORITY[rule["kind"]])
+
+    return {
+        "dataset_id": metadata.get("dataset_id"),
+        "casts": casts,
+        "rules": rules
+    }
+
+
+# =====================================================
+# PLAN EXECUTION
+# =====================================================
+
+def apply_transformation_plan(
+    df: pd.DataFrame,
+    plan: Dict
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Apply a compiled plan to a DataFrame.
+
+    Parameters:
+        df (DataFrame): Source rows (a full dataset or one chunk)
+        plan (dict): Output of compile_transformation_plan
+
+    Returns:
+        tuple: (transformed DataFrame with casts applied,
+                boolean failure matrix with one column per rule
+                in priority order)
+    """
+
+    casted = {
+        cast["column"]: parse_numeric(df[cast["column"]], cast["format"])
+        for cast in plan["casts"]
+    }
+
+    transformed = df.assign(**casted) if casted else df
+
+    failures = {}
+    for rule in plan["rules"]:
+        if rule["kind"] == "unique":
+            failures[rule["rule_id"]] = np.zeros(len(df), dtype=bool)
+            continue
+
+        column = rule["column"]
+        values = transformed[column]
+
+        if rule["kind"] == "not_null":
+            failed = values.isna()
+        elif rule["kind"] == "numeric":
+            failed = df[column].notna() & values.isna()
+        elif rule["kind"] == "positive":
+            failed = values.notna() & ~(values > 0)
+        else:
+            failed = values.notna() & ~(values >= 0)
+
+        failures[rule["rule_id"]] = failed.to_numpy(dtype=bool)
+
+    failure_matrix = pd.DataFrame(
+        failures,
+        index=df.index,
+        columns=[rule["rule_id"] for rule in plan["rules"]],
+        dtype=bool
+    )
+
+    return transformed, failure_matrix
+
+
+def select_accepted(
+    transformed: pd.DataFrame,
+    failure_matrix: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Keep the transformed rows that pass every rule.
+    """
+
+    return transformed[~failure_matrix.any(axis=1).to_numpy()]
+
+
+def summarize_rule_outcomes(failure_matrix: pd.DataFrame) -> Dict[str, Dict[str, int]]:
+    """
+    Count accepted and rejected rows per rule.
+
+    Each rule is evaluated independently, so one row can be
+    counted as rejected by several rules.
+    """
+
+    total = len(failure_matrix)
+    rejected = failure_matrix.sum(axis=0)
+
+    return {
+        rule_id: {
+            "accepted": total - int(rejected[rule_id]),
+            "rejected": int(rejected[rule_id])
+        }
+        for rule_id in failure_matrix.columns
+    }
+
+
+def merge_rule_outcomes(
+    totals: Dict[str, Dict[str, int]],
+    outcomes: Dict[str, Dict[str, int]]
+) -> Dict[str, Dict[str, int]]:
+    """
+    Add one chunk's per-rule counts into the running totals.
+    """
+
+    for rule_id, counts in outcomes.items():
+        entry = totals.setdefault(rule_id, {"accepted": 0, "rejected": 0})
+        entry["accepted"] += counts["accepted"]
+        entry["rejected"] += counts["rejected"]
+
+    return totals